@@ -0,0 +1,188 @@
+"""Shared asyncio engine for remote work that would otherwise need a thread each.
+
+One daemon thread runs one asyncio event loop for the whole app. Work is
+scheduled on it as coroutines:
+
+    eng = async_engine.engine()
+    fut = eng.submit(some_coroutine())          # concurrent.futures.Future
+
+Results go back to the GUI through a single Qt signal bridge:
+
+    eng.post(callback, value)   # from the loop; callback(value) runs on the GUI thread
+
+Remote commands use `run_ssh`, which drives the local `ssh` binary as an
+asyncio subprocess (no thread per call) and runs blocking paramiko calls on a
+small shared executor. So the thread count stays flat no matter how many
+hosts are polled.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures as cf
+import shlex
+import threading
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from . import ssh_pool
+from .ssh_mux import SSHMultiplexer, ssh_base_argv
+
+
+class AsyncEngine(QObject):
+    # (callback, value); queued to the GUI thread because the engine object
+    # lives there while the emitter runs on the loop thread
+    _deliver = pyqtSignal(object, object)
+
+    # Threads for blocking work (paramiko, ControlMaster start-up)
+    BLOCKING_WORKERS = 8
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._loop = asyncio.new_event_loop()
+        self._executor = cf.ThreadPoolExecutor(max_workers=self.BLOCKING_WORKERS, thread_name_prefix="async-blocking")
+        self._loop.set_default_executor(self._executor)
+        self._thread = threading.Thread(target=self._run_loop, name="async-engine", daemon=True)
+        self._closed = False
+        self._deliver.connect(self._on_deliver)
+        self._thread.start()
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    @staticmethod
+    def _on_deliver(cb: Callable[[Any], None], value: Any) -> None:
+        try:
+            cb(value)
+        except Exception:
+            pass
+
+    # API ------------------------------------------------------------------
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop
+
+    def submit(self, coro: Awaitable[Any]) -> cf.Future:
+        """Schedules a coroutine on the engine loop from any thread."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)  # type: ignore[arg-type]
+
+    def post(self, cb: Callable[[Any], None], value: Any = None) -> None:
+        """Runs cb(value) on the GUI thread (safe to call from the loop)."""
+        if not self._closed:
+            self._deliver.emit(cb, value)
+
+    async def run_blocking(self, fn: Callable[..., Any], *args: Any) -> Any:
+        return await self._loop.run_in_executor(self._executor, fn, *args)
+
+    def shutdown(self, timeout: float = 2.0) -> None:
+        if self._closed:
+            return
+        self._closed = True
+
+        async def _cancel_all() -> None:
+            me = asyncio.current_task()
+            tasks = [t for t in asyncio.all_tasks() if t is not me]
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            self.submit(_cancel_all()).result(timeout)
+        except Exception:
+            pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_ENGINE: Optional[AsyncEngine] = None
+_ENGINE_LOCK = threading.Lock()
+
+
+def engine() -> AsyncEngine:
+    """The app-wide engine (created on first use; call from the GUI thread first)."""
+    global _ENGINE
+    with _ENGINE_LOCK:
+        if _ENGINE is None or _ENGINE._closed:
+            _ENGINE = AsyncEngine()
+        return _ENGINE
+
+
+def shutdown() -> None:
+    global _ENGINE
+    with _ENGINE_LOCK:
+        eng, _ENGINE = _ENGINE, None
+    if eng is not None:
+        eng.shutdown()
+
+
+async def run_ssh(
+    host: str,
+    port: int,
+    username: Optional[str],
+    identity: Optional[str],
+    remote_cmd: str,
+    timeout: float = 8.0,
+    conn: Optional[ssh_pool.PooledConnection] = None,
+    mux: Optional[SSHMultiplexer] = None,
+    ssh_bin: str = "ssh",
+) -> Tuple[int, str, str]:
+    """Runs `bash -lc remote_cmd` on the host; returns (rc, stdout, stderr).
+
+    With `conn` (password mode) the pooled paramiko connection is used on the
+    executor; otherwise the local ssh binary runs as an asyncio subprocess.
+    """
+    rc, out, err = await run_ssh_bytes(host, port, username, identity, remote_cmd, timeout, conn, mux, ssh_bin)
+    return rc, out.decode(errors="ignore"), err
+
+
+async def run_ssh_bytes(
+    host: str,
+    port: int,
+    username: Optional[str],
+    identity: Optional[str],
+    remote_cmd: str,
+    timeout: float = 8.0,
+    conn: Optional[ssh_pool.PooledConnection] = None,
+    mux: Optional[SSHMultiplexer] = None,
+    ssh_bin: str = "ssh",
+    login: bool = True,
+) -> Tuple[int, bytes, str]:
+    """As run_ssh, with stdout left undecoded; `login=False` runs `bash -c`."""
+    loop = asyncio.get_running_loop()
+    shell = ["bash", "-lc" if login else "-c", shlex.quote(remote_cmd)]
+    if conn is not None:
+        try:
+            return await asyncio.wait_for(loop.run_in_executor(None, conn.exec_bytes, " ".join(shell), timeout), timeout + 2)
+        except asyncio.TimeoutError:
+            return 124, b"", "ssh command timed out"
+        except Exception as e:  # noqa: BLE001
+            conn.drop_dead()  # never close live transports other jobs use
+            return 1, b"", f"ssh error: {e}"
+    # ssh_base_argv may start/check the ControlMaster (blocking); keep it off the loop
+    argv = await loop.run_in_executor(None, ssh_base_argv, host, port, username, identity, ssh_bin, mux)
+    argv += ["--", *shell]
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *argv,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+    except Exception as e:  # noqa: BLE001
+        return 1, b"", f"ssh error: {e}"
+    try:
+        out, err = await asyncio.wait_for(proc.communicate(), timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return 124, b"", "ssh command timed out"
+    except asyncio.CancelledError:
+        proc.kill()
+        raise
+    rc = int(proc.returncode or 0)
+    if rc == 255 and mux is not None:
+        mux.invalidate()  # ssh itself failed; master may be gone
+    return rc, out, err.decode(errors="ignore")
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import atexit
 import base64
+import copy
+import json
 import os
+import threading
+import time
 from typing import Any, Dict, Optional, List
 
 try:
@@ -9,9 +14,16 @@ try:
 except Exception:  # pragma: no cover - dependency provided via requirements
     yaml = None  # type: ignore
 
+# libyaml bindings are ~10x faster than the pure-Python loader/dumper
+_Loader = (getattr(yaml, "CSafeLoader", None) or yaml.SafeLoader) if yaml is not None else None
+_Dumper = (getattr(yaml, "CSafeDumper", None) or yaml.SafeDumper) if yaml is not None else None
 
 CONFIG_DIR = os.path.join(os.path.expanduser("~"), ".isaaclab_gpu_manager")
 CONFIG_FILE = os.path.join(CONFIG_DIR, "connections.yaml")
+# save_config() is write-behind: bursts of saves within this window become one write
+SAVE_DEBOUNCE_SEC = 0.5
+# JSON copy of the parsed YAML, valid while the YAML's mtime/size match
+CACHE_FILE = os.path.join(CONFIG_DIR, ".connections.cache.json")
 
 
 def make_key(host: str, port: int, username: Optional[str]) -> str:
@@ -30,15 +42,53 @@ def _default_config() -> Dict[str, Any]:
     }
 
 
+def _file_sig(path: str) -> Optional[List[int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [int(st.st_mtime_ns), int(st.st_size)]
+
+
+def _read_cache(sig: List[int]) -> Optional[Dict[str, Any]]:
+    try:
+        with open(CACHE_FILE, "r", encoding="utf-8") as f:
+            blob = json.load(f)
+        if isinstance(blob, dict) and blob.get("sig") == sig and isinstance(blob.get("config"), dict):
+            return blob["config"]
+    except Exception:
+        pass
+    return None
+
+
+def _write_cache(cfg: Dict[str, Any], sig: Optional[List[int]]) -> None:
+    """Best effort; skipped when the config does not survive a JSON round trip
+    (non-string keys, dates...) so the cache never changes what load returns."""
+    if sig is None:
+        return
+    try:
+        text = json.dumps({"sig": sig, "config": cfg}, separators=(",", ":"))
+        if json.loads(text)["config"] != cfg:
+            return
+        _write_atomic(CACHE_FILE, text, durable=False)
+    except Exception:
+        pass
+
+
 def load_config() -> Dict[str, Any]:
     if yaml is None:
         # minimal in-memory fallback if PyYAML missing
         return _default_config()
     try:
-        if not os.path.exists(CONFIG_FILE):
+        sig = _file_sig(CONFIG_FILE)
+        if sig is None:
             return _default_config()
-        with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
+        data = _read_cache(sig)
+        if data is None:
+            with open(CONFIG_FILE, "r", encoding="utf-8") as f:
+                data = yaml.load(f, Loader=_Loader) or {}
+            if isinstance(data, dict):
+                _write_cache(data, sig)
         if not isinstance(data, dict):
             return _default_config()
         data.setdefault("version", 1)
@@ -59,12 +109,132 @@ def load_config() -> Dict[str, Any]:
         return _default_config()
 
 
-def save_config(cfg: Dict[str, Any]) -> None:
+def _write_atomic(path: str, text: str, durable: bool = True) -> None:
+    """Temp file + fsync + rename, so a crash leaves either the old or the new file.
+    `durable=False` skips the fsyncs (for caches that can be rebuilt)."""
+    d = os.path.dirname(path)
+    os.makedirs(d, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except Exception:
+            pass
+        raise
+    if durable and os.name != "nt":
+        # Persist the rename itself
+        try:
+            fd = os.open(d, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        except Exception:
+            pass
+
+
+class _ConfigWriter:
+    """Background writer for save_config: keeps only the newest pending config,
+    writes it SAVE_DEBOUNCE_SEC after the last save, and skips the write when
+    the serialised text matches what is already on disk."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.last_error: Optional[str] = None
+        self._cond = threading.Condition()
+        self._pending: Optional[Dict[str, Any]] = None
+        self._due = 0.0
+        # Generation of each save, so a late older write never replaces a newer one
+        self._gen = 0
+        self._written_gen = 0
+        self._written: Optional[str] = None
+        self._io_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, cfg: Dict[str, Any], delay: float) -> None:
+        snap = copy.deepcopy(cfg)  # the caller keeps mutating its dict
+        with self._cond:
+            self._gen += 1
+            self._pending = snap
+            self._due = time.monotonic() + max(0.0, delay)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="config-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def flush(self) -> None:
+        """Writes any pending config now (on the calling thread)."""
+        with self._cond:
+            cfg, self._pending, gen = self._pending, None, self._gen
+        if cfg is not None:
+            self._write(cfg, gen)
+
+    def _write(self, cfg: Dict[str, Any], gen: int) -> None:
+        with self._io_lock:
+            if gen < self._written_gen:
+                return
+            self._written_gen = gen
+            try:
+                text = yaml.dump(cfg, Dumper=_Dumper, sort_keys=True, allow_unicode=False)
+                if self._written is None and os.path.exists(self.path):
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        self._written = f.read()
+                if text == self._written:
+                    return
+                _write_atomic(self.path, text)
+                self._written = text
+                # Next start-up loads this instead of parsing the YAML
+                _write_cache(cfg, _file_sig(self.path))
+                self.last_error = None
+            except Exception as e:  # noqa: BLE001
+                self.last_error = str(e) or e.__class__.__name__
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    if not self._cond.wait(30.0):
+                        self._thread = None
+                        return  # idle: exit, submit() restarts it
+                wait = self._due - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue  # re-check: a newer save may have pushed `_due`
+                cfg, self._pending, gen = self._pending, None, self._gen
+            self._write(cfg, gen)
+
+
+_WRITER = _ConfigWriter(CONFIG_FILE)
+atexit.register(_WRITER.flush)
+
+
+def save_config(cfg: Dict[str, Any], sync: bool = False) -> None:
+    """Saves `cfg` to CONFIG_FILE. Write-behind by default: returns at once and
+    the file is written shortly after the last of a burst of calls (or at
+    flush_config()/exit). `sync=True` writes before returning."""
     if yaml is None:
         return
-    os.makedirs(CONFIG_DIR, exist_ok=True)
-    with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-        yaml.safe_dump(cfg, f, sort_keys=True, allow_unicode=False)
+    _WRITER.submit(cfg, 0.0 if sync else SAVE_DEBOUNCE_SEC)
+    if sync:
+        _WRITER.flush()
+
+
+def flush_config() -> None:
+    """Writes a pending save_config() now; call on shutdown."""
+    if yaml is None:
+        return
+    _WRITER.flush()
+
+
+def last_save_error() -> Optional[str]:
+    return _WRITER.last_error
 
 
 def yaml_available() -> bool:
@@ -107,14 +277,17 @@ def save_profile(cfg: Dict[str, Any], profile: Dict[str, Any], password: Optiona
     remember = bool(profile.get("remember_password", False))
 
     key = make_key(host, port, username)
-    prof = {
+    # Keep hand-edited per-profile options (e.g. stream_ms) across saves
+    prev = cfg.get("profiles", {}).get(key)
+    prof = dict(prev) if isinstance(prev, dict) else {}
+    prof.update({
         "host": host,
         "port": port,
         "username": username or "",
         "identity": identity,
         "interval": interval,
         "remember_password": remember,
-    }
+    })
     if remember and password:
         prof["password_b64"] = encode_password(password)
     else:
@@ -0,0 +1,111 @@
+"""Downsampling for time-series plots.
+
+`downsample(xs, ys, target)` returns at most ~`target` points that keep the
+visual shape of the series: a cheap min/max bucket pass first bounds the
+input (each bucket keeps its extremes, so spikes survive), then LTTB
+(Largest-Triangle-Three-Buckets) picks the final points.
+
+Inputs may be lists, `array`s or numpy arrays. With numpy the min/max pass
+is fully vectorised; without it the pass works on slices, so the
+per-element work still happens in C. LTTB runs on plain float lists with
+prefix sums, which is far cheaper than indexing numpy arrays per element.
+"""
+
+from __future__ import annotations
+
+from itertools import accumulate
+from typing import List, Sequence, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - optional speed-up
+    np = None  # type: ignore
+
+
+def _floats(vals: Sequence[float]) -> List[float]:
+    # One conversion up front: indexing numpy arrays per element is slow and
+    # keeps the narrow dtype (uint8 util would overflow in the arithmetic)
+    tolist = getattr(vals, "tolist", None)
+    return [float(v) for v in (tolist() if tolist is not None else vals)]
+
+
+def _first_hits(mask, bucket):
+    """Index of the first True of `mask` in each bucket (every bucket has one)."""
+    pos = np.flatnonzero(mask)
+    _, first = np.unique(bucket[pos], return_index=True)
+    return pos[first]
+
+
+def minmax(xs: Sequence[float], ys: Sequence[float], buckets: int) -> Tuple[List[float], List[float]]:
+    """Keeps the min and max sample of each of `buckets` equal-count buckets, in time order."""
+    n = len(ys)
+    if n <= 2 * buckets:
+        return _floats(xs), _floats(ys)
+    if np is not None:
+        y = np.asarray(ys, dtype=float)
+        x = np.asarray(xs, dtype=float)
+        starts = (np.arange(buckets) * n) // buckets
+        bucket = np.repeat(np.arange(buckets), np.diff(np.append(starts, n)))
+        lo = _first_hits(y == np.minimum.reduceat(y, starts)[bucket], bucket)
+        hi = _first_hits(y == np.maximum.reduceat(y, starts)[bucket], bucket)
+        idx = np.column_stack((np.minimum(lo, hi), np.maximum(lo, hi))).ravel()
+        return x[idx].tolist(), y[idx].tolist()
+    out_x: List[float] = []
+    out_y: List[float] = []
+    for k in range(buckets):
+        a, b = (k * n) // buckets, ((k + 1) * n) // buckets
+        seg = ys[a:b]
+        lo, hi = min(seg), max(seg)
+        i, j = a + seg.index(lo), a + seg.index(hi)
+        for p in ((i, j) if i <= j else (j, i)):
+            out_x.append(float(xs[p]))
+            out_y.append(float(ys[p]))
+    return out_x, out_y
+
+
+def lttb(xs: Sequence[float], ys: Sequence[float], threshold: int) -> Tuple[List[float], List[float]]:
+    """Largest-Triangle-Three-Buckets; keeps first and last points."""
+    xs, ys = _floats(xs), _floats(ys)
+    n = len(ys)
+    if threshold >= n or threshold < 3:
+        return xs, ys
+    # Prefix sums make each next-bucket average O(1)
+    cx = list(accumulate(xs, initial=0.0))
+    cy = list(accumulate(ys, initial=0.0))
+    out_x = [xs[0]]
+    out_y = [ys[0]]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third triangle vertex
+        nb_start = int((i + 1) * every) + 1
+        nb_end = min(int((i + 2) * every) + 1, n)
+        cnt = max(1, nb_end - nb_start)
+        avg_x = (cx[nb_end] - cx[nb_start]) / cnt
+        avg_y = (cy[nb_end] - cy[nb_start]) / cnt
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        ax, ay = xs[a], ys[a]
+        dx, dy = ax - avg_x, avg_y - ay
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs(dx * (ys[j] - ay) - (ax - xs[j]) * dy)
+            if area > best_area:
+                best_area, best = area, j
+        out_x.append(xs[best])
+        out_y.append(ys[best])
+        a = best
+    out_x.append(xs[n - 1])
+    out_y.append(ys[n - 1])
+    return out_x, out_y
+
+
+def downsample(xs: Sequence[float], ys: Sequence[float], target: int) -> Tuple[List[float], List[float]]:
+    """Shape-preserving reduction to about `target` points."""
+    n = len(ys)
+    if n <= target:
+        return _floats(xs), _floats(ys)
+    if n > 4 * target:
+        # Bound LTTB's Python loop: 2 points per bucket -> ~4*target points
+        xs, ys = minmax(xs, ys, 2 * target)
+    return lttb(xs, ys, target)
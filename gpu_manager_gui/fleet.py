@@ -0,0 +1,172 @@
+"""Fleet mode: poll every saved profile concurrently.
+
+Each host gets one fused poll (see ssh_worker.FUSED_POLL_SCRIPT) per interval
+as a coroutine on the shared async engine. Hosts are scheduled independently: a slow or dead
+host only delays its own next poll, so a full sweep takes roughly the latency
+of the slowest host rather than the sum of all of them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures as cf
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from . import async_engine, config_store, ssh_pool
+from .nvidia_parser import ComputeApp, GpuInfo
+from .ssh_mux import SSHMultiplexer
+from .ssh_worker import FUSED_POLL_SCRIPT, snapshot_from_fused_output
+
+
+@dataclass
+class FleetHost:
+    key: str
+    host: str
+    port: int = 22
+    username: Optional[str] = None
+    identity: Optional[str] = None
+    password: Optional[str] = None
+    interval: float = 5.0
+
+
+@dataclass
+class HostResult:
+    key: str
+    host: str
+    t_unix: float
+    latency_s: float
+    gpus: List[GpuInfo] = field(default_factory=list)
+    apps: List[ComputeApp] = field(default_factory=list)
+    pid_user_map: Dict[int, str] = field(default_factory=dict)
+    error: str = ""
+
+
+def hosts_from_config(cfg: Dict[str, Any]) -> List[FleetHost]:
+    """One FleetHost per saved profile (stored password used when remembered)."""
+    hosts: List[FleetHost] = []
+    for key, prof in sorted((cfg.get("profiles") or {}).items()):
+        if not isinstance(prof, dict) or not prof.get("host"):
+            continue
+        try:
+            hosts.append(
+                FleetHost(
+                    key=key,
+                    host=str(prof["host"]),
+                    port=int(prof.get("port", 22)),
+                    username=prof.get("username") or None,
+                    identity=prof.get("identity") or None,
+                    password=config_store.get_profile_password(prof) or None,
+                    interval=float(prof.get("interval", 5.0)),
+                )
+            )
+        except (TypeError, ValueError):
+            continue
+    return hosts
+
+
+class FleetPoller(QObject):
+    """Polls many hosts concurrently and emits one HostResult per host poll.
+
+    Runs as one coroutine per host on the shared async engine (no thread per
+    host). At most `max_concurrency` SSH calls are in flight; each host has at
+    most one. Key/agent hosts share a ControlMaster per host across polls;
+    password hosts hold a pooled paramiko connection while the fleet runs.
+    """
+
+    host_result = pyqtSignal(object)  # emits HostResult
+
+    def __init__(
+        self,
+        hosts: List[FleetHost],
+        max_concurrency: int = 16,
+        interval_sec: Optional[float] = None,
+        ssh_bin: str = "ssh",
+        timeout_sec: float = 8.0,
+    ) -> None:
+        super().__init__()
+        self._hosts = list(hosts)
+        self._max_concurrency = max(1, int(max_concurrency))
+        # None: each host uses its profile interval
+        self._interval = interval_sec
+        self._ssh_bin = ssh_bin
+        self._timeout = float(timeout_sec)
+        self._future: Optional[cf.Future] = None
+        self._muxes: Dict[str, SSHMultiplexer] = {}
+        self._conns: Dict[str, ssh_pool.PooledConnection] = {}
+
+    def start(self) -> None:
+        if self._future is None and self._hosts:
+            self._future = async_engine.engine().submit(self._run())
+
+    def stop(self) -> None:
+        fut, self._future = self._future, None
+        if fut is not None:
+            fut.cancel()
+
+    def _emit(self, res: HostResult) -> None:
+        # Runs on the GUI thread via the engine bridge
+        if self._future is not None:
+            self.host_result.emit(res)
+
+    # One host -------------------------------------------------------------
+    async def _poll_host(self, h: FleetHost, sem: asyncio.Semaphore) -> HostResult:
+        async with sem:
+            t0 = time.time()
+            rc, out, err = await async_engine.run_ssh(
+                h.host, h.port, h.username, h.identity, FUSED_POLL_SCRIPT,
+                timeout=self._timeout, conn=self._conns.get(h.key), mux=self._muxes.get(h.key), ssh_bin=self._ssh_bin,
+            )
+        snap = snapshot_from_fused_output(rc, out, err)
+        return HostResult(
+            key=h.key,
+            host=h.host,
+            t_unix=snap.t_unix,
+            latency_s=time.time() - t0,
+            gpus=snap.gpus,
+            apps=snap.apps,
+            pid_user_map=snap.pid_user_map or {},
+            error="; ".join(snap.raw_errors),
+        )
+
+    async def _host_loop(self, h: FleetHost, sem: asyncio.Semaphore) -> None:
+        eng = async_engine.engine()
+        interval = max(1.0, float(self._interval if self._interval else h.interval))
+        while True:
+            try:
+                res = await self._poll_host(h, sem)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:  # noqa: BLE001
+                res = HostResult(h.key, h.host, time.time(), 0.0, error=str(e))
+            eng.post(self._emit, res)
+            await asyncio.sleep(interval)
+
+    # Lifecycle --------------------------------------------------------------
+    def _open(self) -> None:
+        for h in self._hosts:
+            if h.password:
+                self._conns[h.key] = ssh_pool.acquire(h.host, h.port, h.username, h.password, h.identity, timeout=self._timeout)
+            else:
+                self._muxes[h.key] = SSHMultiplexer(h.host, h.port, h.username, h.identity, self._ssh_bin)
+
+    def _close(self) -> None:
+        for mux in self._muxes.values():
+            mux.close()
+        self._muxes.clear()
+        for conn in self._conns.values():
+            ssh_pool.release(conn)
+        self._conns.clear()
+
+    async def _run(self) -> None:
+        self._open()
+        sem = asyncio.Semaphore(self._max_concurrency)
+        try:
+            # Hosts are independent tasks: a slow host never delays the others
+            await asyncio.gather(*(self._host_loop(h, sem) for h in self._hosts))
+        finally:
+            # ssh -O exit / transport close block briefly; keep them off the loop
+            await async_engine.engine().run_blocking(self._close)
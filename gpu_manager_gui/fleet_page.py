@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import time
+from typing import Dict, List
+
+from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtGui import QColor
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget, QTableWidgetItem,
+    QAbstractItemView, QHeaderView,
+)
+
+from .fleet import HostResult
+
+
+class _NumItem(QTableWidgetItem):
+    """Table item that sorts by a numeric key instead of its text."""
+
+    def __init__(self, text: str, key: float) -> None:
+        super().__init__(text)
+        self._key = float(key)
+        self.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+
+    def __lt__(self, other: QTableWidgetItem) -> bool:  # type: ignore[override]
+        if isinstance(other, _NumItem):
+            return self._key < other._key
+        return super().__lt__(other)
+
+
+class FleetPage(QWidget):
+    """One row per GPU across all saved hosts; sortable, defaults to most free VRAM first."""
+
+    back_requested = pyqtSignal()
+    # Profile key of the host the user wants to open in the normal monitor
+    open_requested = pyqtSignal(str)
+
+    COLS = ["Host", "GPU", "Name", "Util %", "Free (MiB)", "Total (MiB)", "Users", "Status"]
+    COL_FREE = 4
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._results: Dict[str, HostResult] = {}
+        layout = QVBoxLayout(self)
+        top = QHBoxLayout()
+        self.summary_label = QLabel("")
+        self.back_btn = QPushButton("Back")
+        top.addWidget(self.summary_label)
+        top.addStretch(1)
+        top.addWidget(self.back_btn)
+        layout.addLayout(top)
+
+        self.table = QTableWidget(0, len(self.COLS))
+        self.table.setHorizontalHeaderLabels(self.COLS)
+        hh = self.table.horizontalHeader()
+        for c in range(len(self.COLS)):
+            hh.setSectionResizeMode(c, QHeaderView.ResizeMode.ResizeToContents)
+        hh.setSectionResizeMode(6, QHeaderView.ResizeMode.Stretch)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setSortingEnabled(True)
+        self.table.sortItems(self.COL_FREE, Qt.SortOrder.DescendingOrder)
+        self.table.setToolTip("Double-click a row to open that host")
+        layout.addWidget(self.table, 1)
+
+        self.back_btn.clicked.connect(lambda: self.back_requested.emit())
+        self.table.cellDoubleClicked.connect(self._row_activated)
+
+    def reset(self, host_keys: List[str]) -> None:
+        self._results = {k: HostResult(k, k, 0.0, 0.0, error="polling…") for k in host_keys}
+        self._render()
+
+    def update_host(self, res: HostResult) -> None:
+        self._results[res.key] = res
+        self._render()
+
+    def _row_activated(self, row: int, _col: int) -> None:
+        it = self.table.item(row, 0)
+        if it is not None:
+            key = it.data(Qt.ItemDataRole.UserRole)
+            if key:
+                self.open_requested.emit(str(key))
+
+    @staticmethod
+    def _users_by_gpu(res: HostResult) -> Dict[str, Dict[str, int]]:
+        out: Dict[str, Dict[str, int]] = {}
+        for app in res.apps:
+            user = res.pid_user_map.get(app.pid, "unknown")
+            per = out.setdefault(app.gpu_uuid, {})
+            per[user] = per.get(user, 0) + max(0, app.used_memory_mib)
+        return out
+
+    def _render(self) -> None:
+        # Keep the user's sort column/order: disable sorting while filling
+        self.table.setSortingEnabled(False)
+        rows = []
+        n_gpus = n_idle = 0
+        for key, res in self._results.items():
+            status = res.error or f"ok {res.latency_s:.1f}s"
+            if not res.gpus:
+                rows.append((key, res, None, {}, status))
+                continue
+            users = self._users_by_gpu(res)
+            for g in res.gpus:
+                n_gpus += 1
+                if g.util_percent < 10 and not users.get(g.uuid):
+                    n_idle += 1
+                rows.append((key, res, g, users.get(g.uuid, {}), status))
+        self.table.setRowCount(len(rows))
+        for r, (key, res, g, users, status) in enumerate(rows):
+            host_it = QTableWidgetItem(key)
+            host_it.setData(Qt.ItemDataRole.UserRole, key)
+            self.table.setItem(r, 0, host_it)
+            if g is None:
+                for c in range(1, 6):
+                    self.table.setItem(r, c, _NumItem("-", -1))
+                self.table.setItem(r, 6, QTableWidgetItem(""))
+            else:
+                free = max(0, g.mem_total_mib - g.mem_used_mib)
+                self.table.setItem(r, 1, _NumItem(str(g.index), g.index))
+                self.table.setItem(r, 2, QTableWidgetItem(g.name))
+                self.table.setItem(r, 3, _NumItem(f"{g.util_percent}%", g.util_percent))
+                self.table.setItem(r, 4, _NumItem(str(free), free))
+                self.table.setItem(r, 5, _NumItem(str(g.mem_total_mib), g.mem_total_mib))
+                txt = ", ".join(f"{u} ({m} MiB)" for u, m in sorted(users.items(), key=lambda kv: kv[1], reverse=True))
+                self.table.setItem(r, 6, QTableWidgetItem(txt))
+            st_it = QTableWidgetItem(status)
+            if res.error:
+                st_it.setForeground(QColor("#c62828"))
+                st_it.setToolTip(res.error)
+            elif res.t_unix:
+                st_it.setToolTip(time.strftime("updated %H:%M:%S", time.localtime(res.t_unix)))
+            self.table.setItem(r, 7, st_it)
+        self.table.setSortingEnabled(True)
+        self.summary_label.setText(f"{len(self._results)} hosts · {n_gpus} GPUs · {n_idle} idle")
@@ -0,0 +1,279 @@
+"""In-memory GPU history: fixed-size ring buffers per host.
+
+`HostHistory` keeps one shared timestamp column plus fixed-dtype columns per
+GPU (util %, used MiB) and per user (VRAM MiB), all preallocated `array`s, so
+appending is O(1) with no allocation and memory is bounded up front:
+
+    24 h at 1 s = 86400 slots; 8 GPUs -> ~4 MB (8 B time + 5 B per GPU per slot)
+
+Window queries locate the window by binary search on the (monotonic) time
+column and then reduce contiguous slices; with numpy installed the slices are
+zero-copy views and the reductions are vectorised.
+
+Time is bucketed by `sample_sec`: samples falling into the newest slot's
+bucket (fast polling, streaming mode) overwrite that slot's values, so the
+retention in seconds stays what was configured. The slot keeps the time of
+its first sample.
+"""
+
+from __future__ import annotations
+
+import math
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - optional speed-up
+    np = None  # type: ignore
+
+
+DEFAULT_RETENTION_SEC = 24 * 3600
+DEFAULT_SAMPLE_SEC = 1.0
+
+# Column typecodes: util fits a byte, MiB fits uint32
+_UTIL = "B"
+_MIB = "I"
+
+
+@dataclass
+class WindowStats:
+    n: int
+    min: float
+    mean: float
+    max: float
+    p95: float
+
+
+_EMPTY = WindowStats(0, math.nan, math.nan, math.nan, math.nan)
+
+
+def _p95_sorted(vals: Sequence[float]) -> float:
+    # Nearest-rank percentile
+    k = max(0, math.ceil(0.95 * len(vals)) - 1)
+    return float(vals[k])
+
+
+class HostHistory:
+    """Ring-buffered history of one host's snapshots.
+
+    Columns are addressed as ("util", gpu_index), ("mem", gpu_index) or
+    ("user", name). Columns that appear later (a new user) read as 0 before
+    their first sample.
+    """
+
+    def __init__(self, retention_sec: float = DEFAULT_RETENTION_SEC, sample_sec: float = DEFAULT_SAMPLE_SEC) -> None:
+        self.sample_sec = max(0.0, float(sample_sec))
+        self.capacity = max(2, int(math.ceil(float(retention_sec) / max(self.sample_sec, 1e-3))))
+        self._t = array("d", bytes(8 * self.capacity))
+        self._cols: Dict[Tuple[str, Any], array] = {}
+        self._head = 0  # next physical slot to write
+        self._size = 0
+
+    # Writing ----------------------------------------------------------------
+    def _col(self, key: Tuple[str, Any], code: str) -> array:
+        col = self._cols.get(key)
+        if col is None:
+            col = array(code, bytes(array(code).itemsize * self.capacity))
+            self._cols[key] = col
+        return col
+
+    def _bucket(self, t: float) -> float:
+        return t // self.sample_sec if self.sample_sec > 0 else t
+
+    def append(self, t: float, gpus: Iterable[Any], user_vram_mib: Optional[Dict[str, int]] = None) -> None:
+        """Records one sample (`gpus` are GpuInfo-like objects)."""
+        self.append_values(t, {g.index: (g.util_percent, g.mem_used_mib) for g in gpus}, user_vram_mib)
+
+    def append_values(self, t: float, gpus: Dict[int, Tuple[int, int]], user_vram_mib: Optional[Dict[str, int]] = None) -> None:
+        """Records one sample given as {gpu index: (util %, used MiB)}."""
+        if self._size and self._bucket(t) <= self._bucket(self.latest_time()):
+            i = (self._head - 1) % self.capacity  # coalesce into the newest slot
+        else:
+            i = self._head
+            self._head = (self._head + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+            # Columns not present in this sample must not keep a value from a lap ago
+            for col in self._cols.values():
+                col[i] = 0
+            self._t[i] = float(t)
+        for idx, (util, used) in gpus.items():
+            self._col(("util", idx), _UTIL)[i] = max(0, min(255, int(util)))
+            self._col(("mem", idx), _MIB)[i] = max(0, int(used))
+        for user, mib in (user_vram_mib or {}).items():
+            self._col(("user", user), _MIB)[i] = max(0, int(mib))
+
+    def append_snapshot(self, snap: Any) -> None:
+        self.append(snap.t_unix, snap.gpus, snap.user_vram_mib)
+
+    def samples(self, since: float = -math.inf) -> Iterator[Tuple[float, Dict[int, Tuple[int, int]], Dict[str, int]]]:
+        """(t, {gpu: (util, used MiB)}, {user: MiB}) per slot with t > since, oldest first."""
+        gpus = self.gpu_indices()
+        users = self.users()
+        for logical in range(self._first_logical_since(since), self._size):
+            i = self._phys(logical)
+            t = self._t[i]
+            if t <= since:
+                continue
+            yield (
+                t,
+                {g: (self._cols[("util", g)][i], self._cols[("mem", g)][i]) for g in gpus},
+                {u: self._cols[("user", u)][i] for u in users if self._cols[("user", u)][i]},
+            )
+
+    # Introspection ----------------------------------------------------------
+    def __len__(self) -> int:
+        return self._size
+
+    def nbytes(self) -> int:
+        return sum(c.itemsize * len(c) for c in self._cols.values()) + self._t.itemsize * len(self._t)
+
+    def columns(self) -> List[Tuple[str, Any]]:
+        return list(self._cols)
+
+    def users(self) -> List[str]:
+        return sorted(k[1] for k in self._cols if k[0] == "user")
+
+    def gpu_indices(self) -> List[int]:
+        return sorted(k[1] for k in self._cols if k[0] == "util")
+
+    def latest_time(self) -> float:
+        return self._t[(self._head - 1) % self.capacity] if self._size else math.nan
+
+    # Reading ----------------------------------------------------------------
+    def _phys(self, logical: int) -> int:
+        return (self._head - self._size + logical) % self.capacity
+
+    def _first_logical_since(self, t0: float) -> int:
+        lo, hi = 0, self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._t[self._phys(mid)] < t0:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _segments(self, seconds: Optional[float], now: Optional[float]) -> List[Tuple[int, int]]:
+        """Physical [start, stop) ranges of the window, oldest first (at most two)."""
+        if not self._size:
+            return []
+        first = 0
+        if seconds is not None:
+            ref = self.latest_time() if now is None else float(now)
+            first = self._first_logical_since(ref - float(seconds))
+        n = self._size - first
+        if n <= 0:
+            return []
+        start = self._phys(first)
+        end = start + n
+        if end <= self.capacity:
+            return [(start, end)]
+        return [(start, self.capacity), (0, end - self.capacity)]
+
+    def _slices(self, col: array, segs: List[Tuple[int, int]]):
+        if np is not None:
+            view = np.frombuffer(col, dtype=np.dtype(col.typecode))
+            parts = [view[a:b] for a, b in segs]
+            return parts[0] if len(parts) == 1 else np.concatenate(parts)
+        out = array(col.typecode)
+        for a, b in segs:
+            out.extend(col[a:b])
+        return out
+
+    def series(self, key: Tuple[str, Any], seconds: Optional[float] = None, now: Optional[float] = None):
+        """(times, values) for the last `seconds` (all retained data if None).
+
+        Returns numpy arrays when numpy is available, else `array`s.
+        """
+        segs = self._segments(seconds, now)
+        col = self._cols.get(key)
+        ts = self._slices(self._t, segs)
+        if col is None:
+            vals = np.zeros(len(ts)) if np is not None else array(_MIB, bytes(4 * len(ts)))
+            return ts, vals
+        return ts, self._slices(col, segs)
+
+    def recent(self, key: Tuple[str, Any], seconds: float, points: int = 60) -> List[float]:
+        """Up to `points` values covering the last `seconds`, bucket max (for sparklines)."""
+        _, vals = self.series(key, seconds)
+        n = len(vals)
+        if n <= points:
+            return [float(v) for v in vals]
+        step = n / float(points)
+        return [float(max(vals[int(i * step):max(int(i * step) + 1, int((i + 1) * step))])) for i in range(points)]
+
+    def stats(self, key: Tuple[str, Any], seconds: Optional[float] = None, now: Optional[float] = None) -> WindowStats:
+        """min/mean/max/p95 of one column over the window."""
+        _, vals = self.series(key, seconds, now)
+        n = len(vals)
+        if not n:
+            return _EMPTY
+        if np is not None:
+            return WindowStats(
+                n, float(vals.min()), float(vals.mean()), float(vals.max()),
+                float(np.sort(vals)[max(0, math.ceil(0.95 * n) - 1)]),
+            )
+        s = sorted(vals)
+        return WindowStats(n, float(s[0]), sum(s) / n, float(s[-1]), _p95_sorted(s))
+
+    def idle_seconds(self, gpu_index: int, util_max: int = 5, mem_max_mib: Optional[int] = None) -> float:
+        """How long (up to retention) the GPU has stayed at or below the thresholds."""
+        util = self._cols.get(("util", gpu_index))
+        if util is None or not self._size:
+            return 0.0
+        mem = self._cols.get(("mem", gpu_index))
+        newest = self.latest_time()
+        since = newest
+        for logical in range(self._size - 1, -1, -1):
+            i = self._phys(logical)
+            if util[i] > util_max or (mem_max_mib is not None and mem is not None and mem[i] > mem_max_mib):
+                break
+            since = self._t[i]
+        return max(0.0, newest - since)
+
+
+class HistoryStore:
+    """HostHistory per host key, created on first sample."""
+
+    def __init__(self, retention_sec: float = DEFAULT_RETENTION_SEC, sample_sec: float = DEFAULT_SAMPLE_SEC) -> None:
+        self._retention = float(retention_sec)
+        self._sample = float(sample_sec)
+        self._hosts: Dict[str, HostHistory] = {}
+
+    def host(self, key: str) -> HostHistory:
+        h = self._hosts.get(key)
+        if h is None:
+            h = HostHistory(self._retention, self._sample)
+            self._hosts[key] = h
+        return h
+
+    def new_host(self) -> HostHistory:
+        """An empty HostHistory with this store's settings (for seeding off-thread)."""
+        return HostHistory(self._retention, self._sample)
+
+    def seed(self, key: str, seeded: HostHistory) -> None:
+        """Installs `seeded` (e.g. loaded from disk) as the history of `key`.
+
+        Samples recorded live while it was being loaded are appended on top, so
+        nothing newer is lost.
+        """
+        cur = self._hosts.get(key)
+        if cur is not None and len(cur):
+            for t, gpus, users in cur.samples(since=seeded.latest_time() if len(seeded) else -math.inf):
+                seeded.append_values(t, gpus, users)
+        self._hosts[key] = seeded
+
+    @property
+    def retention_sec(self) -> float:
+        return self._retention
+
+    def get(self, key: str) -> Optional[HostHistory]:
+        return self._hosts.get(key)
+
+    def keys(self) -> List[str]:
+        return list(self._hosts)
+
+    def nbytes(self) -> int:
+        return sum(h.nbytes() for h in self._hosts.values())
@@ -0,0 +1,410 @@
+"""Persistent GPU history: fixed-width, append-only, memory-mappable segments.
+
+Layout under `config_store.CONFIG_DIR/history/<host key>/`:
+
+    raw/YYYYMMDD.gpu   1 record per GPU per sample   <d t><B gpu><B util><2x><I mem_used><I mem_total>  (20 B)
+    raw/YYYYMMDD.usr   1 record per user per sample  <d t><H user id><2x><I vram MiB>                  (16 B)
+    min/YYYYMMDD.gpu   1-minute rollups              <d t><B gpu><B util mean><B util max><x><I mem max><I mem_total>
+    min/YYYYMMDD.usr   1-minute rollups              <d t><H user id><2x><I vram max>
+    users.json         user name -> id
+
+Days are UTC. Records are appended in time order, so a time-range query
+binary-searches the mapped file and touches only the pages it returns; with
+numpy the segment is opened as a `numpy.memmap` of a structured dtype, so even
+weeks of 1 Hz data open without parsing.
+
+Writes go through a background thread (batched, never on the GUI thread), which
+also rolls raw days older than `raw_days` into 1-minute rollups and removes
+rollups older than `rollup_days`.
+"""
+
+from __future__ import annotations
+
+import calendar
+import json
+import mmap
+import os
+import queue
+import re
+import struct
+import threading
+import time
+from itertools import groupby
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import config_store
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - optional speed-up
+    np = None  # type: ignore
+
+
+HISTORY_DIR = os.path.join(config_store.CONFIG_DIR, "history")
+
+RAW_GPU = struct.Struct("<dBBxxII")
+RAW_USR = struct.Struct("<dHxxI")
+MIN_GPU = struct.Struct("<dBBBxII")
+MIN_USR = RAW_USR
+
+if np is not None:
+    _DT_RAW_GPU = np.dtype({"names": ["t", "gpu", "util", "mem_used", "mem_total"], "formats": ["<f8", "u1", "u1", "<u4", "<u4"], "offsets": [0, 8, 9, 12, 16], "itemsize": 20})
+    _DT_MIN_GPU = np.dtype({"names": ["t", "gpu", "util", "util_max", "mem_used", "mem_total"], "formats": ["<f8", "u1", "u1", "u1", "<u4", "<u4"], "offsets": [0, 8, 9, 10, 12, 16], "itemsize": 20})
+    _DT_USR = np.dtype({"names": ["t", "user", "mib"], "formats": ["<f8", "<u2", "<u4"], "offsets": [0, 8, 12], "itemsize": 16})
+
+DAY_SEC = 86400
+# GPU query rows: (t, gpu index, util %, mem used MiB, mem total MiB). For
+# rollups util is the minute mean and mem_used the minute max.
+GpuRow = Tuple[float, int, int, int, int]
+
+
+def _safe_name(key: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._@-]+", "_", key) or "_"
+
+
+def _day_of(t: float) -> str:
+    return time.strftime("%Y%m%d", time.gmtime(t))
+
+
+def _day_start(day: str) -> float:
+    return float(calendar.timegm(time.strptime(day, "%Y%m%d")))
+
+
+def _days_between(t0: float, t1: float) -> List[str]:
+    days = []
+    t = _day_start(_day_of(t0))
+    while t <= t1:
+        days.append(_day_of(t))
+        t += DAY_SEC
+    return days
+
+
+class _Segment:
+    """Read-only view over one segment file (mmap; numpy.memmap if available)."""
+
+    def __init__(self, path: str, rec: struct.Struct, dtype: Any = None) -> None:
+        self.rec = rec
+        self.n = 0
+        self._mm: Optional[mmap.mmap] = None
+        self._arr = None
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        # A torn trailing record (crash mid-write) is ignored
+        self.n = size // rec.size
+        if not self.n:
+            return
+        if np is not None and dtype is not None:
+            self._arr = np.memmap(path, dtype=dtype, mode="r", shape=(self.n,))
+        else:
+            with open(path, "rb") as f:
+                self._mm = mmap.mmap(f.fileno(), self.n * rec.size, access=mmap.ACCESS_READ)
+
+    def _t(self, i: int) -> float:
+        return self.rec.unpack_from(self._mm, i * self.rec.size)[0]  # type: ignore[arg-type]
+
+    def _bisect(self, t: float) -> int:
+        lo, hi = 0, self.n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._t(mid) < t:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def range(self, t0: float, t1: float):
+        """Records with t0 <= t < t1: structured ndarray or list of tuples."""
+        if not self.n:
+            return [] if self._arr is None else None
+        if self._arr is not None:
+            ts = self._arr["t"]
+            a, b = np.searchsorted(ts, t0, "left"), np.searchsorted(ts, t1, "left")
+            return self._arr[a:b]
+        a, b = self._bisect(t0), self._bisect(t1)
+        size = self.rec.size
+        return [self.rec.unpack_from(self._mm, i * size) for i in range(a, b)]  # type: ignore[arg-type]
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._arr = None
+
+
+class _HostDir:
+    def __init__(self, root: str, key: str) -> None:
+        self.path = os.path.join(root, _safe_name(key))
+        self.raw = os.path.join(self.path, "raw")
+        self.min = os.path.join(self.path, "min")
+        self._users_path = os.path.join(self.path, "users.json")
+        self._lock = threading.Lock()
+        self.user_ids: Dict[str, int] = {}
+        try:
+            with open(self._users_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                self.user_ids = {str(k): int(v) for k, v in data.items()}
+        except Exception:
+            pass
+
+    def user_id(self, name: str) -> int:
+        with self._lock:
+            uid = self.user_ids.get(name)
+            if uid is None:
+                uid = len(self.user_ids)
+                self.user_ids[name] = uid
+                os.makedirs(self.path, exist_ok=True)
+                tmp = self._users_path + ".tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(self.user_ids, f)
+                os.replace(tmp, self._users_path)
+            return uid
+
+    def user_names(self) -> Dict[int, str]:
+        with self._lock:
+            return {v: k for k, v in self.user_ids.items()}
+
+
+class MetricsHistoryDB:
+    """Per-host on-disk history. `append` is cheap and thread-safe; reads can
+    run on any thread."""
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        raw_days: int = 7,
+        rollup_days: int = 400,
+        flush_sec: float = 5.0,
+        compact_every_sec: float = 3600.0,
+        min_step_sec: float = 1.0,
+    ) -> None:
+        self.root = root or HISTORY_DIR
+        self.raw_days = max(1, int(raw_days))
+        self.rollup_days = max(self.raw_days, int(rollup_days))
+        self._flush_sec = float(flush_sec)
+        self._compact_every = float(compact_every_sec)
+        # Faster samples (streaming mode) are dropped so a day stays ~1 Hz at most
+        self._min_step = max(0.0, float(min_step_sec))
+        self._last_t: Dict[str, float] = {}
+        self._hosts: Dict[str, _HostDir] = {}
+        self._hosts_lock = threading.Lock()
+        self._q: "queue.Queue[Optional[Tuple[str, float, list, dict]]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self._closed = False
+        self._thread.start()
+
+    def _host(self, key: str) -> _HostDir:
+        with self._hosts_lock:
+            h = self._hosts.get(key)
+            if h is None:
+                h = _HostDir(self.root, key)
+                self._hosts[key] = h
+            return h
+
+    # Writing ----------------------------------------------------------------
+    def append(self, host_key: str, t: float, gpus: Iterable[Any], user_vram_mib: Optional[Dict[str, int]] = None) -> None:
+        if self._closed:
+            return
+        t = float(t)
+        if t - self._last_t.get(host_key, 0.0) < self._min_step:
+            return
+        self._last_t[host_key] = t
+        rows = [(int(g.index), int(g.util_percent), int(g.mem_used_mib), int(g.mem_total_mib)) for g in gpus]
+        self._q.put((host_key, t, rows, dict(user_vram_mib or {})))
+
+    def append_snapshot(self, host_key: str, snap: Any) -> None:
+        self.append(host_key, snap.t_unix, snap.gpus, snap.user_vram_mib)
+
+    def close(self, timeout: float = 3.0) -> None:
+        """Flushes pending samples and stops the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._q.put(None)
+        self._thread.join(timeout)
+
+    def _write_batch(self, batch: List[Tuple[str, float, list, dict]]) -> None:
+        # Group bytes per file so each file is opened and written once per flush
+        out: Dict[str, bytearray] = {}
+        for key, t, rows, users in batch:
+            h = self._host(key)
+            day = _day_of(t)
+            gbuf = out.setdefault(os.path.join(h.raw, day + ".gpu"), bytearray())
+            for idx, util, used, total in rows:
+                gbuf += RAW_GPU.pack(t, idx & 0xFF, max(0, min(255, util)), max(0, used), max(0, total))
+            if users:
+                ubuf = out.setdefault(os.path.join(h.raw, day + ".usr"), bytearray())
+                for name, mib in users.items():
+                    ubuf += RAW_USR.pack(t, h.user_id(name) & 0xFFFF, max(0, int(mib)))
+        for path, data in out.items():
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "ab") as f:
+                    f.write(data)
+            except Exception:
+                pass
+
+    def _run(self) -> None:
+        batch: List[Tuple[str, float, list, dict]] = []
+        last_flush = time.time()
+        next_compact = time.time() + 30.0  # leave start-up alone
+        while True:
+            try:
+                item = self._q.get(timeout=0.5)
+            except queue.Empty:
+                item = False  # type: ignore[assignment]
+            if item is None:
+                self._write_batch(batch)
+                return
+            if item:
+                batch.append(item)  # type: ignore[arg-type]
+            now = time.time()
+            if batch and (now - last_flush >= self._flush_sec or len(batch) >= 512):
+                self._write_batch(batch)
+                batch = []
+                last_flush = now
+            if now >= next_compact:
+                next_compact = now + self._compact_every
+                try:
+                    self.compact(now)
+                except Exception:
+                    pass
+
+    # Compaction -------------------------------------------------------------
+    def compact(self, now: Optional[float] = None) -> None:
+        """Rolls raw days older than raw_days into 1-minute rollups and drops
+        rollups older than rollup_days."""
+        now = time.time() if now is None else float(now)
+        raw_cutoff = _day_of(now - self.raw_days * DAY_SEC)
+        min_cutoff = _day_of(now - self.rollup_days * DAY_SEC)
+        if not os.path.isdir(self.root):
+            return
+        for name in os.listdir(self.root):
+            hdir = os.path.join(self.root, name)
+            raw = os.path.join(hdir, "raw")
+            if os.path.isdir(raw):
+                for fn in sorted(os.listdir(raw)):
+                    day, ext = os.path.splitext(fn)
+                    if day < raw_cutoff and ext in (".gpu", ".usr"):
+                        self._rollup_file(os.path.join(raw, fn), os.path.join(hdir, "min", fn), ext)
+            mdir = os.path.join(hdir, "min")
+            if os.path.isdir(mdir):
+                for fn in os.listdir(mdir):
+                    if os.path.splitext(fn)[0] < min_cutoff:
+                        try:
+                            os.remove(os.path.join(mdir, fn))
+                        except Exception:
+                            pass
+
+    @staticmethod
+    def _rollup_file(src: str, dst: str, ext: str) -> None:
+        rec = RAW_GPU if ext == ".gpu" else RAW_USR
+        seg = _Segment(src, rec)
+        acc: Dict[Tuple[float, int], List[int]] = {}
+        try:
+            size = rec.size
+            for i in range(seg.n):
+                vals = rec.unpack_from(seg._mm, i * size)  # type: ignore[arg-type]
+                minute = float(int(vals[0]) // 60 * 60)
+                if ext == ".gpu":
+                    _, gpu, util, used, total = vals
+                    a = acc.setdefault((minute, gpu), [0, 0, 0, 0, 0])  # n, util sum, util max, mem max, total
+                    a[0] += 1; a[1] += util; a[2] = max(a[2], util); a[3] = max(a[3], used); a[4] = total
+                else:
+                    _, uid, mib = vals
+                    a = acc.setdefault((minute, uid), [0])
+                    a[0] = max(a[0], mib)
+        finally:
+            seg.close()
+        out = bytearray()
+        for (minute, k), a in sorted(acc.items()):
+            if ext == ".gpu":
+                out += MIN_GPU.pack(minute, k, round(a[1] / max(1, a[0])), a[2], a[3], a[4])
+            else:
+                out += MIN_USR.pack(minute, k, a[0])
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        tmp = dst + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(out)
+        os.replace(tmp, dst)
+        os.remove(src)
+
+    # Reading ----------------------------------------------------------------
+    def _segments(self, host_key: str, t0: float, t1: float, ext: str):
+        h = self._host(host_key)
+        for day in _days_between(t0, t1):
+            raw = os.path.join(h.raw, day + ext)
+            if os.path.exists(raw):
+                yield _Segment(raw, RAW_GPU if ext == ".gpu" else RAW_USR, _dtype(ext, raw=True)), True
+                continue
+            rolled = os.path.join(h.min, day + ext)
+            if os.path.exists(rolled):
+                yield _Segment(rolled, MIN_GPU if ext == ".gpu" else MIN_USR, _dtype(ext, raw=False)), False
+
+    def query_gpu(self, host_key: str, t0: float, t1: float) -> List[GpuRow]:
+        """GPU rows with t0 <= t < t1, oldest first (raw where kept, else rollups)."""
+        rows: List[GpuRow] = []
+        for seg, is_raw in self._segments(host_key, t0, t1, ".gpu"):
+            try:
+                part = seg.range(t0, t1)
+                if part is None or not len(part):
+                    continue
+                if np is not None and not isinstance(part, list):
+                    rows.extend(zip(part["t"].tolist(), part["gpu"].tolist(), part["util"].tolist(), part["mem_used"].tolist(), part["mem_total"].tolist()))
+                elif is_raw:
+                    rows.extend(part)
+                else:
+                    rows.extend((t, g, u, m, tot) for t, g, u, _umax, m, tot in part)
+            finally:
+                seg.close()
+        return rows
+
+    def query_gpu_array(self, host_key: str, t0: float, t1: float):
+        """Like query_gpu but returns one structured numpy array (requires numpy)."""
+        if np is None:
+            raise RuntimeError("numpy not installed")
+        parts = []
+        for seg, _ in self._segments(host_key, t0, t1, ".gpu"):
+            try:
+                part = seg.range(t0, t1)
+                if part is not None and len(part):
+                    parts.append(np.asarray(part[["t", "gpu", "util", "mem_used", "mem_total"]]).copy())
+            finally:
+                seg.close()
+        if not parts:
+            return np.zeros(0, dtype=_DT_RAW_GPU)
+        return np.concatenate([p.astype(_DT_RAW_GPU) for p in parts])
+
+    def query_users(self, host_key: str, t0: float, t1: float) -> Dict[str, List[Tuple[float, int]]]:
+        """user -> [(t, vram MiB), ...] with t0 <= t < t1."""
+        names = self._host(host_key).user_names()
+        out: Dict[str, List[Tuple[float, int]]] = {}
+        for seg, _ in self._segments(host_key, t0, t1, ".usr"):
+            try:
+                part = seg.range(t0, t1)
+                if part is None or not len(part):
+                    continue
+                if np is not None and not isinstance(part, list):
+                    part = zip(part["t"].tolist(), part["user"].tolist(), part["mib"].tolist())
+                for t, uid, mib in part:
+                    out.setdefault(names.get(uid, f"uid{uid}"), []).append((t, mib))
+            finally:
+                seg.close()
+        return out
+
+    def replay(self, host_key: str, t0: float, t1: float) -> Iterator[Tuple[float, Dict[int, Tuple[int, int]], Dict[str, int]]]:
+        """(t, {gpu: (util, used MiB)}, {user: MiB}) per stored sample, oldest
+        first, in the shape HostHistory.append_values takes."""
+        users: Dict[float, Dict[str, int]] = {}
+        for name, pts in self.query_users(host_key, t0, t1).items():
+            for t, mib in pts:
+                users.setdefault(t, {})[name] = mib
+        for t, rows in groupby(self.query_gpu(host_key, t0, t1), key=lambda r: r[0]):
+            yield t, {g: (util, used) for _, g, util, used, _total in rows}, users.get(t, {})
+
+
+def _dtype(ext: str, raw: bool):
+    if np is None:
+        return None
+    if ext == ".usr":
+        return _DT_USR
+    return _DT_RAW_GPU if raw else _DT_MIN_GPU
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import time
+from typing import List, Optional
+
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget, QTableWidgetItem,
+    QAbstractItemView, QHeaderView, QSplitter,
+)
+
+from .remote_jobs import RemoteJob
+from .terminal_widget import TerminalWidget
+
+_COLUMNS = ["Job", "Name", "State", "Started", "Log", "Mode"]
+
+
+def _fmt_size(n: int) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024.0
+    return str(n)
+
+
+class JobsPanel(QWidget):
+    """Detached remote runs (see remote_jobs): list, follow, kill.
+
+    Only UI; MainWindow runs the remote scripts and the log tail (job logs
+    or any remote file picked with Follow file…). The list refreshes every
+    5 s while visible; the log view is a read-only TerminalWidget fed
+    through its frame loop.
+    """
+
+    refresh_req = pyqtSignal()
+    launch_req = pyqtSignal()
+    attach_req = pyqtSignal(str)
+    follow_file_req = pyqtSignal()
+    console_req = pyqtSignal(str)
+    kill_req = pyqtSignal(str)
+    remove_req = pyqtSignal(str)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._jobs: List[RemoteJob] = []
+
+        self.launch_btn = QPushButton("Run detached")
+        try:
+            self.launch_btn.setObjectName("primaryButton")
+            self.launch_btn.setToolTip("Start the Console preset on the host in tmux (or setsid); it keeps running after disconnect")
+        except Exception:
+            pass
+        self.refresh_btn = QPushButton("Refresh")
+        self.attach_btn = QPushButton("Follow log")
+        self.follow_file_btn = QPushButton("Follow file…")
+        try:
+            self.follow_file_btn.setToolTip("Follow any remote log file (only new bytes are fetched)")
+        except Exception:
+            pass
+        self.console_btn = QPushButton("Open in Console")
+        self.kill_btn = QPushButton("Kill")
+        self.remove_btn = QPushButton("Remove")
+        self.status = QLabel("")
+        bar = QHBoxLayout()
+        for b in (self.launch_btn, self.refresh_btn, self.attach_btn, self.follow_file_btn, self.console_btn, self.kill_btn, self.remove_btn):
+            bar.addWidget(b)
+        bar.addStretch(1)
+        bar.addWidget(self.status)
+
+        self.table = QTableWidget(0, len(_COLUMNS))
+        self.table.setHorizontalHeaderLabels(_COLUMNS)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        try:
+            self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        except Exception:
+            pass
+
+        self.log_label = QLabel("Select a job and press Follow log")
+        self.log_view = TerminalWidget()
+        log_w = QWidget()
+        lv = QVBoxLayout(log_w)
+        lv.setContentsMargins(0, 0, 0, 0)
+        lv.addWidget(self.log_label)
+        lv.addWidget(self.log_view, 1)
+
+        split = QSplitter(Qt.Orientation.Vertical)
+        split.addWidget(self.table)
+        split.addWidget(log_w)
+        split.setStretchFactor(0, 1)
+        split.setStretchFactor(1, 3)
+
+        v = QVBoxLayout(self)
+        v.setContentsMargins(0, 0, 0, 0)
+        v.addLayout(bar)
+        v.addWidget(split, 1)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(5000)
+        self._timer.timeout.connect(self.refresh_req.emit)
+        self.launch_btn.clicked.connect(self.launch_req.emit)
+        self.refresh_btn.clicked.connect(self.refresh_req.emit)
+        self.attach_btn.clicked.connect(lambda: self._emit_selected(self.attach_req))
+        self.follow_file_btn.clicked.connect(self.follow_file_req.emit)
+        self.console_btn.clicked.connect(lambda: self._emit_selected(self.console_req))
+        self.kill_btn.clicked.connect(lambda: self._emit_selected(self.kill_req))
+        self.remove_btn.clicked.connect(lambda: self._emit_selected(self.remove_req))
+        self.table.cellDoubleClicked.connect(lambda _r, _c: self._emit_selected(self.attach_req))
+        self.table.itemSelectionChanged.connect(self._update_buttons)
+        self._update_buttons()
+
+    # Selection ------------------------------------------------------------
+    def selected_job(self) -> Optional[RemoteJob]:
+        row = self.table.currentRow()
+        if 0 <= row < len(self._jobs) and self.table.selectionModel().hasSelection():
+            return self._jobs[row]
+        return None
+
+    def _emit_selected(self, signal) -> None:
+        job = self.selected_job()
+        if job is not None:
+            signal.emit(job.id)
+
+    def _update_buttons(self) -> None:
+        job = self.selected_job()
+        for b in (self.attach_btn, self.console_btn):
+            b.setEnabled(job is not None)
+        self.kill_btn.setEnabled(job is not None and job.running)
+        self.remove_btn.setEnabled(job is not None and not job.running)
+
+    # Data -----------------------------------------------------------------
+    def set_jobs(self, jobs: List[RemoteJob]) -> None:
+        keep = self.selected_job()
+        self._jobs = list(jobs)
+        self.table.blockSignals(True)
+        self.table.setRowCount(len(self._jobs))
+        select = -1
+        for row, j in enumerate(self._jobs):
+            started = time.strftime("%m-%d %H:%M", time.localtime(j.started)) if j.started else ""
+            cells = [j.id, j.name, j.state, started, _fmt_size(j.log_size), j.mode]
+            for col, text in enumerate(cells):
+                item = self.table.item(row, col)
+                if item is None:
+                    self.table.setItem(row, col, QTableWidgetItem(text))
+                elif item.text() != text:
+                    item.setText(text)
+            if keep is not None and j.id == keep.id:
+                select = row
+        if select >= 0:
+            self.table.selectRow(select)
+        else:
+            self.table.clearSelection()
+        self.table.blockSignals(False)
+        self._update_buttons()
+        self.status.setText(f"{sum(j.running for j in self._jobs)} running · {len(self._jobs)} jobs")
+
+    def job(self, job_id: str) -> Optional[RemoteJob]:
+        for j in self._jobs:
+            if j.id == job_id:
+                return j
+        return None
+
+    def showEvent(self, e) -> None:  # type: ignore[override]
+        super().showEvent(e)
+        self._timer.start()
+        self.refresh_req.emit()
+
+    def hideEvent(self, e) -> None:  # type: ignore[override]
+        super().hideEvent(e)
+        self._timer.stop()
@@ -0,0 +1,189 @@
+"""Incremental remote log following (no Qt).
+
+The remote side is one short bash script per poll (see `tail_script`): it
+stats the file and prints
+
+    __GM_TAIL__ <size> <offset> <inode> <encoding> <count>\\n
+
+followed by `count` bytes of the file from `offset` (tail -c +N | head -c),
+piped through `zstd`/`gzip` when the delta is at least `compress_min` bytes
+and the client can decode it. Only new bytes ever cross the wire; for text
+logs the compressed catch-up is typically 5-10x smaller again.
+
+The offset restarts at 0 when the file shrank (truncated) or its inode
+changed (rotated/replaced); `TailResponse.offset` tells the caller where
+the data really starts.
+
+`LogOffsetStore` remembers the last delivered offset (and inode) per
+host + path in ~/.isaaclab_gpu_manager/log_offsets.json, so following
+resumes after a reconnect or restart without resending history.
+ssh_exec.RemoteLogTailJob ties both together.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import shlex
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import zstandard  # type: ignore
+except Exception:  # optional: gzip is always available
+    zstandard = None  # type: ignore
+
+from . import config_store
+
+TAIL_MARK = b"__GM_TAIL__ "
+OFFSETS_FILE = os.path.join(config_store.CONFIG_DIR, "log_offsets.json")
+# Deltas below this go uncompressed (not worth the remote CPU + latency)
+COMPRESS_MIN = 64 * 1024
+
+
+def accepted_encodings() -> List[str]:
+    """Encodings this client can decode, preferred first."""
+    return (["zstd"] if zstandard is not None else []) + ["gzip"]
+
+
+def tail_script(
+    path: str,
+    offset: int,
+    max_bytes: int,
+    inode: int = 0,
+    encodings: Sequence[str] = ("gzip",),
+    compress_min: int = COMPRESS_MIN,
+) -> str:
+    """Script printing the header line, then up to `max_bytes` from `offset`.
+
+    A negative offset counts from the end. Relative paths are under $HOME.
+    `inode` (0 = unknown) is the file identity the offset belongs to.
+    """
+    comp = []
+    for enc in encodings:
+        if enc == "zstd":
+            comp.append("{ command -v zstd >/dev/null 2>&1 && e=zstd && z='zstd -q -c -3'; }")
+        elif enc == "gzip":
+            comp.append("{ command -v gzip >/dev/null 2>&1 && e=gzip && z='gzip -c -1'; }")
+    pick = " || ".join(comp) or "false"
+    return (
+        f"f={shlex.quote(path)}; "
+        "case \"$f\" in \"~/\"*) f=\"$HOME/${f#\"~/\"}\";; /*) ;; *) f=\"$HOME/$f\";; esac; "
+        "[ -f \"$f\" ] || { echo '__GM_TAIL__ -1 0 0 raw 0'; exit 0; }; "
+        "size=$(stat -c %s \"$f\" 2>/dev/null || stat -f %z \"$f\" 2>/dev/null || wc -c < \"$f\"); "
+        "ino=$(stat -c %i \"$f\" 2>/dev/null || stat -f %i \"$f\" 2>/dev/null || echo 0); "
+        f"off={int(offset)}; want={int(inode)}; "
+        "if [ \"$off\" -lt 0 ]; then off=$((size + off)); [ \"$off\" -ge 0 ] || off=0; fi; "
+        "[ \"$want\" = 0 ] || [ \"$ino\" = 0 ] || [ \"$want\" = \"$ino\" ] || off=0; "
+        "[ \"$off\" -le \"$size\" ] || off=0; "
+        f"n=$((size - off)); [ \"$n\" -le {int(max_bytes)} ] || n={int(max_bytes)}; "
+        "e=raw; z=cat; "
+        f"if [ \"$n\" -ge {int(compress_min)} ]; then {pick} || true; fi; "
+        "echo \"__GM_TAIL__ $size $off $ino $e $n\"; "
+        "[ \"$n\" -gt 0 ] && tail -c +$((off + 1)) \"$f\" | head -c \"$n\" | $z; true"
+    )
+
+
+@dataclass
+class TailResponse:
+    size: int  # -1: file does not exist (yet)
+    offset: int  # where `data` starts
+    inode: int
+    encoding: str
+    data: bytes  # decoded
+    wire_bytes: int
+
+
+def parse_response(out: bytes) -> TailResponse:
+    """Decodes tail_script() output; raises ValueError if it is not one."""
+    at = out.find(TAIL_MARK)
+    if at < 0:
+        raise ValueError("no tail header in output")
+    eol = out.find(b"\n", at)
+    if eol < 0:
+        raise ValueError("truncated tail header")
+    fields = out[at + len(TAIL_MARK):eol].decode("ascii", "replace").split()
+    if len(fields) != 5:
+        raise ValueError("bad tail header")
+    size, offset, inode = (int(x) for x in fields[:3])
+    enc, body = fields[3], out[eol + 1:]
+    if enc == "gzip":
+        data = zlib.decompress(body, 16 + zlib.MAX_WBITS) if body else b""
+    elif enc == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd data but zstandard is not installed")
+        data = zstandard.ZstdDecompressor().decompressobj().decompress(body) if body else b""
+    else:
+        data = body
+    return TailResponse(size, offset, inode, enc, data, len(out))
+
+
+class LogOffsetStore:
+    """Last delivered offset + inode per key ("user@host:port:/path").
+
+    Writes are debounced (at most one every `save_sec`) and flushed at exit;
+    the oldest entries are dropped past `max_entries`.
+    """
+
+    def __init__(self, path: str = OFFSETS_FILE, max_entries: int = 500, save_sec: float = 2.0) -> None:
+        self.path = path
+        self.max_entries = max(1, int(max_entries))
+        self.save_sec = float(save_sec)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, List[float]] = {}  # key -> [offset, inode, seen]
+        self._dirty = False
+        self._saved_at = 0.0
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                blob = json.load(f)
+            if isinstance(blob, dict):
+                for k, v in blob.items():
+                    if isinstance(v, list) and len(v) == 3:
+                        self._entries[str(k)] = [int(v[0]), int(v[1]), float(v[2])]
+        except Exception:
+            pass
+        atexit.register(self.flush)
+
+    @staticmethod
+    def key(host: str, port: int, username: Optional[str], path: str) -> str:
+        user = f"{username}@" if username else ""
+        return f"{user}{host}:{int(port)}:{path}"
+
+    def get(self, key: str) -> Optional[Tuple[int, int]]:
+        """(offset, inode) or None."""
+        with self._lock:
+            e = self._entries.get(key)
+            return (int(e[0]), int(e[1])) if e else None
+
+    def set(self, key: str, offset: int, inode: int = 0) -> None:
+        with self._lock:
+            self._entries[key] = [int(offset), int(inode), time.time()]
+            if len(self._entries) > self.max_entries:
+                for k, _ in sorted(self._entries.items(), key=lambda kv: kv[1][2])[: len(self._entries) - self.max_entries]:
+                    del self._entries[k]
+            self._dirty = True
+            due = time.monotonic() - self._saved_at >= self.save_sec
+        if due:
+            self.flush()
+
+    def forget(self, key: str) -> None:
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._dirty = True
+        self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            text = json.dumps(self._entries, separators=(",", ":"))
+            self._dirty = False
+            self._saved_at = time.monotonic()
+        try:
+            config_store._write_atomic(self.path, text, durable=False)
+        except Exception:
+            pass
@@ -0,0 +1,244 @@
+"""Training-curve metrics parsed from streamed run output (no Qt).
+
+`LogMetricParser.feed(text)` takes output in whatever chunks it arrives
+(Runner job fragments, console frames), carries the unfinished last line
+over and returns the samples found. It never keeps more than one partial
+line: lines are located by searching the chunk for the patterns' literal
+keywords (one C-level regex pass), so the log lines that carry no metric,
+usually nearly all of them, are never split or looked at in Python.
+
+The default pattern set understands rsl_rl (IsaacLab's default runner) and
+rl_games summaries; more can come from config (`log_metrics` list, see
+`patterns_from_config`). A pattern's regex gives the value as group
+"value" (else group 1) and may name the metric with a group "name"
+(Episode_Reward/..., Metrics/...).
+
+`MetricStore` keeps one `RunMetrics` per run. Each metric is three `array`
+columns (time, iteration, value) bounded to `max_points`: when a column is
+full every other sample is dropped and only every 2nd (4th, ...) new
+sample is kept, so the whole run stays plottable in bounded memory.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Tuple
+
+# Longest partial line carried between feeds (a progress bar without a newline)
+_MAX_CARRY = 4096
+_ANSI = re.compile(r"\x1b\[[0-?]*[ -/]*[@-~]|\x1b\][^\x07\x1b]*(?:\x07|\x1b\\)")
+_NUM = r"(?P<value>[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)"
+
+
+@dataclass
+class MetricPattern:
+    """One metric: `keyword` is a literal that every matching line contains."""
+
+    name: str
+    regex: Pattern[str]
+    keyword: str
+    # Marks the iteration counter (x axis of the other metrics)
+    is_step: bool = False
+
+
+def _pat(name: str, keyword: str, regex: str, is_step: bool = False) -> MetricPattern:
+    return MetricPattern(name, re.compile(regex), keyword, is_step)
+
+
+DEFAULT_PATTERNS: List[MetricPattern] = [
+    # rsl_rl OnPolicyRunner.log()
+    _pat("iteration", "Learning iteration", r"Learning iteration\s+(?P<value>\d+)\s*/\s*\d+", is_step=True),
+    _pat("steps_per_s", "steps/s", r"Computation:\s*" + _NUM + r"\s*steps/s"),
+    _pat("mean_reward", "Mean reward:", r"Mean reward:\s*" + _NUM),
+    _pat("mean_reward", "Mean total reward:", r"Mean total reward:\s*" + _NUM),
+    _pat("episode_length", "Mean episode length:", r"Mean episode length:\s*" + _NUM),
+    _pat("value_loss", "Value function loss:", r"Value function loss:\s*" + _NUM),
+    _pat("surrogate_loss", "Surrogate loss:", r"Surrogate loss:\s*" + _NUM),
+    _pat("action_std", "Mean action noise std:", r"Mean action noise std:\s*" + _NUM),
+    _pat("total_timesteps", "Total timesteps:", r"Total timesteps:\s*" + _NUM),
+    _pat("iteration_time", "Iteration time:", r"Iteration time:\s*" + _NUM),
+    _pat("", "Episode_", r"(?P<name>Episode_(?:Reward|Termination)/[\w./-]+):\s*" + _NUM),
+    _pat("", "Metrics/", r"(?P<name>Metrics/[\w./-]+):\s*" + _NUM),
+    # rl_games: "fps step: ... fps total: 51234 epoch: 12/1000 frames: ..."
+    _pat("iteration", "epoch:", r"epoch:\s*(?P<value>\d+)\s*/\s*\d+", is_step=True),
+    _pat("steps_per_s", "fps total:", r"fps total:\s*" + _NUM),
+]
+
+
+def patterns_from_config(spec: Any) -> List[MetricPattern]:
+    """Extra patterns from config, e.g.
+
+        log_metrics:
+          - {name: success_rate, keyword: "success:", regex: "success:\\\\s*([0-9.]+)"}
+
+    Invalid entries are skipped.
+    """
+    out: List[MetricPattern] = []
+    if not isinstance(spec, list):
+        return out
+    for item in spec:
+        try:
+            regex = re.compile(str(item["regex"]))
+            name = str(item.get("name") or "")
+            keyword = str(item.get("keyword") or "")
+            if not keyword or (not name and "name" not in regex.groupindex) or not regex.groups:
+                continue
+            out.append(MetricPattern(name, regex, keyword, bool(item.get("is_step", False))))
+        except Exception:
+            continue
+    return out
+
+
+class LogMetricParser:
+    """Streaming extractor; `feed()` returns [(name, value, iteration)]."""
+
+    def __init__(self, patterns: Optional[Iterable[MetricPattern]] = None) -> None:
+        self.patterns = list(DEFAULT_PATTERNS if patterns is None else patterns)
+        keywords = sorted({p.keyword for p in self.patterns}, key=len, reverse=True)
+        self._trigger = re.compile("|".join(re.escape(k) for k in keywords)) if keywords else None
+        self._by_keyword: Dict[str, List[MetricPattern]] = {}
+        for p in self.patterns:
+            self._by_keyword.setdefault(p.keyword, []).append(p)
+        self._carry = ""
+        # Latest iteration seen; samples are tagged with it
+        self.iteration: Optional[int] = None
+
+    def feed(self, text: str) -> List[Tuple[str, float, Optional[int]]]:
+        out: List[Tuple[str, float, Optional[int]]] = []
+        if self._trigger is None or not text:
+            return out
+        data = self._carry + text if self._carry else text
+        end = max(data.rfind("\n"), data.rfind("\r"))
+        if end < 0:
+            self._carry = data[-_MAX_CARRY:]
+            return out
+        self._carry = data[end + 1:][-_MAX_CARRY:]
+        done = 0
+        for m in self._trigger.finditer(data, 0, end):
+            if m.start() < done:
+                continue  # another keyword on a line already parsed
+            s = max(data.rfind("\n", 0, m.start()), data.rfind("\r", 0, m.start())) + 1
+            e = data.find("\n", m.end(), end + 1)
+            r = data.find("\r", m.end(), end + 1)
+            e = min(x for x in (e, r, end) if x >= 0)
+            done = e
+            self._parse_line(data[s:e], out)
+        return out
+
+    def _parse_line(self, line: str, out: List[Tuple[str, float, Optional[int]]]) -> None:
+        if "\x1b" in line:
+            line = _ANSI.sub("", line)
+        for keyword, pats in self._by_keyword.items():
+            if keyword not in line:
+                continue
+            for p in pats:
+                for m in p.regex.finditer(line):
+                    gi = p.regex.groupindex
+                    try:
+                        value = float(m.group("value") if "value" in gi else m.group(1))
+                    except (TypeError, ValueError):
+                        continue
+                    name = m.group("name") if "name" in gi else p.name
+                    if p.is_step:
+                        self.iteration = int(value)
+                    out.append((name, value, self.iteration))
+
+
+class _Series:
+    __slots__ = ("t", "step", "v", "stride", "_skip")
+
+    def __init__(self) -> None:
+        self.t = array("d")
+        self.step = array("d")
+        self.v = array("d")
+        self.stride = 1
+        self._skip = 0
+
+    def add(self, t: float, step: float, v: float, max_points: int) -> None:
+        if self._skip:
+            self._skip -= 1
+            return
+        self._skip = self.stride - 1
+        self.t.append(t)
+        self.step.append(step)
+        self.v.append(v)
+        if len(self.v) >= max_points:
+            # Halve the resolution of the whole curve instead of forgetting its start
+            del self.t[1::2]
+            del self.step[1::2]
+            del self.v[1::2]
+            self.stride *= 2
+
+
+class RunMetrics:
+    """Metrics of one run (a Runner launch or a console pane)."""
+
+    def __init__(self, label: str, patterns: Optional[Iterable[MetricPattern]] = None, max_points: int = 20000) -> None:
+        self.label = label
+        self.started = time.time()
+        self.parser = LogMetricParser(patterns)
+        self.max_points = max(16, int(max_points))
+        self._series: Dict[str, _Series] = {}
+        self._latest: Dict[str, float] = {}
+        self.samples = 0
+
+    def feed(self, text: str) -> int:
+        """Parses a chunk of output; returns the number of samples added."""
+        found = self.parser.feed(text)
+        if not found:
+            return 0
+        now = time.time()
+        for name, value, step in found:
+            s = self._series.get(name)
+            if s is None:
+                s = self._series[name] = _Series()
+            # Without an iteration counter, number the samples instead
+            s.add(now, float(step if step is not None else self.samples), value, self.max_points)
+            self._latest[name] = value
+            self.samples += 1
+        return len(found)
+
+    def names(self) -> List[str]:
+        return sorted(self._series)
+
+    def latest(self, name: str) -> Optional[float]:
+        return self._latest.get(name)
+
+    def series(self, name: str, x: str = "step") -> Tuple[array, array]:
+        """(xs, values); x is "step" (iteration) or "time" (seconds since start)."""
+        s = self._series.get(name)
+        if s is None:
+            return array("d"), array("d")
+        if x == "time":
+            return array("d", (t - self.started for t in s.t)), s.v
+        return s.step, s.v
+
+
+class MetricStore:
+    """Runs keyed by label; `version` changes whenever a sample is added."""
+
+    def __init__(self, patterns: Optional[Iterable[MetricPattern]] = None, max_runs: int = 20) -> None:
+        self.patterns = list(DEFAULT_PATTERNS if patterns is None else patterns)
+        self.max_runs = max(1, int(max_runs))
+        self._runs: List[RunMetrics] = []
+        self.version = 0
+
+    def open_run(self, label: str) -> RunMetrics:
+        run = RunMetrics(label, self.patterns)
+        self._runs.append(run)
+        if len(self._runs) > self.max_runs:
+            # Forget the oldest runs; empty ones (a console that never trained) first
+            empty = [r for r in self._runs if not r.samples]
+            self._runs.remove(empty[0] if empty else self._runs[0])
+        return run
+
+    def feed(self, run: RunMetrics, text: str) -> None:
+        if run.feed(text):
+            self.version += 1
+
+    def runs(self) -> List[RunMetrics]:
+        """Runs that produced at least one metric, newest first."""
+        return [r for r in reversed(self._runs) if r.samples]
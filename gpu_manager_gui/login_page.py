@@ -14,6 +14,8 @@ class LoginPage(QWidget):
     # host, port, username, identity, password, interval
     connect_requested = pyqtSignal(str, int, object, object, object, float)
     test_requested = pyqtSignal(str, int, object, object, object, float)
+    # Poll all saved profiles at once
+    fleet_requested = pyqtSignal()
 
     def __init__(self) -> None:
         super().__init__()
@@ -88,13 +90,16 @@ class LoginPage(QWidget):
         vbox.addWidget(self.req_note)
         self.connect_btn = QPushButton("Connect")
         self.test_btn = QPushButton("Test")
+        self.fleet_btn = QPushButton("Fleet")
+        self.fleet_btn.setToolTip("Monitor all saved profiles side by side")
         # Make buttons exactly the same size (height + min width)
         fm_btn = self.fontMetrics()
         btn_w = max(fm_btn.horizontalAdvance(self.test_btn.text()), fm_btn.horizontalAdvance(self.connect_btn.text())) + 32
-        for b in (self.test_btn, self.connect_btn):
+        for b in (self.fleet_btn, self.test_btn, self.connect_btn):
             b.setFixedHeight(36)
             b.setMinimumWidth(btn_w)
         btn_row = QHBoxLayout()
+        btn_row.addWidget(self.fleet_btn)
         btn_row.addStretch(1)
         btn_row.addWidget(self.test_btn)
         btn_row.addWidget(self.connect_btn)
@@ -110,6 +115,7 @@ class LoginPage(QWidget):
         self.profile_combo.currentTextChanged.connect(self._profile_changed)
         self.show_pass_cb.toggled.connect(self._toggle_password_echo)
         self.test_btn.clicked.connect(self._emit_test)
+        self.fleet_btn.clicked.connect(lambda: self.fleet_requested.emit())
 
         # Apply basic styles for a cleaner look
         self._apply_styles()
@@ -5,21 +5,32 @@ import sys
 import threading
 import re
 
-from PyQt6.QtWidgets import QApplication
-from PyQt6.QtGui import QIcon
-
 # Support both `python -m gpu_manager_gui.main` and direct script run
 try:
-    from .main_window import MainWindow
+    from . import startup_profile
 except Exception:
     import os as _os, sys as _sys
     _sys.path.append(_os.path.dirname(_os.path.dirname(_os.path.abspath(__file__))))
-    from gpu_manager_gui.main_window import MainWindow
+    from gpu_manager_gui import startup_profile
+
+with startup_profile.phase("import PyQt6 widgets"):
+    from PyQt6.QtCore import QTimer
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtGui import QIcon
+
+with startup_profile.phase("import main_window"):
+    if __package__:
+        from .main_window import MainWindow
+    else:
+        from gpu_manager_gui.main_window import MainWindow
 
 """Entry point for IsaacLab GPU Manager after refactor.
 
 This module keeps only startup code and global styles. UI classes live in
 login_page.py, monitor_page.py, widgets.py, remote_file_dialog.py, and main_window.py.
+
+`--profile-startup` prints an import/construction time breakdown to stderr
+once the first window is shown (see startup_profile.py).
 """
 
 def main() -> None:
@@ -55,7 +66,9 @@ def main() -> None:
 
     _install_macos_stderr_filter()
 
-    app = QApplication(sys.argv)
+    argv = [a for a in sys.argv if a != startup_profile.FLAG]
+    with startup_profile.phase("QApplication()"):
+        app = QApplication(argv)
     # Global styles: unify all buttons and inputs across pages
     try:
         app.setStyleSheet(
@@ -91,7 +104,8 @@ def main() -> None:
     except Exception:
         pass
 
-    w = MainWindow()
+    with startup_profile.phase("MainWindow()"):
+        w = MainWindow()
     # Also set window icon explicitly (some platforms prefer per-window icon)
     try:
         if os.path.exists(icon_path):
@@ -123,7 +137,11 @@ def main() -> None:
         except Exception:
             # PyObjC not available; Dock icon may remain default when not bundled as .app
             pass
-    w.show()
+    with startup_profile.phase("show()"):
+        w.show()
+    if startup_profile.enabled():
+        # Runs once the event loop has painted the first frame
+        QTimer.singleShot(0, startup_profile.report)
     sys.exit(app.exec())
 
 
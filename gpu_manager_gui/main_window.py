@@ -1,29 +1,47 @@
 from __future__ import annotations
 
+import json
 import os
 import re
 import shlex
 import sys
 import time
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt6.QtWidgets import QApplication, QMainWindow, QMessageBox, QStatusBar, QStackedWidget, QTableWidgetItem
+from PyQt6.QtWidgets import QApplication, QMainWindow, QMessageBox, QStatusBar, QStackedWidget, QTableWidgetItem, QWidget
 
 from .ssh_worker import SSHGpuPoller, Snapshot
-from .ssh_exec import SSHCommandJob, RemoteOSInfoJob, CondaEnvListJob, SSHInteractiveShell, ReverseTunnelParamikoJob
+from .ssh_exec import EngineJob, SSHCommandJob, RemoteOSInfoJob, CondaEnvListJob, SSHInteractiveShell, ReverseTunnelParamikoJob, RemoteScriptJob, RemoteLogTailJob
+from . import remote_jobs
+from .log_follow import LogOffsetStore
+from .ssh_mux import SSHMultiplexer, ssh_base_argv
+from . import async_engine, ssh_pool
 from .terminal_widget import TerminalWidget
 from . import config_store
+from . import startup_profile
 from .login_page import LoginPage
-from .monitor_page import MonitorPage
+from .fleet import FleetPoller, hosts_from_config
+from .fleet_page import FleetPage
+from .log_metrics import DEFAULT_PATTERNS, MetricStore, patterns_from_config
+from .nvidia_parser import aggregate_user_vram
 from .remote_file_dialog import RemoteFileDialog
 
+if TYPE_CHECKING:
+    from .history import HistoryStore
+    from .history_store import MetricsHistoryDB
+    from .jobs_panel import JobsPanel
+    from .monitor_page import MonitorPage
+
+# A "\n" not preceded by "\r" (log files, as opposed to PTY output)
+_LONE_LF = re.compile(r"(?<!\r)\n")
+
 
 class ConnectTester(QThread):
     finished_ok = pyqtSignal()
     failed = pyqtSignal(str)
 
-    def __init__(self, host: str, port: int, username: Optional[str], identity: Optional[str], password: Optional[str], ssh_bin: str = "ssh", timeout: float = 8.0) -> None:
+    def __init__(self, host: str, port: int, username: Optional[str], identity: Optional[str], password: Optional[str], ssh_bin: str = "ssh", timeout: float = 8.0, mux: Optional[SSHMultiplexer] = None) -> None:
         super().__init__()
         self._host = host
         self._port = int(port)
@@ -32,32 +50,19 @@ class ConnectTester(QThread):
         self._password = password
         self._ssh_bin = ssh_bin
         self._timeout = float(timeout)
+        self._mux = mux
 
     def run(self) -> None:  # type: ignore[override]
         if self._password:
             try:
-                import paramiko
+                ssh_pool.import_paramiko()
             except Exception:
                 self.failed.emit("Please pip install paramiko to use password auth")
                 return
             try:
-                client = paramiko.SSHClient()
-                client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                client.connect(
-                    hostname=self._host,
-                    port=self._port,
-                    username=self._username,
-                    password=self._password,
-                    key_filename=self._identity,
-                    timeout=self._timeout,
-                    banner_timeout=max(self._timeout, 10.0),
-                    auth_timeout=max(self._timeout, 10.0),
-                    allow_agent=True,
-                    look_for_keys=True,
-                )
-                _, stdout, _ = client.exec_command("bash -lc 'nvidia-smi -L || nvidia-smi --query-gpu=index --format=csv,noheader,nounits'", timeout=self._timeout)
-                out = stdout.read().decode(errors='ignore').strip()
-                client.close()
+                with ssh_pool.lease(self._host, self._port, self._username, self._password, self._identity, timeout=self._timeout) as conn:
+                    _, out, _ = conn.exec_command("bash -lc 'nvidia-smi -L || nvidia-smi --query-gpu=index --format=csv,noheader,nounits'", timeout=self._timeout)
+                out = out.strip()
                 if out:
                     self.finished_ok.emit()
                 else:
@@ -69,11 +74,8 @@ class ConnectTester(QThread):
                 self.failed.emit(msg)
             return
         # key/agent mode via subprocess ssh
-        cmd = [self._ssh_bin, "-p", str(self._port), "-o", "BatchMode=yes", "-o", "ConnectTimeout=5"]
-        if self._identity:
-            cmd += ["-i", self._identity]
-        dest = f"{self._username}@{self._host}" if self._username else self._host
-        cmd += [dest, "--", "bash", "-lc", "nvidia-smi -L || nvidia-smi --query-gpu=index --format=csv,noheader,nounits"]
+        cmd = ssh_base_argv(self._host, self._port, self._username, self._identity, self._ssh_bin, self._mux)
+        cmd += ["--", "bash", "-lc", "nvidia-smi -L || nvidia-smi --query-gpu=index --format=csv,noheader,nounits"]
         try:
             import subprocess
             p = subprocess.run(cmd, capture_output=True, text=True, timeout=self._timeout)
@@ -99,26 +101,61 @@ class MainWindow(QMainWindow):
         self._config: Dict[str, Any] = config_store.load_config()
         self._test_threads: list[ConnectTester] = []
         self._bg_jobs: list[QThread] = []
+        # Detached jobs: log tail of the job shown in the Jobs tab; byte offsets
+        # per job survive reconnects so following resumes instead of re-reading
+        self._job_tail: Optional[RemoteLogTailJob] = None
+        # (host key, remote path) shown in the log view, and its metrics run
+        self._log_view: Optional[tuple] = None
+        self._log_label = ""
+        self._log_runs: Dict[tuple, Any] = {}
+        self._log_offsets = LogOffsetStore()
+        self._jobs_refreshing = False
         self._host_params: Dict[str, Any] = {}
         self._console_shells: Dict[TerminalWidget, SSHInteractiveShell] = {}
         self._console_auto_opened: bool = False
         self._reverse_tunnel: ReverseTunnelParamikoJob | None = None
+        # OpenSSH ControlMaster shared by all subprocess-mode jobs of the current host
+        self._mux: Optional[SSHMultiplexer] = None
+        # Reference on the pooled paramiko connection held while logged in
+        # (password mode), so short-lived jobs reuse one Transport
+        self._pmk_hold: Optional[ssh_pool.PooledConnection] = None
+        # Fleet mode: concurrent polling of all saved profiles
+        self._fleet: Optional[FleetPoller] = None
+        # Preview recompute is debounced to one pass per frame and memoised on
+        # the runner dict, so keystrokes/itemChanged bursts cost one rebuild
+        self._preview_dirty: set[str] = set()
+        self._preview_cache: Dict[str, list[str]] = {}
+        self._preview_shown: Dict[str, str] = {}
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(16)
+        self._preview_timer.timeout.connect(self._flush_previews)
+        # Per-host GPU history (ring buffers) and its on-disk copy; both pull
+        # in numpy and the DB starts a writer thread, so they are built on
+        # first use (monitor page / fleet), see _ensure_history()
+        self._history: Optional["HistoryStore"] = None
+        self._disk_history: Optional["MetricsHistoryDB"] = None
+        # Learning curves parsed from Runner/Console output (Metrics tab);
+        # extra patterns via the `log_metrics` config list
+        self._metric_store = MetricStore(DEFAULT_PATTERNS + patterns_from_config(self._config.get("log_metrics")))
+        # Host keys whose ring buffers were already seeded from disk
+        self._seeded_hosts: set[str] = set()
         # Ensure graceful shutdown on app exit
         try:
             QApplication.instance().aboutToQuit.connect(self._graceful_shutdown)  # type: ignore[arg-type]
         except Exception:
             pass
 
-        # Pages
+        # Pages. MonitorPage (QtCharts, tables, terminals) is built on first
+        # use; a placeholder holds its stack index (1) until then
         self.stack = QStackedWidget()
         self.login_page = LoginPage()
-        self.monitor_page = MonitorPage()
-        try:
-            self.monitor_page._mw = self
-        except Exception:
-            pass
+        self._monitor_page: Optional["MonitorPage"] = None
+        self._monitor_placeholder: Optional[QWidget] = QWidget()
         self.stack.addWidget(self.login_page)
-        self.stack.addWidget(self.monitor_page.main_tabs)
+        self.stack.addWidget(self._monitor_placeholder)
+        self.fleet_page = FleetPage()
+        self.stack.addWidget(self.fleet_page)
         self.setCentralWidget(self.stack)
 
         # Status bar
@@ -128,77 +165,174 @@ class MainWindow(QMainWindow):
         # Wiring
         self.login_page.connect_requested.connect(self._begin_connect)
         self.login_page.test_requested.connect(self._test_connect)
-        self.monitor_page.disconnect_requested.connect(self._disconnect)
+        self.login_page.fleet_requested.connect(self._open_fleet)
+        self.fleet_page.back_requested.connect(self._close_fleet)
+        self.fleet_page.open_requested.connect(self._open_from_fleet)
+        self.login_page.profile_combo.currentTextChanged.connect(self._load_profile_into_fields)
+        # Poll slowly while the GPU tables are not on screen
         try:
-            self.monitor_page._mw = self
+            self.stack.currentChanged.connect(lambda _=None: self._sync_poll_visibility())
         except Exception:
             pass
+
+        # Load profiles list (presets are loaded when the monitor page is built)
         try:
-            self.monitor_page.docker_refresh_req.connect(lambda: self._detect_remote_docker_containers(True))
-            self.monitor_page.conda_refresh_req.connect(lambda: self._detect_remote_conda_envs(True))
-            self.monitor_page.preview_update_req.connect(self._update_runner_preview)
-            # Also refresh Console preview on any preview update request
-            self.monitor_page.preview_update_req.connect(self._update_console_preview)
+            self._refresh_profiles()
         except Exception:
             pass
-        self.login_page.profile_combo.currentTextChanged.connect(self._load_profile_into_fields)
-        self.monitor_page.conda_combo.currentTextChanged.connect(lambda _=None: self._update_runner_preview())
+
+        # Warm up deferred imports once the login page is on screen
+        self._prewarm_steps = [self._prewarm_monitor_imports, self._prewarm_paramiko]
+        QTimer.singleShot(300, self._prewarm_next)
+
+        # Auto-connect on startup if configured
         try:
-            self.monitor_page.docker_combo.currentTextChanged.connect(lambda _=None: (self._update_runner_preview(), self._autosave_runner()))
-            self.monitor_page.use_docker_cb.toggled.connect(lambda _=None: (self._update_runner_preview(), self._autosave_runner()))
+            cfg = self._config
+            if cfg.get("auto_connect_last_used") and cfg.get("last_used_key"):
+                prof = cfg.get("profiles", {}).get(cfg.get("last_used_key"))
+                if prof:
+                    self._fill_login_fields_from_profile(prof)
+                    self._begin_connect(prof.get("host"), int(prof.get("port", 22)), prof.get("username") or None, prof.get("identity") or None, config_store.get_profile_password(prof), float(prof.get("interval", 5.0)))
         except Exception:
             pass
+
+    # Deferred monitor page -----------------------------------------------
+    @property
+    def monitor_page(self) -> "MonitorPage":
+        if self._monitor_page is None:
+            self._build_monitor_page()
+        return self._monitor_page  # type: ignore[return-value]
+
+    def _build_monitor_page(self) -> None:
+        self._ensure_history()
+        with startup_profile.phase("build MonitorPage"):
+            from .monitor_page import MonitorPage
+            mp = MonitorPage()
+            mp._mw = self
+            self._monitor_page = mp
+            ph, self._monitor_placeholder = self._monitor_placeholder, None
+            self.stack.insertWidget(1, mp.main_tabs)
+            if ph is not None:
+                self.stack.removeWidget(ph)
+                ph.deleteLater()
+            self._wire_monitor_page(mp)
+            try:
+                self._refresh_presets()
+            except Exception:
+                pass
+            try:
+                mp.update_console_preset_visibility()
+            except Exception:
+                pass
+
+    def _ensure_history(self) -> "HistoryStore":
+        """Builds the history stores on first use (off the start-up path)."""
+        if self._history is not None:
+            return self._history
+        with startup_profile.phase("history stores"):
+            from .history import HistoryStore
+            hist_cfg = self._config.get("history") or {}
+            try:
+                self._history = HistoryStore(
+                    float(hist_cfg.get("retention_hours", 24)) * 3600.0,
+                    float(hist_cfg.get("sample_sec", 1.0)),
+                )
+            except Exception:
+                self._history = HistoryStore()
+            # On-disk history (survives restarts); disable with history.persist: false
+            if hist_cfg.get("persist", True):
+                try:
+                    from .history_store import MetricsHistoryDB
+                    self._disk_history = MetricsHistoryDB(
+                        raw_days=int(hist_cfg.get("raw_days", 7)),
+                        rollup_days=int(hist_cfg.get("rollup_days", 400)),
+                        min_step_sec=float(hist_cfg.get("sample_sec", 1.0)),
+                    )
+                except Exception:
+                    self._disk_history = None
+        return self._history
+
+    def _wire_monitor_page(self, mp: "MonitorPage") -> None:
+        mp.disconnect_requested.connect(self._disconnect)
         try:
-            self.monitor_page.console_profile_combo.currentTextChanged.connect(lambda _=None: self._update_console_preview())
+            mp.metrics_panel.set_store(self._metric_store)
         except Exception:
             pass
-        self.monitor_page.script_edit.textChanged.connect(lambda _=None: self._update_runner_preview())
-        self.monitor_page.params_table.itemChanged.connect(lambda _=None: self._update_runner_preview())
-        self.monitor_page.env_table.itemChanged.connect(lambda _=None: self._update_runner_preview())
-        self.monitor_page.conda_refresh.clicked.connect(lambda: self._refresh_runner_envs(True))
         try:
-            self.monitor_page.preset_save.clicked.connect(self._save_preset)
-            self.monitor_page.preset_load.clicked.connect(self._load_preset_into_ui)
-            self.monitor_page.preset_del.clicked.connect(self._delete_preset)
+            jp = mp.jobs_panel
+            jp.refresh_req.connect(self._refresh_jobs)
+            jp.launch_req.connect(self._run_detached)
+            jp.attach_req.connect(self._attach_job)
+            jp.follow_file_req.connect(self._follow_file)
+            jp.console_req.connect(self._open_job_in_console)
+            jp.kill_req.connect(self._kill_job)
+            jp.remove_req.connect(self._remove_job)
         except Exception:
             pass
-        # Auto-load preset when user selects an item from the dropdown
         try:
-            self.monitor_page.preset_combo.currentIndexChanged.connect(
-                lambda _=None: (self.monitor_page.preset_combo.currentText().strip() and self._load_preset_into_ui())
-            )
+            mp.docker_refresh_req.connect(lambda: self._detect_remote_docker_containers(True))
+            mp.conda_refresh_req.connect(lambda: self._detect_remote_conda_envs(True))
+            mp.preview_update_req.connect(self._update_runner_preview)
+            # Also refresh Console preview on any preview update request
+            mp.preview_update_req.connect(self._update_console_preview)
         except Exception:
             pass
-
+        mp.conda_combo.currentTextChanged.connect(lambda _=None: self._update_runner_preview())
         try:
-            self.monitor_page.main_tabs._bar.currentChanged.connect(self._on_main_tab_changed)
+            mp.docker_combo.currentTextChanged.connect(lambda _=None: (self._update_runner_preview(), self._autosave_runner()))
+            mp.use_docker_cb.toggled.connect(lambda _=None: (self._update_runner_preview(), self._autosave_runner()))
         except Exception:
             pass
-
-        # Load profiles list and presets list
         try:
-            self._refresh_profiles()
+            mp.console_profile_combo.currentTextChanged.connect(lambda _=None: self._update_console_preview())
         except Exception:
             pass
+        mp.script_edit.textChanged.connect(lambda _=None: self._update_runner_preview())
+        mp.params_table.itemChanged.connect(lambda _=None: self._update_runner_preview())
+        mp.env_table.itemChanged.connect(lambda _=None: self._update_runner_preview())
+        mp.conda_refresh.clicked.connect(lambda: self._refresh_runner_envs(True))
         try:
-            self._refresh_presets()
+            mp.preset_save.clicked.connect(self._save_preset)
+            mp.preset_load.clicked.connect(self._load_preset_into_ui)
+            mp.preset_del.clicked.connect(self._delete_preset)
         except Exception:
             pass
+        # Auto-load preset when user selects an item from the dropdown
         try:
-            self.monitor_page.update_console_preset_visibility()
+            mp.preset_combo.currentIndexChanged.connect(
+                lambda _=None: (mp.preset_combo.currentText().strip() and self._load_preset_into_ui())
+            )
         except Exception:
             pass
 
-        # Auto-connect on startup if configured
         try:
-            cfg = self._config
-            if cfg.get("auto_connect_last_used") and cfg.get("last_used_key"):
-                prof = cfg.get("profiles", {}).get(cfg.get("last_used_key"))
-                if prof:
-                    self._fill_login_fields_from_profile(prof)
-                    self._begin_connect(prof.get("host"), int(prof.get("port", 22)), prof.get("username") or None, prof.get("identity") or None, config_store.get_profile_password(prof), float(prof.get("interval", 5.0)))
+            mp.main_tabs._bar.currentChanged.connect(self._on_main_tab_changed)
+        except Exception:
+            pass
+        try:
+            mp.main_tabs._bar.currentChanged.connect(lambda _=None: self._sync_poll_visibility())
+        except Exception:
+            pass
+
+    def _prewarm_next(self) -> None:
+        """Runs one pre-warm step per idle tick so the login page stays responsive."""
+        if not self._prewarm_steps:
+            return
+        step = self._prewarm_steps.pop(0)
+        try:
+            step()
         except Exception:
             pass
+        if self._prewarm_steps:
+            QTimer.singleShot(50, self._prewarm_next)
+
+    def _prewarm_monitor_imports(self) -> None:
+        with startup_profile.phase("pre-warm monitor_page/QtCharts"):
+            from . import monitor_page  # noqa: F401
+
+    def _prewarm_paramiko(self) -> None:
+        with startup_profile.phase("pre-warm paramiko"):
+            ssh_pool.import_paramiko()
 
     # Login/profile helpers ----------------------------------------------
     def _refresh_profiles(self) -> None:
@@ -232,8 +366,40 @@ class MainWindow(QMainWindow):
             self._fill_login_fields_from_profile(prof)
 
     # Connect / disconnect -----------------------------------------------
+    def _ensure_mux(self, host: str, port: int, username: Optional[str], identity: Optional[str], password: Optional[str]) -> Optional[SSHMultiplexer]:
+        """Return the ControlMaster for this host, replacing one for another host.
+
+        Password logins go through paramiko and do not use OpenSSH multiplexing.
+        """
+        if password:
+            return None
+        if self._mux is not None and self._mux.matches(host, int(port), username or None, identity or None):
+            return self._mux
+        self._close_mux()
+        try:
+            self._mux = SSHMultiplexer(host, int(port), username or None, identity or None)
+        except Exception:
+            self._mux = None
+        return self._mux
+
+    def _release_pool_hold(self) -> None:
+        conn, self._pmk_hold = self._pmk_hold, None
+        if conn is not None:
+            try:
+                ssh_pool.release(conn)
+            except Exception:
+                pass
+
+    def _close_mux(self) -> None:
+        mux, self._mux = self._mux, None
+        if mux is not None:
+            try:
+                mux.close()
+            except Exception:
+                pass
+
     def _test_connect(self, host: str, port: int, username: Optional[str], identity: Optional[str], password: Optional[str], interval: float) -> None:
-        t = ConnectTester(host, int(port), username, identity, password)
+        t = ConnectTester(host, int(port), username, identity, password, mux=self._ensure_mux(host, port, username, identity, password))
         t.finished_ok.connect(lambda: QMessageBox.information(self, "Test", "Connection OK"))
         t.failed.connect(lambda m: QMessageBox.warning(self, "Test", m or "connect failed"))
         t.setParent(self)
@@ -260,25 +426,46 @@ class MainWindow(QMainWindow):
             pass
         hp = {"host": host, "port": int(port), "username": username or None, "identity": identity or None, "password": password or None, "interval": float(interval)}
         self._host_params = hp
+        mux = self._ensure_mux(host, int(port), username or None, identity or None, password or None)
+        self._release_pool_hold()
+        if password:
+            # Lazy: no network I/O here, the first job connects
+            self._pmk_hold = ssh_pool.acquire(host, int(port), username or None, password, identity or None)
         self._cur_host = host
         try:
             self.status.showMessage(f"Connecting to {host}:{port}…")
         except Exception:
             pass
+        # Optional per-profile streaming (nvidia-smi --loop-ms); 0 = classic polling
+        # and collector ("csv" or "nvml" for the remote pynvml collector)
+        # and whether the poll interval adapts to activity/visibility
+        stream_ms = 0
+        collector = "csv"
+        adaptive = True
+        try:
+            prof = self._config.get("profiles", {}).get(config_store.make_key(host, int(port), username or None)) or {}
+            stream_ms = int(prof.get("stream_ms", 0) or 0)
+            collector = str(prof.get("collector", "csv") or "csv")
+            adaptive = bool(prof.get("adaptive_poll", True))
+        except Exception:
+            stream_ms = 0
         # Start poller (always SSH path; for local use host=127.0.0.1)
         try:
-            p = SSHGpuPoller(host, int(port), username or None, password or None, identity or None, float(interval))
+            p = SSHGpuPoller(host, int(port), username or None, password or None, identity or None, float(interval), mux=mux, stream_ms=stream_ms, collector=collector, adaptive=adaptive)
             p.snapshot_ready.connect(self._on_snapshot)
             p.error_msg.connect(self._on_error)
             p.finished.connect(self._on_poller_finished)
             p.setParent(self)
             self._poller = p
+            self._sync_poll_visibility()
             p.start()
         except Exception as e:
             QMessageBox.critical(self, "Connect", str(e) or "failed to start poller")
             return
-        # Switch to monitor
-        self.stack.setCurrentIndex(1)
+        # Bring back what was recorded before (e.g. overnight) for charts/sparklines
+        self._seed_history(config_store.make_key(host, int(port), username or None))
+        # Switch to monitor (building it on first connect)
+        self.stack.setCurrentWidget(self.monitor_page.main_tabs)
         # Load OS info asynchronously (remote path covers 127.0.0.1 as well)
         self._fetch_remote_os()
         # Load runner config for this host
@@ -389,20 +576,107 @@ class MainWindow(QMainWindow):
         except Exception:
             pass
         self._poller = None
+        self._stop_job_tail()
         self._host_params = {}
+        self._close_mux()
+        self._release_pool_hold()
         try:
             self.stack.setCurrentIndex(0)
             self.status.showMessage("Disconnected")
         except Exception:
             pass
 
+    # Fleet mode ----------------------------------------------------------
+    def _open_fleet(self) -> None:
+        hosts = hosts_from_config(self._config)
+        if not hosts:
+            QMessageBox.information(self, "Fleet", "No saved profiles yet. Connect to a host once to save it.")
+            return
+        self._stop_fleet()
+        self.fleet_page.reset([h.key for h in hosts])
+        f = FleetPoller(hosts)
+        f.host_result.connect(self.fleet_page.update_host)
+        f.host_result.connect(self._record_fleet_result)
+        self._fleet = f
+        f.start()
+        self.stack.setCurrentWidget(self.fleet_page)
+        self.status.showMessage(f"Polling {len(hosts)} hosts…", 3000)
+
+    def _stop_fleet(self) -> None:
+        f, self._fleet = self._fleet, None
+        if f is None:
+            return
+        try:
+            f.stop()
+        except Exception:
+            pass
+
+    def _close_fleet(self) -> None:
+        self._stop_fleet()
+        self.stack.setCurrentIndex(0)
+
+    def _record_fleet_result(self, res) -> None:
+        if res.error or not res.gpus:
+            return
+        totals = aggregate_user_vram(res.apps, res.pid_user_map)
+        self._ensure_history().host(res.key).append(res.t_unix, res.gpus, totals)
+        if self._disk_history is not None:
+            self._disk_history.append(res.key, res.t_unix, res.gpus, totals)
+
+    def _open_from_fleet(self, key: str) -> None:
+        prof = self._config.get("profiles", {}).get(key)
+        if not prof:
+            return
+        self._stop_fleet()
+        self._fill_login_fields_from_profile(prof)
+        self._begin_connect(prof.get("host"), int(prof.get("port", 22)), prof.get("username") or None, prof.get("identity") or None, config_store.get_profile_password(prof), float(prof.get("interval", 5.0)))
+
+    def _seed_history(self, key: str) -> None:
+        """Loads the on-disk history of `key` into its ring buffers (once per
+        host, read on a worker thread; live samples that arrive meanwhile are
+        kept on top)."""
+        store = self._ensure_history()
+        db = self._disk_history
+        if db is None or key in self._seeded_hosts:
+            return
+        self._seeded_hosts.add(key)
+        eng = async_engine.engine()
+
+        def _load():
+            hist = store.new_host()
+            now = time.time()
+            for t, gpus, users in db.replay(key, now - store.retention_sec, now + 1.0):
+                hist.append_values(t, gpus, users)
+            return hist
+
+        async def _run() -> None:
+            try:
+                hist = await eng.run_blocking(_load)
+            except Exception:
+                return
+            if len(hist):
+                eng.post(lambda h: store.seed(key, h), hist)
+
+        eng.submit(_run())
+
     # Snapshot/error handlers --------------------------------------------
+    def _current_host_key(self) -> str:
+        hp = self._host_params or {}
+        return config_store.make_key(hp.get("host") or "", int(hp.get("port") or 22), hp.get("username"))
+
     def _on_snapshot(self, snap: Snapshot) -> None:
+        hist = None
+        if snap.gpus:
+            try:
+                key = self._current_host_key()
+                hist = self._ensure_history().host(key)
+                hist.append_snapshot(snap)
+                if self._disk_history is not None:
+                    self._disk_history.append_snapshot(key, snap)
+            except Exception:
+                pass
         try:
-            if hasattr(self.monitor_page, 'update_snapshot'):
-                self.monitor_page.update_snapshot(snap)
-            else:
-                self._update_snapshot_fallback(snap)
+            self.monitor_page.update_snapshot(snap, hist)
         except Exception as e:
             try:
                 self._log_debug(f"[ui:error] update_snapshot failed: {e}")
@@ -411,7 +685,6 @@ class MainWindow(QMainWindow):
         self.status.showMessage(
             f"Last update: {time.strftime('%H:%M:%S')} | GPUs: {len(snap.gpus)} | users: {len(snap.user_vram_mib)}"
         )
-        self._update_runner_preview()
 
     def _on_error(self, msg: str) -> None:
         if msg:
@@ -448,11 +721,15 @@ class MainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "Console", str(e) or "failed to create shell"); return
         self._console_shells[t] = shell
+        try:
+            run = self._metric_store.open_run(f"Console {time.strftime('%H:%M:%S')}")
+            t.output_tap = lambda text, _run=run: self._metric_store.feed(_run, text)
+        except Exception:
+            pass
         try:
             t.attach_shell(shell)
         except Exception:
             pass
-        shell.data.connect(t.feed)
         shell.error.connect(lambda m, _t=t: _t.local_echo(f"[console:error] {m}"))
         shell.connected.connect(lambda: self.status.showMessage("Console connected", 3000))
         try:
@@ -586,38 +863,11 @@ class MainWindow(QMainWindow):
             pass
 
     # Fallback snapshot update (defensive)
-    def _update_snapshot_fallback(self, snap: Snapshot) -> None:
-        mp = self.monitor_page
-        rows = len(snap.gpus)
-        mp.gpu_table.setRowCount(rows)
-        procs_per_uuid = {}
-        for app in snap.apps:
-            procs_per_uuid[app.gpu_uuid] = procs_per_uuid.get(app.gpu_uuid, 0) + 1
-        for r, g in enumerate(snap.gpus):
-            idx_item = QTableWidgetItem(str(g.index))
-            idx_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            mp.gpu_table.setItem(r, 0, idx_item)
-            name_item = QTableWidgetItem(g.name)
-            mp.gpu_table.setItem(r, 1, name_item)
-            util_item = QTableWidgetItem(f"{g.util_percent}%")
-            util_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            mp.gpu_table.setItem(r, 2, util_item)
-            from PyQt6.QtWidgets import QProgressBar
-            prog = QProgressBar()
-            prog.setRange(0, max(1, g.mem_total_mib))
-            prog.setValue(g.mem_used_mib)
-            prog.setFormat(f"{g.mem_used_mib} / {g.mem_total_mib} MiB")
-            mp.gpu_table.setCellWidget(r, 3, prog)
-            n_procs = procs_per_uuid.get(g.uuid, 0)
-            procs_item = QTableWidgetItem(str(n_procs))
-            procs_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            mp.gpu_table.setItem(r, 4, procs_item)
-
     # Remote OS info ------------------------------------------------------
     def _fetch_remote_os(self) -> None:
         hp = self._host_params
         try:
-            job = RemoteOSInfoJob(hp["host"], int(hp["port"]), hp.get("username"), hp.get("identity"), hp.get("password"))
+            job = RemoteOSInfoJob(hp["host"], int(hp["port"]), hp.get("username"), hp.get("identity"), hp.get("password"), mux=self._mux)
         except Exception:
             return
         def _set(text: str) -> None:
@@ -718,9 +968,46 @@ class MainWindow(QMainWindow):
         return " ".join(parts)
 
     def _update_runner_preview(self) -> None:
+        self._schedule_preview("runner")
+
+    def _update_console_preview(self) -> None:
+        self._schedule_preview("console")
+
+    def _schedule_preview(self, which: str) -> None:
+        self._preview_dirty.add(which)
+        if not self._preview_timer.isActive():
+            self._preview_timer.start()
+
+    def _flush_previews(self) -> None:
+        dirty, self._preview_dirty = self._preview_dirty, set()
+        if "runner" in dirty:
+            self._recompute_runner_preview()
+        if "console" in dirty:
+            self._recompute_console_preview()
+
+    def _preview_commands_cached(self, which: str, r: Dict[str, Any]) -> Optional[list[str]]:
+        """Preview commands for `r`, or None when `which` already shows them."""
         try:
-            r = self._collect_runner()
+            key = json.dumps(r, sort_keys=True, default=str)
+        except Exception:
+            return self._build_preview_commands(r)
+        if self._preview_shown.get(which) == key:
+            return None
+        cmds = self._preview_cache.get(key)
+        if cmds is None:
             cmds = self._build_preview_commands(r)
+            if len(self._preview_cache) >= 64:
+                self._preview_cache.clear()
+            self._preview_cache[key] = cmds
+        self._preview_shown[which] = key
+        return cmds
+
+    def _recompute_runner_preview(self) -> None:
+        try:
+            r = self._collect_runner()
+            cmds = self._preview_commands_cached("runner", r)
+            if cmds is None:
+                return
             if hasattr(self.monitor_page, 'set_preview_commands'):
                 self.monitor_page.set_preview_commands(cmds)
             else:
@@ -745,7 +1032,6 @@ class MainWindow(QMainWindow):
 
         Does not alter Runner panel fields or saved config.
         """
-        import copy as _copy
         base = None
         name = self._console_selected_preset()
         if name:
@@ -755,7 +1041,8 @@ class MainWindow(QMainWindow):
                 base = None
         if not base:
             base = self._collect_runner()
-        r = _copy.deepcopy(base)
+        # Shallow copy is enough: nested lists are replaced, never mutated
+        r = dict(base)
         # Overlay CUDA_VISIBLE_DEVICES based on Console GPU selection
         gsel: list[int] = []
         try:
@@ -778,10 +1065,12 @@ class MainWindow(QMainWindow):
             pass
         return r
 
-    def _update_console_preview(self) -> None:
+    def _recompute_console_preview(self) -> None:
         try:
             r = self._console_runner()
-            cmds = self._build_preview_commands(r)
+            cmds = self._preview_commands_cached("console", r)
+            if cmds is None:
+                return
             try:
                 if hasattr(self.monitor_page, 'set_container_shell_command'):
                     self.monitor_page.set_container_shell_command(self._container_enter_cmd(r))
@@ -874,6 +1163,21 @@ class MainWindow(QMainWindow):
             pass
         return ""
 
+    def _runner_inner(self, r: Dict[str, Any]) -> str:
+        """Remote command for a runner dict (env, conda or docker wrapping)."""
+        env_dict = {k: v for k, v in r.get("env", [])}
+        base = self._build_python_cmd(r)
+        use_docker = bool(r.get("use_docker"))
+        docker_container = (r.get("docker_container") or "").strip()
+        if use_docker and docker_container:
+            return SSHCommandJob.build_inner(env=env_dict, conda_env=None, base_cmd=base, docker_container=docker_container)
+        if use_docker and not docker_container:
+            try:
+                self.status.showMessage("Docker 勾选但未选容器，将在主机上运行", 5000)
+            except Exception:
+                pass
+        return SSHCommandJob.build_inner(env=env_dict, conda_env=(r.get("conda_env") or None), base_cmd=base)
+
     def _run_runner(self) -> None:
         hp = self._host_params
         if not hp:
@@ -883,30 +1187,51 @@ class MainWindow(QMainWindow):
         key = self._host_key()
         if key:
             config_store.save_runner(self._config, key, r["mode"], r)
-        env_dict = {k: v for k, v in r.get("env", [])}
-        base = self._build_python_cmd(r)
-        use_docker = bool(r.get("use_docker"))
-        docker_container = (r.get("docker_container") or "").strip()
-        if use_docker and docker_container:
-            inner = SSHCommandJob.build_inner(env=env_dict, conda_env=None, base_cmd=base, docker_container=docker_container)
-        else:
-            if use_docker and not docker_container:
-                try:
-                    self.status.showMessage("Docker 勾选但未选容器，将在主机上运行", 5000)
-                except Exception:
-                    pass
-            inner = SSHCommandJob.build_inner(env=env_dict, conda_env=(r.get("conda_env") or None), base_cmd=base)
+        inner = self._runner_inner(r)
 
-        job = SSHCommandJob(hp["host"], int(hp["port"]), hp.get("username"), hp.get("identity"), hp.get("password"), inner)
+        # Optional local copy of the full output; the view may skip lines when it falls behind
+        spill = None
+        try:
+            log_dir = str(self._config.get("run_log_dir") or "").strip()
+            if log_dir:
+                spill = os.path.join(os.path.expanduser(log_dir), f"run-{time.strftime('%Y%m%d-%H%M%S')}.log")
+        except Exception:
+            spill = None
+        job = SSHCommandJob(hp["host"], int(hp["port"]), hp.get("username"), hp.get("identity"), hp.get("password"), inner, mux=self._mux, spill_path=spill)
         try:
             self.status.showMessage("Run started…", 3000)
         except Exception:
             pass
+        # A launch is when GPU numbers move; watch closely for a while
+        try:
+            if self._poller is not None:
+                self._poller.boost()
+        except Exception:
+            pass
         try:
             self.monitor_page.run_btn.setEnabled(False)
         except Exception:
             pass
-        job.line.connect(lambda s: (sys.stdout.write(s.rstrip("\n")+"\n"), sys.stdout.flush()))
+        run = None
+        try:
+            label = f"{os.path.basename(str(r.get('script') or 'run'))} {time.strftime('%H:%M:%S')}"
+            run = self._metric_store.open_run(label)
+        except Exception:
+            pass
+        if spill:
+            sys.stdout.write(f"[run] full output: {spill}\n")
+        def _on_chunk(text: str, _job=job, _run=run) -> None:
+            # One write per chunk of whole lines; ack even if a consumer fails
+            try:
+                sys.stdout.write(text)
+                sys.stdout.flush()
+                if _run is not None:
+                    self._metric_store.feed(_run, text)
+            except Exception:
+                pass
+            finally:
+                _job.ack()
+        job.chunk.connect(_on_chunk)
         job.error.connect(lambda m: (sys.stdout.write(("[error] "+(m or "")).rstrip("\n")+"\n"), sys.stdout.flush()))
         def _done(rc: int) -> None:
             try:
@@ -921,6 +1246,173 @@ class MainWindow(QMainWindow):
         job.setParent(self)
         job.start()
 
+    # Detached jobs (Jobs tab) ----------------------------------------------
+    def _jobs_panel(self) -> Optional["JobsPanel"]:
+        return getattr(self.monitor_page, 'jobs_panel', None)
+
+    def _start_remote_script(self, script: str, on_result, timeout: float = 20.0) -> Optional[RemoteScriptJob]:
+        hp = self._host_params
+        if not hp:
+            return None
+        job = RemoteScriptJob(hp["host"], int(hp["port"]), hp.get("username"), hp.get("identity"), hp.get("password"), script, timeout=timeout, mux=self._mux)
+        job.result.connect(on_result)
+        job.error.connect(lambda m: self.status.showMessage(f"Jobs: {m}", 5000))
+        job.setParent(self)
+        self._bg_jobs.append(job)
+        job.finished.connect(lambda: self._bg_jobs.remove(job) if job in self._bg_jobs else None)
+        job.start()
+        return job
+
+    def _run_detached(self) -> None:
+        if not self._host_params:
+            QMessageBox.warning(self, "Not connected", "Please connect first")
+            return
+        # Same command the Console preview runs (preset + GPU selection)
+        r = self._console_runner()
+        name = os.path.basename(str(r.get("script") or "run"))
+        job_id = remote_jobs.new_job_id(name)
+        try:
+            script = remote_jobs.launch_script(job_id, self._build_python_cmd(r), self._runner_inner(r))
+        except Exception as e:
+            QMessageBox.critical(self, "Jobs", str(e)); return
+        def _launched(rc: int, out: str, err: str) -> None:
+            if rc != 0:
+                self.status.showMessage(f"Detached run failed: {(err or out).strip()[:200]}", 8000)
+                return
+            self.status.showMessage(f"Started {job_id} ({out.strip() or '?'})", 5000)
+            self._refresh_jobs()
+            self._attach_job(job_id)
+        self._start_remote_script(script, _launched)
+        try:
+            if self._poller is not None:
+                self._poller.boost()
+        except Exception:
+            pass
+
+    def _refresh_jobs(self) -> None:
+        panel = self._jobs_panel()
+        if panel is None or self._jobs_refreshing:
+            return
+        def _listed(rc: int, out: str, err: str) -> None:
+            if rc != 0 and not out:
+                panel.status.setText((err or "job list failed").strip()[:120])
+                return
+            jobs = remote_jobs.parse_list(out)
+            panel.set_jobs(jobs)
+            # Back after a disconnect: keep following what was on screen
+            if self._job_tail is None and self._log_view and self._log_view[0] == self._host_key():
+                self._follow_log(self._log_view[1], self._log_label)
+        job = self._start_remote_script(remote_jobs.list_script(), _listed)
+        if job is not None:
+            self._jobs_refreshing = True
+            job.finished.connect(lambda: setattr(self, '_jobs_refreshing', False))
+
+    def _attach_job(self, job_id: str) -> None:
+        self._follow_log(remote_jobs.log_path(job_id), f"Job {job_id}")
+
+    def _follow_file(self) -> None:
+        hp = self._host_params
+        if not hp:
+            QMessageBox.warning(self, "Not connected", "Please connect first")
+            return
+        dlg = RemoteFileDialog(hp, self, mux=self._mux)
+        if dlg.exec():
+            path = dlg.selected_path()
+            if path:
+                self._follow_log(path, os.path.basename(path))
+
+    def _follow_log(self, path: str, label: str) -> None:
+        """Streams a remote file into the Jobs tab log view (and Metrics).
+
+        Resumes at the offset saved for host + path, so reconnecting or
+        switching back to a file fetches only what was written meanwhile.
+        """
+        hp = self._host_params
+        panel = self._jobs_panel()
+        if not hp or panel is None:
+            return
+        view_key = (self._host_key(), path)
+        if self._job_tail is not None and self._log_view == view_key and self._job_tail.isRunning():
+            return
+        self._stop_job_tail()
+        view = panel.log_view
+        tail = RemoteLogTailJob(hp["host"], int(hp["port"]), hp.get("username"), hp.get("identity"), hp.get("password"),
+                                path, mux=self._mux, store=self._log_offsets)
+        if self._log_view != view_key:
+            view.clear()
+            self._log_view = view_key
+            self._log_label = label
+            if tail.resumed:
+                view.local_echo(f"[{path}: resuming at byte {tail.offset:,}; earlier output is not fetched again]")
+        run = self._log_runs.get(view_key)
+        if run is None:
+            try:
+                run = self._log_runs[view_key] = self._metric_store.open_run(label)
+            except Exception:
+                run = None
+        def _chunk(text: str, offset: int, _t=tail, _run=run) -> None:
+            try:
+                # Log files use bare LF; the terminal view needs CRLF
+                view.queue_output(_LONE_LF.sub("\r\n", text))
+                if _run is not None:
+                    self._metric_store.feed(_run, text)
+                saved = 1.0 - _t.wire_bytes / _t.data_bytes if _t.data_bytes else 0.0
+                panel.log_label.setText(f"Following {label} · {offset:,} bytes · wire {_t.wire_bytes:,} B ({saved:.0%} saved)")
+            finally:
+                _t.ack()
+        tail.chunk.connect(_chunk)
+        tail.reset.connect(lambda: view.local_echo(f"[{path} was truncated or replaced; following from the start]"))
+        tail.error.connect(lambda m: panel.log_label.setText(f"Following {label} · {m}"))
+        tail.setParent(self)
+        self._job_tail = tail
+        panel.log_label.setText(f"Following {label}…")
+        tail.start()
+
+    def _stop_job_tail(self) -> None:
+        tail, self._job_tail = self._job_tail, None
+        if tail is None:
+            return
+        try:
+            tail.stop()
+        except Exception:
+            pass
+
+    def _open_job_in_console(self, job_id: str) -> None:
+        panel = self._jobs_panel()
+        job = panel.job(job_id) if panel is not None else None
+        if job is None:
+            return
+        self._run_preview_command(remote_jobs.attach_command(job))
+        try:
+            self.monitor_page.main_tabs._bar.setCurrentIndex(2)
+        except Exception:
+            pass
+
+    def _kill_job(self, job_id: str) -> None:
+        if QMessageBox.question(self, "Kill job", f"Terminate {job_id} on the host?") != QMessageBox.StandardButton.Yes:
+            return
+        def _killed(rc: int, out: str, err: str) -> None:
+            self.status.showMessage(f"Killed {job_id}" if rc == 0 else f"Kill failed: {err.strip()[:200]}", 5000)
+            self._refresh_jobs()
+        self._start_remote_script(remote_jobs.kill_script(job_id), _killed, timeout=30.0)
+
+    def _remove_job(self, job_id: str) -> None:
+        if QMessageBox.question(self, "Remove job", f"Delete {job_id} and its log on the host?") != QMessageBox.StandardButton.Yes:
+            return
+        hp = self._host_params
+        if not hp:
+            return
+        path = remote_jobs.log_path(job_id)
+        if self._log_view == (self._host_key(), path):
+            self._stop_job_tail()
+            self._log_view = None
+        self._log_offsets.forget(LogOffsetStore.key(hp["host"], int(hp["port"]), hp.get("username"), path))
+        def _removed(rc: int, out: str, err: str) -> None:
+            if rc != 0:
+                self.status.showMessage(f"Remove failed: {err.strip()[:200]}", 5000)
+            self._refresh_jobs()
+        self._start_remote_script(remote_jobs.remove_script(job_id), _removed)
+
     # Runner helpers ------------------------------------------------------
     def _host_key(self) -> Optional[str]:
         hp = self._host_params
@@ -971,7 +1463,7 @@ class MainWindow(QMainWindow):
                 QApplication.setOverrideCursor(Qt.CursorShape.BusyCursor)
             except Exception:
                 pass
-        job = CondaEnvListJob(hp["host"], int(hp["port"]), hp.get("username"), hp.get("identity"), hp.get("password"))
+        job = CondaEnvListJob(hp["host"], int(hp["port"]), hp.get("username"), hp.get("identity"), hp.get("password"), mux=self._mux)
         job.result.connect(self._on_conda_envs)
         def _on_error(m: str) -> None:
             try:
@@ -1041,6 +1533,7 @@ class MainWindow(QMainWindow):
             self._console_shells.clear()
         except Exception:
             pass
+        self._stop_fleet()
         # Stop poller
         try:
             if self._poller is not None:
@@ -1052,9 +1545,13 @@ class MainWindow(QMainWindow):
                 self._poller = None
         except Exception:
             pass
+        self._stop_job_tail()
         # Stop background jobs
         try:
             for t in list(self._bg_jobs):
+                if isinstance(t, EngineJob):
+                    t.cancel()  # coroutine on the shared engine; nothing to join
+                    continue
                 try:
                     if hasattr(t, 'requestInterruption'):
                         t.requestInterruption()
@@ -1090,6 +1587,54 @@ class MainWindow(QMainWindow):
             self._test_threads.clear()
         except Exception:
             pass
+        # Tear down the shared ControlMaster / pooled transports last (jobs above may still use them)
+        self._close_mux()
+        self._release_pool_hold()
+        async_engine.shutdown()
+        if self._disk_history is not None:
+            self._disk_history.close()
+        try:
+            config_store.flush_config()
+        except Exception:
+            pass
+        try:
+            ssh_pool.POOL.close_all()
+        except Exception:
+            pass
+
+    def _monitor_visible(self) -> bool:
+        try:
+            if self._monitor_page is None or not self.isVisible() or self.isMinimized():
+                return False
+            return self.stack.currentIndex() == 1 and self.monitor_page.main_tabs._bar.currentIndex() == 0
+        except Exception:
+            return True
+
+    def _sync_poll_visibility(self) -> None:
+        try:
+            if self._poller is not None:
+                self._poller.set_visible(self._monitor_visible())
+        except Exception:
+            pass
+
+    def changeEvent(self, ev):  # type: ignore[override]
+        try:
+            super().changeEvent(ev)
+        except Exception:
+            pass
+        try:
+            if ev.type() == ev.Type.WindowStateChange:
+                self._sync_poll_visibility()
+        except Exception:
+            pass
+
+    def showEvent(self, ev):  # type: ignore[override]
+        super().showEvent(ev)
+        self._sync_poll_visibility()
+
+    def hideEvent(self, ev):  # type: ignore[override]
+        super().hideEvent(ev)
+        self._sync_poll_visibility()
 
     # Ensure shutdown on window close
     def closeEvent(self, ev):  # type: ignore[override]
@@ -1129,7 +1674,7 @@ class MainWindow(QMainWindow):
         if not hp:
             return
         from .ssh_exec import DockerContainerListJob
-        job = DockerContainerListJob(hp["host"], int(hp["port"]), hp.get("username"), hp.get("identity"), hp.get("password"))
+        job = DockerContainerListJob(hp["host"], int(hp["port"]), hp.get("username"), hp.get("identity"), hp.get("password"), mux=self._mux)
         def _set(names: list[str]) -> None:
             try:
                 cb = self.monitor_page.docker_combo
@@ -1166,6 +1711,17 @@ class MainWindow(QMainWindow):
 
     # No separate local target; use host 127.0.0.1 if needed
 
+    def _browse_remote_script(self) -> None:
+        hp = self._host_params
+        if not hp:
+            QMessageBox.warning(self, "Not connected", "Please connect first")
+            return
+        dlg = RemoteFileDialog(hp, self, mux=self._mux)
+        if dlg.exec():
+            path = dlg.selected_path()
+            if path:
+                self.monitor_page.script_edit.setText(path)
+
     def _apply_runner_fields(self, r: Dict[str, Any]) -> None:
         try:
             self.monitor_page.conda_combo.setCurrentText(r.get("conda_env", ""))
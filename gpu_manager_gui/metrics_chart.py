@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from typing import Any, List, Optional
+
+from PyQt6.QtCore import Qt, QMargins, QPointF, QTimer
+from PyQt6.QtGui import QPainter
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox
+from PyQt6.QtCharts import QChart, QChartView, QLineSeries, QValueAxis
+
+from .downsample import downsample
+
+# Shown first in the metric list and in the summary line, when present
+_PREFERRED = ["mean_reward", "episode_length", "steps_per_s", "value_loss", "surrogate_loss", "action_std"]
+_SUMMARY = [("mean_reward", "reward", "{:.3g}"), ("episode_length", "ep len", "{:.0f}"), ("steps_per_s", "steps/s", "{:,.0f}")]
+
+
+class MetricsPanel(QWidget):
+    """Learning curves of runs parsed from Runner/Console output.
+
+    Reads a log_metrics.MetricStore; polls its `version` twice a second
+    while visible and redraws only when samples arrived, downsampling the
+    selected curve to `max_points` (min/max + LTTB).
+    """
+
+    def __init__(self, max_points: int = 1500) -> None:
+        super().__init__()
+        self._max_points = max(16, int(max_points))
+        self._store: Any = None
+        self._seen_version = -1
+
+        self.run_combo = QComboBox()
+        self.run_combo.setMinimumContentsLength(18)
+        self.metric_combo = QComboBox()
+        self.metric_combo.setMinimumContentsLength(18)
+        self.x_combo = QComboBox()
+        self.x_combo.addItem("Iteration", "step")
+        self.x_combo.addItem("Elapsed (s)", "time")
+        self.summary = QLabel("No metrics yet — start a run from Runner or Console")
+        bar = QHBoxLayout()
+        bar.addWidget(QLabel("Run"))
+        bar.addWidget(self.run_combo)
+        bar.addWidget(QLabel("Metric"))
+        bar.addWidget(self.metric_combo)
+        bar.addWidget(self.x_combo)
+        bar.addStretch(1)
+        bar.addWidget(self.summary)
+
+        self.chart = QChart()
+        self.chart.setAnimationOptions(QChart.AnimationOption.NoAnimation)
+        self.chart.legend().hide()
+        self.chart.setMargins(QMargins(4, 4, 4, 4))
+        self.x_axis = QValueAxis()
+        self.x_axis.setLabelFormat("%d")
+        self.y_axis = QValueAxis()
+        self.chart.addAxis(self.x_axis, Qt.AlignmentFlag.AlignBottom)
+        self.chart.addAxis(self.y_axis, Qt.AlignmentFlag.AlignLeft)
+        self.series = QLineSeries()
+        self.chart.addSeries(self.series)
+        self.series.attachAxis(self.x_axis)
+        self.series.attachAxis(self.y_axis)
+        self.view = QChartView(self.chart)
+        self.view.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        v = QVBoxLayout(self)
+        v.setContentsMargins(0, 0, 0, 0)
+        v.addLayout(bar)
+        v.addWidget(self.view, 1)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(500)
+        self._timer.timeout.connect(self.refresh)
+        self.run_combo.currentIndexChanged.connect(lambda _=None: self.refresh(force=True))
+        self.metric_combo.currentIndexChanged.connect(lambda _=None: self.refresh(force=True))
+        self.x_combo.currentIndexChanged.connect(lambda _=None: self.refresh(force=True))
+
+    def set_store(self, store: Any) -> None:
+        self._store = store
+        self.refresh(force=True)
+
+    # Data -----------------------------------------------------------------
+    def _current_run(self) -> Optional[Any]:
+        if self._store is None:
+            return None
+        label = self.run_combo.currentData()
+        for run in self._store.runs():
+            if id(run) == label:
+                return run
+        return None
+
+    @staticmethod
+    def _sync_combo(combo: QComboBox, items: List[tuple]) -> None:
+        """Updates (text, data) items in place, keeping the selection."""
+        current = [(combo.itemText(i), combo.itemData(i)) for i in range(combo.count())]
+        if current == items:
+            return
+        keep = combo.currentData()
+        combo.blockSignals(True)
+        combo.clear()
+        for text, data in items:
+            combo.addItem(text, data)
+        idx = combo.findData(keep)
+        combo.setCurrentIndex(idx if idx >= 0 else 0)
+        combo.blockSignals(False)
+
+    def refresh(self, force: bool = False) -> None:
+        store = self._store
+        if store is None or (not self.isVisible() and not force):
+            return
+        if not force and store.version == self._seen_version:
+            return
+        self._seen_version = store.version
+        runs = store.runs()
+        self._sync_combo(self.run_combo, [(r.label, id(r)) for r in runs])
+        run = self._current_run()
+        if run is None:
+            self.series.clear()
+            return
+        names = run.names()
+        ordered = [n for n in _PREFERRED if n in names] + [n for n in names if n not in _PREFERRED and n != "iteration"]
+        self._sync_combo(self.metric_combo, [(n, n) for n in ordered])
+        parts = []
+        if run.parser.iteration is not None:
+            parts.append(f"it {run.parser.iteration}")
+        for key, label, fmt in _SUMMARY:
+            val = run.latest(key)
+            if val is not None:
+                parts.append(f"{label} {fmt.format(val)}")
+        self.summary.setText(" · ".join(parts))
+        name = self.metric_combo.currentData()
+        if not name:
+            self.series.clear()
+            return
+        xs, ys = run.series(name, self.x_combo.currentData() or "step")
+        xs, ys = downsample(xs, ys, self._max_points)
+        self.series.replace([QPointF(x, y) for x, y in zip(xs, ys)])
+        if xs:
+            self.x_axis.setRange(min(xs), max(max(xs), min(xs) + 1))
+            lo, hi = min(ys), max(ys)
+            pad = (hi - lo) * 0.05 or abs(hi) * 0.05 or 1.0
+            self.y_axis.setRange(lo - pad, hi + pad)
+
+    def showEvent(self, e) -> None:  # type: ignore[override]
+        super().showEvent(e)
+        self._timer.start()
+        self.refresh(force=True)
+
+    def hideEvent(self, e) -> None:  # type: ignore[override]
+        super().hideEvent(e)
+        self._timer.stop()
@@ -7,12 +7,36 @@ from PyQt6.QtCore import Qt, pyqtSignal, QEvent
 from PyQt6.QtGui import QPainter
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget, QAbstractItemView, QHeaderView,
-    QProgressBar, QSplitter, QLineEdit, QComboBox, QGridLayout, QFormLayout, QTableWidgetItem, QToolButton, QApplication,
-    QCheckBox, QButtonGroup, QSpinBox,
+    QSplitter, QLineEdit, QComboBox, QGridLayout, QFormLayout, QTableWidgetItem, QToolButton, QApplication,
+    QCheckBox, QButtonGroup, QSpinBox, QTableView,
 )
 from PyQt6.QtCharts import QChart, QChartView, QPieSeries
 
 from .widgets import TopTabs, ConsoleArea
+from .trend_chart import TrendChart
+from .metrics_chart import MetricsPanel
+from .jobs_panel import JobsPanel
+from .table_models import GpuTableModel, ProcTableModel, BarDelegate, pie_slices
+
+
+# Util sparkline: last 10 minutes squeezed into 60 points
+SPARK_SECONDS = 600
+SPARK_POINTS = 60
+
+
+def _gpu_extra_tooltip(g: Any) -> str:
+    """Power/temperature/clock/PCIe lines (NVML collector only); "" if unknown."""
+    lines = []
+    if getattr(g, "power_w", None) is not None:
+        lines.append(f"Power: {g.power_w:.0f} W")
+    if getattr(g, "temperature_c", None) is not None:
+        lines.append(f"Temperature: {g.temperature_c} °C")
+    if getattr(g, "sm_clock_mhz", None) is not None:
+        lines.append(f"SM clock: {g.sm_clock_mhz} MHz")
+    tx, rx = getattr(g, "pcie_tx_kbs", None), getattr(g, "pcie_rx_kbs", None)
+    if tx is not None or rx is not None:
+        lines.append(f"PCIe TX/RX: {(tx or 0) / 1024:.1f} / {(rx or 0) / 1024:.1f} MB/s")
+    return "\n".join(lines)
 
 
 class MonitorPage(QWidget):
@@ -41,8 +65,12 @@ class MonitorPage(QWidget):
 
         center = QWidget()
         hbox = QHBoxLayout(center)
-        self.gpu_table = QTableWidget(0, 5)
-        self.gpu_table.setHorizontalHeaderLabels(["GPU", "Name", "Util %", "Memory", "Procs"])
+        # Model/view tables: polls only mutate the models (see table_models)
+        self.gpu_model = GpuTableModel(self)
+        self.gpu_table = QTableView()
+        self.gpu_table.setModel(self.gpu_model)
+        self.gpu_table.setItemDelegateForColumn(GpuTableModel.COL_UTIL, BarDelegate("percent", parent=self.gpu_table))
+        self.gpu_table.setItemDelegateForColumn(GpuTableModel.COL_MEM, BarDelegate("memory", parent=self.gpu_table))
         self.gpu_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
         self.gpu_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
         self.gpu_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
@@ -51,8 +79,9 @@ class MonitorPage(QWidget):
         self.gpu_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.gpu_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         # Top processes table (PID, User, Mem MiB, GPU, Name)
-        self.proc_table = QTableWidget(0, 5)
-        self.proc_table.setHorizontalHeaderLabels(["PID", "User", "Mem (MiB)", "GPU", "Name"])
+        self.proc_model = ProcTableModel(self)
+        self.proc_table = QTableView()
+        self.proc_table.setModel(self.proc_model)
         self.proc_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
         self.proc_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
         self.proc_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
@@ -66,8 +95,16 @@ class MonitorPage(QWidget):
         left_split.addWidget(self.proc_table)
         left_split.setStretchFactor(0, 3)
         left_split.setStretchFactor(1, 2)
+        # One chart and series for the page's lifetime; slices are updated in place
         self.chart = QChart()
-        self.chart.setTitle("Per-user VRAM (MiB)")
+        self.chart.setTitle("VRAM Total = users + system + free (MiB)")
+        self.chart.legend().setVisible(True)
+        self.chart.legend().setAlignment(Qt.AlignmentFlag.AlignRight)
+        self.chart.setAnimationOptions(QChart.AnimationOption.NoAnimation)
+        self.pie_series = QPieSeries()
+        self.pie_series.setLabelsVisible(True)
+        self.chart.addSeries(self.pie_series)
+        self._pie_slices: dict = {}
         self.chart_view = QChartView(self.chart)
         self.chart_view.setRenderHint(QPainter.RenderHint.Antialiasing)
         hbox.addWidget(left_split, 3)
@@ -214,7 +251,14 @@ class MonitorPage(QWidget):
 
         # Tabs: Monitor vs Runner (top-level main tabs, left-aligned)
         self.main_tabs = TopTabs()
-        monitor_tab = QWidget(); mt_l = QVBoxLayout(monitor_tab); mt_l.addLayout(top); mt_l.addWidget(center, 1)
+        # Trends below the live tables/pie
+        self.trend_chart = TrendChart()
+        mon_split = QSplitter(Qt.Orientation.Vertical)
+        mon_split.addWidget(center)
+        mon_split.addWidget(self.trend_chart)
+        mon_split.setStretchFactor(0, 3)
+        mon_split.setStretchFactor(1, 2)
+        monitor_tab = QWidget(); mt_l = QVBoxLayout(monitor_tab); mt_l.addLayout(top); mt_l.addWidget(mon_split, 1)
         runner_tab = QWidget(); rt_l = QVBoxLayout(runner_tab)
         rt_l.addWidget(runner_box, 1)
         # Console tab (interactive shell)
@@ -326,6 +370,12 @@ class MonitorPage(QWidget):
         self.main_tabs.addTab(monitor_tab, "Monitor")
         self.main_tabs.addTab(runner_tab, "Runner")
         self.main_tabs.addTab(console_tab, "Console")
+        # Learning curves parsed from Runner/Console output (MainWindow feeds the store)
+        self.metrics_panel = MetricsPanel()
+        self.main_tabs.addTab(self.metrics_panel, "Metrics")
+        # Detached runs on the host (tmux/setsid); MainWindow drives it
+        self.jobs_panel = JobsPanel()
+        self.main_tabs.addTab(self.jobs_panel, "Jobs")
 
         layout.addWidget(self.main_tabs)
 
@@ -606,94 +656,71 @@ class MonitorPage(QWidget):
         for idx in sorted({i.row() for i in table.selectedIndexes()}, reverse=True):
             table.removeRow(idx)
 
-    def update_snapshot(self, snap: 'Snapshot') -> None:
+    def update_snapshot(self, snap: 'Snapshot', history: Any = None) -> None:
+        """Refreshes tables and pie; `history` (HostHistory) feeds the util sparklines."""
         rows = len(snap.gpus)
         # Keep GPU selector in Console tab synced with number of GPUs
         try:
             self._ensure_console_gpu_boxes(rows)
         except Exception:
             pass
-        self.gpu_table.setRowCount(rows)
         procs_per_uuid = {}
         for app in snap.apps:
             procs_per_uuid[app.gpu_uuid] = procs_per_uuid.get(app.gpu_uuid, 0) + 1
-        for r, g in enumerate(snap.gpus):
-            idx_item = QTableWidgetItem(str(g.index))
-            idx_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.gpu_table.setItem(r, 0, idx_item)
-            name_item = QTableWidgetItem(g.name)
-            self.gpu_table.setItem(r, 1, name_item)
-            util_item = QTableWidgetItem(f"{g.util_percent}%")
-            util_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.gpu_table.setItem(r, 2, util_item)
-            prog = QProgressBar()
-            prog.setRange(0, max(1, g.mem_total_mib))
-            prog.setValue(g.mem_used_mib)
-            prog.setFormat(f"{g.mem_used_mib} / {g.mem_total_mib} MiB")
-            self.gpu_table.setCellWidget(r, 3, prog)
-            n_procs = procs_per_uuid.get(g.uuid, 0)
-            procs_item = QTableWidgetItem(str(n_procs))
-            procs_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.gpu_table.setItem(r, 4, procs_item)
-
-        # Fill Top Processes table (by VRAM usage), limit to 10
-        try:
-            # Map GPU uuid -> index for display
+        def spark(idx: int) -> tuple:
+            if history is None:
+                return ()
+            try:
+                return tuple(history.recent(("util", idx), SPARK_SECONDS, SPARK_POINTS))
+            except Exception:
+                return ()
+
+        self.gpu_model.set_rows([
+            (g.index, g.name, g.util_percent, g.mem_used_mib, g.mem_total_mib, procs_per_uuid.get(g.uuid, 0), _gpu_extra_tooltip(g), spark(g.index))
+            for g in snap.gpus
+        ])
+
+        # Top Processes table (by VRAM usage), limit to 10
+        try:
             uuid_to_idx = {gi.uuid: gi.index for gi in snap.gpus}
-            # Sort apps by used_memory_mib desc
             top_apps = sorted(list(snap.apps), key=lambda a: getattr(a, 'used_memory_mib', 0), reverse=True)[:10]
-            self.proc_table.setRowCount(len(top_apps))
             pid_user = getattr(snap, 'pid_user_map', {}) or {}
-            for i, app in enumerate(top_apps):
-                # PID
-                pid_it = QTableWidgetItem(str(app.pid))
-                pid_it.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.proc_table.setItem(i, 0, pid_it)
-                # User
-                user = pid_user.get(int(app.pid), 'unknown') if isinstance(pid_user, dict) else 'unknown'
-                self.proc_table.setItem(i, 1, QTableWidgetItem(str(user)))
-                # Mem (MiB)
-                mem_it = QTableWidgetItem(str(int(getattr(app, 'used_memory_mib', 0))))
-                mem_it.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.proc_table.setItem(i, 2, mem_it)
-                # GPU index
-                gidx = uuid_to_idx.get(app.gpu_uuid, '-')
-                gidx_it = QTableWidgetItem(str(gidx))
-                gidx_it.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.proc_table.setItem(i, 3, gidx_it)
-                # Name
-                self.proc_table.setItem(i, 4, QTableWidgetItem(app.process_name))
-        except Exception:
-            pass
-
-        base_total = sum(max(0, g.mem_total_mib) for g in snap.gpus)
-        used_total = sum(max(0, g.mem_used_mib) for g in snap.gpus)
-        user_totals = dict(snap.user_vram_mib)
-        used_by_users = sum(max(0, v) for v in user_totals.values())
-
-        system_other = max(0.0, float(used_total) - float(used_by_users))
-        free_rest = max(0.0, float(base_total) - float(used_total))
-
-        series = QPieSeries()
-        series.setLabelsVisible(True)
-        if user_totals:
-            for user, mib in sorted(user_totals.items(), key=lambda kv: kv[1], reverse=True):
-                val = max(0.01, float(mib))
-                series.append(f"{user} ({int(mib)} MiB)", val)
-        if system_other > 0.5:
-            series.append(f"system/other ({int(system_other)} MiB)", system_other)
-        if base_total <= 0:
-            series.append("idle", 1)
-        elif free_rest > 0.5:
-            series.append(f"free ({int(free_rest)} MiB)", free_rest)
-
-        chart = QChart()
-        chart.addSeries(series)
-        chart.setTitle("VRAM Total = users + system + free (MiB)")
-        chart.legend().setVisible(True)
-        chart.legend().setAlignment(Qt.AlignmentFlag.AlignRight)
-        chart.setAnimationOptions(QChart.AnimationOption.NoAnimation)
-        self.chart_view.setChart(chart)
+            if not isinstance(pid_user, dict):
+                pid_user = {}
+            self.proc_model.set_rows([
+                (
+                    app.pid,
+                    str(pid_user.get(int(app.pid), 'unknown')),
+                    int(getattr(app, 'used_memory_mib', 0)),
+                    uuid_to_idx.get(app.gpu_uuid, '-'),
+                    app.process_name,
+                )
+                for app in top_apps
+            ])
+        except Exception:
+            pass
+
+        self._update_pie(pie_slices(snap.gpus, snap.user_vram_mib))
+        try:
+            self.trend_chart.set_history(history, max((g.mem_total_mib for g in snap.gpus), default=0))
+        except Exception:
+            pass
+
+    def _update_pie(self, slices) -> None:
+        """Mutates the existing pie: relabels/revalues kept slices, adds new, drops stale."""
+        wanted = {key for key, _, _ in slices}
+        for key in list(self._pie_slices):
+            if key not in wanted:
+                self.pie_series.remove(self._pie_slices.pop(key))
+        for key, label, value in slices:
+            sl = self._pie_slices.get(key)
+            if sl is None:
+                self._pie_slices[key] = self.pie_series.append(label, value)
+                continue
+            if sl.label() != label:
+                sl.setLabel(label)
+            if sl.value() != value:
+                sl.setValue(value)
 
     def get_mode(self) -> str:
         return "default"
@@ -6,8 +6,10 @@ the UI layer can be straightforward.
 
 from __future__ import annotations
 
+import json
+import struct
 from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 
 @dataclass
@@ -18,6 +20,12 @@ class GpuInfo:
     util_percent: int  # 0-100
     mem_total_mib: int
     mem_used_mib: int
+    # Only filled by the NVML collector (None when unknown)
+    power_w: Optional[float] = None
+    temperature_c: Optional[int] = None
+    sm_clock_mhz: Optional[int] = None
+    pcie_tx_kbs: Optional[int] = None
+    pcie_rx_kbs: Optional[int] = None
 
 
 @dataclass
@@ -118,6 +126,27 @@ def aggregate_user_vram(apps: List[ComputeApp], pid_to_user: Dict[int, str]) ->
     return totals
 
 
+def apps_from_pmon(
+    pmon_rows: List[Tuple[int, int, str, int]],
+    gpus: List[GpuInfo],
+    pid_to_user: Dict[int, str],
+) -> Tuple[List[ComputeApp], Dict[str, int]]:
+    """Builds ComputeApp entries and per-user totals from `parse_pmon` rows.
+
+    pmon reports GPU indices rather than UUIDs, so indices are mapped back via
+    the GPU list (falling back to the index as a string).
+    """
+    idx_to_uuid = {gi.index: gi.uuid for gi in gpus}
+    apps: List[ComputeApp] = []
+    totals: Dict[str, int] = {}
+    for gpu_idx, pid, proc_name, fb_mib in pmon_rows:
+        uuid = idx_to_uuid.get(gpu_idx, str(gpu_idx))
+        apps.append(ComputeApp(gpu_uuid=uuid, pid=pid, process_name=proc_name, used_memory_mib=fb_mib))
+        user = pid_to_user.get(pid, "unknown")
+        totals[user] = totals.get(user, 0) + max(0, fb_mib)
+    return apps, totals
+
+
 def summarize(gpu_csv: str, apps_csv: str, ps_text: str) -> Tuple[List[GpuInfo], List[ComputeApp], Dict[str, int]]:
     gpus = parse_gpu_csv(gpu_csv)
     apps = parse_compute_apps_csv(apps_csv)
@@ -176,3 +205,181 @@ def parse_pmon(text: str) -> List[Tuple[int, int, str, int]]:
                     fb_mib = 0
         rows.append((gpu_idx, pid, name, max(0, fb_mib)))
     return rows
+
+
+# Fused poll output ------------------------------------------------------------
+FUSED_MARKER = "__GPUMGR__"
+
+
+def split_fused_sections(text: str, marker: str = FUSED_MARKER) -> Dict[str, str]:
+    """Splits the framed output of the fused poll script into sections.
+
+    Each section starts with a line `<marker> <name>`; everything up to the next
+    marker line belongs to that section. Text before the first marker (e.g. a
+    chatty login shell printing a motd) is ignored. Returns name->text; a
+    section that was announced but printed nothing maps to "".
+    """
+    sections: Dict[str, str] = {}
+    current = None
+    buf: List[str] = []
+    prefix = marker + " "
+    for line in text.splitlines():
+        if line.startswith(prefix):
+            if current is not None:
+                sections[current] = "\n".join(buf)
+            current = line[len(prefix):].strip()
+            buf = []
+            continue
+        if current is not None:
+            buf.append(line)
+    if current is not None:
+        sections[current] = "\n".join(buf)
+    return sections
+
+
+class GpuCsvStreamParser:
+    """Incremental parser for `nvidia-smi --query-gpu=... --loop-ms=N` output.
+
+    Feed raw text chunks as they arrive; `feed` returns the list of complete
+    frames (one List[GpuInfo] per sample). Partial lines are kept until the rest
+    arrives. A frame is complete once `expected` rows were seen or, when the GPU
+    count is unknown, when the GPU index wraps around.
+    """
+
+    def __init__(self, expected: int = 0) -> None:
+        self.expected = max(0, int(expected))
+        self._tail = ""
+        self._rows: List[GpuInfo] = []
+
+    def feed(self, text: str) -> List[List[GpuInfo]]:
+        frames: List[List[GpuInfo]] = []
+        if not text:
+            return frames
+        data = self._tail + text
+        lines = data.split("\n")
+        self._tail = lines.pop()  # incomplete last line (or "")
+        for line in lines:
+            parsed = parse_gpu_csv(line)
+            if not parsed:
+                continue
+            g = parsed[0]
+            if self._rows and g.index <= self._rows[-1].index:
+                # Index wrapped: previous sample ended (count unknown or a row was lost)
+                frames.append(self._rows)
+                self._rows = []
+            self._rows.append(g)
+            if self.expected and len(self._rows) >= self.expected:
+                frames.append(self._rows)
+                self._rows = []
+        return frames
+
+
+# NVML collector records -------------------------------------------------------
+class RecordFramer:
+    """Splits the collector's `<MAGIC><u32 big-endian length><JSON>` byte
+    stream into decoded dict records. Feed raw chunks; incomplete records are
+    buffered, and bytes outside records (a login banner) are skipped by
+    scanning for the next MAGIC.
+    """
+
+    MAGIC = b"\x1eGPUMGR\x1f"
+    # A larger length means MAGIC showed up inside garbage; resync past it
+    MAX_RECORD = 16 * 1024 * 1024
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        # Bytes dropped while resyncing (for diagnostics)
+        self.skipped = 0
+
+    def feed(self, data: bytes) -> List[Dict[str, Any]]:
+        records: List[Dict[str, Any]] = []
+        self._buf += data
+        magic = self.MAGIC
+        head = len(magic) + 4
+        while True:
+            at = self._buf.find(magic)
+            if at < 0:
+                # Keep a tail that may be the start of a split MAGIC
+                keep = len(magic) - 1
+                if len(self._buf) > keep:
+                    self.skipped += len(self._buf) - keep
+                    del self._buf[:len(self._buf) - keep]
+                break
+            if at:
+                self.skipped += at
+                del self._buf[:at]
+            if len(self._buf) < head:
+                break
+            (n,) = struct.unpack_from(">I", self._buf, len(magic))
+            if n > self.MAX_RECORD:
+                self.skipped += 1
+                del self._buf[:1]
+                continue
+            if len(self._buf) < head + n:
+                break
+            payload = bytes(self._buf[head:head + n])
+            try:
+                rec = json.loads(payload.decode("utf-8", errors="ignore"))
+            except ValueError:
+                # Not a record after all; look for the next MAGIC
+                self.skipped += 1
+                del self._buf[:1]
+                continue
+            del self._buf[:head + n]
+            if isinstance(rec, dict):
+                records.append(rec)
+        return records
+
+
+def _opt_int(v: Any) -> Optional[int]:
+    try:
+        return None if v is None else int(v)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_collector_record(
+    rec: Dict[str, Any],
+) -> Tuple[List[GpuInfo], List[ComputeApp], Dict[int, str], Dict[str, int]]:
+    """Converts a collector "sample" record into (gpus, apps, pid_user, user_totals)."""
+    gpus: List[GpuInfo] = []
+    for g in rec.get("gpus") or []:
+        try:
+            power = g.get("power_w")
+            gpus.append(
+                GpuInfo(
+                    index=int(g["index"]),
+                    name=str(g.get("name", "")),
+                    uuid=str(g.get("uuid", "")),
+                    util_percent=int(g.get("util") or 0),
+                    mem_total_mib=int(g.get("mem_total") or 0),
+                    mem_used_mib=int(g.get("mem_used") or 0),
+                    power_w=float(power) if power is not None else None,
+                    temperature_c=_opt_int(g.get("temp_c")),
+                    sm_clock_mhz=_opt_int(g.get("sm_clock_mhz")),
+                    pcie_tx_kbs=_opt_int(g.get("pcie_tx_kbs")),
+                    pcie_rx_kbs=_opt_int(g.get("pcie_rx_kbs")),
+                )
+            )
+        except (KeyError, TypeError, ValueError):
+            continue
+    apps: List[ComputeApp] = []
+    for a in rec.get("apps") or []:
+        try:
+            apps.append(
+                ComputeApp(
+                    gpu_uuid=str(a.get("gpu_uuid", "")),
+                    pid=int(a["pid"]),
+                    process_name=str(a.get("name", "")),
+                    used_memory_mib=int(a.get("used_mib") or 0),
+                )
+            )
+        except (KeyError, TypeError, ValueError):
+            continue
+    pid_user: Dict[int, str] = {}
+    for pid, user in (rec.get("users") or {}).items():
+        try:
+            pid_user[int(pid)] = str(user)
+        except (TypeError, ValueError):
+            continue
+    return gpus, apps, pid_user, aggregate_user_vram(apps, pid_user)
@@ -0,0 +1,135 @@
+"""Optional NVML-based remote collector.
+
+Instead of forking nvidia-smi (and paying an NVML init) on every sample, the
+poller can run `COLLECTOR_SCRIPT` on the remote host with `python3 -c`. The
+script keeps one NVML handle open and writes one record per sample to stdout:
+
+    <RECORD_MAGIC><4-byte big-endian length><UTF-8 JSON object>
+
+The magic lets the reader skip whatever a login shell prints first (motd,
+conda banners) and resync after garbage instead of giving up on the stream.
+
+Record types:
+  {"type": "sample", "t": ..., "gpus": [...], "apps": [...], "users": {pid: user}}
+  {"type": "error", "error": "..."}   (e.g. pynvml missing; the script exits
+                                      with EXIT_NO_NVML)
+
+JSON is used rather than msgpack so the remote side needs nothing beyond
+pynvml. See nvidia_parser.RecordFramer / parse_collector_record for decoding.
+"""
+
+from __future__ import annotations
+
+import shlex
+
+from .nvidia_parser import RecordFramer
+
+# Kept Python 3.6 compatible: it runs with whatever python3 the server has.
+COLLECTOR_SCRIPT = r'''
+import json, os, struct, sys, time
+out = getattr(sys.stdout, "buffer", sys.stdout)
+MAGIC = b"\x1eGPUMGR\x1f"  # RECORD_MAGIC
+
+def emit(rec):
+    data = json.dumps(rec, separators=(",", ":")).encode("utf-8")
+    out.write(MAGIC + struct.pack(">I", len(data)) + data)
+    out.flush()
+
+try:
+    import pynvml as N
+    N.nvmlInit()
+except Exception as e:
+    emit({"type": "error", "error": "nvml unavailable: %s" % e})
+    sys.exit(3)  # EXIT_NO_NVML
+
+def s(v):
+    return v.decode("utf-8", "ignore") if isinstance(v, bytes) else str(v)
+
+def opt(fn, *a):
+    try:
+        return fn(*a)
+    except Exception:
+        return None
+
+_users = {}
+def user_of(pid):
+    try:
+        uid = os.stat("/proc/%d" % pid).st_uid
+    except Exception:
+        return None
+    if uid not in _users:
+        try:
+            import pwd
+            _users[uid] = pwd.getpwuid(uid).pw_name
+        except Exception:
+            _users[uid] = str(uid)
+    return _users[uid]
+
+def proc_name(pid):
+    try:
+        with open("/proc/%d/cmdline" % pid, "rb") as f:
+            arg0 = f.read().split(b"\0")[0].decode("utf-8", "ignore")
+        if arg0:
+            return arg0
+    except Exception:
+        pass
+    try:
+        with open("/proc/%d/comm" % pid) as f:
+            return f.read().strip()
+    except Exception:
+        return "?"
+
+MIB = 1024 * 1024
+interval = max(0.05, int(sys.argv[1]) / 1000.0) if len(sys.argv) > 1 else 1.0
+handles = [N.nvmlDeviceGetHandleByIndex(i) for i in range(N.nvmlDeviceGetCount())]
+static = [(s(N.nvmlDeviceGetName(h)), s(N.nvmlDeviceGetUUID(h))) for h in handles]
+try:
+    while True:
+        t0 = time.time()
+        gpus, apps, users = [], [], {}
+        for i, h in enumerate(handles):
+            name, uuid = static[i]
+            util = opt(N.nvmlDeviceGetUtilizationRates, h)
+            mem = opt(N.nvmlDeviceGetMemoryInfo, h)
+            power = opt(N.nvmlDeviceGetPowerUsage, h)
+            gpus.append({
+                "index": i, "name": name, "uuid": uuid,
+                "util": util.gpu if util else 0,
+                "mem_total": int(mem.total // MIB) if mem else 0,
+                "mem_used": int(mem.used // MIB) if mem else 0,
+                "power_w": power / 1000.0 if power is not None else None,
+                "temp_c": opt(N.nvmlDeviceGetTemperature, h, N.NVML_TEMPERATURE_GPU),
+                "sm_clock_mhz": opt(N.nvmlDeviceGetClockInfo, h, N.NVML_CLOCK_SM),
+                "pcie_tx_kbs": opt(N.nvmlDeviceGetPcieThroughput, h, N.NVML_PCIE_UTIL_TX_BYTES),
+                "pcie_rx_kbs": opt(N.nvmlDeviceGetPcieThroughput, h, N.NVML_PCIE_UTIL_RX_BYTES),
+            })
+            for p in opt(N.nvmlDeviceGetComputeRunningProcesses, h) or []:
+                used = getattr(p, "usedGpuMemory", None)
+                apps.append({
+                    "gpu_uuid": uuid, "pid": p.pid, "name": proc_name(p.pid),
+                    "used_mib": int(used // MIB) if used else 0,
+                })
+                u = user_of(p.pid)
+                if u:
+                    users[str(p.pid)] = u
+        emit({"type": "sample", "t": t0, "gpus": gpus, "apps": apps, "users": users})
+        time.sleep(max(0.0, interval - (time.time() - t0)))
+except (BrokenPipeError, KeyboardInterrupt):
+    pass
+finally:
+    try:
+        N.nvmlShutdown()
+    except Exception:
+        pass
+'''
+
+# Record prefix written by the script (same bytes as MAGIC inside it)
+RECORD_MAGIC = RecordFramer.MAGIC
+
+# Exit status of the script when NVML cannot be used
+EXIT_NO_NVML = 3
+
+
+def remote_command(interval_ms: int, python: str = "python3") -> str:
+    """Shell command that runs the collector with the given sample period."""
+    return f"exec {python} -u -c {shlex.quote(COLLECTOR_SCRIPT)} {max(50, int(interval_ms))}"
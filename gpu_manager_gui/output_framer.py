@@ -0,0 +1,191 @@
+"""Line framing with bounded, acknowledged delivery (no Qt).
+
+`LineFramer` sits between a thread that reads command output and a consumer
+on the GUI thread:
+
+- `push(text)` (reader thread) appends output; only complete lines are
+  delivered, the unfinished last line waits for its newline (or is flushed
+  once idle, or when it grows past a chunk). Output up to the last "\r"
+  counts as complete, so carriage-return progress bars keep updating.
+- `deliver()` (the job thread) hands out chunks of whole lines through the
+  `emit` callback: at most `max_chars` per chunk, at most one chunk per
+  `frame_sec` unless a full chunk is waiting, and at most `max_inflight`
+  chunks the consumer has not `ack()`ed yet. The GUI therefore never gets
+  more than a bounded amount of work per frame, however fast the remote
+  side writes.
+- When the consumer falls behind and `max_pending` characters are queued,
+  `push()` blocks, which stalls the reader and so the remote command (SSH
+  window / pipe back-pressure). With a `spill_path`, all output is also
+  appended to that file and `push()` never blocks: the oldest queued lines
+  are dropped from the display instead, leaving a marker that points to
+  the file.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Optional
+
+# A consumer that stops acknowledging (slot raised, window closing) must not
+# wedge the job; an ack this late is assumed lost
+_ACK_TIMEOUT_SEC = 5.0
+# An unterminated line ("Password:", a progress bar) is shown once idle this long
+_PARTIAL_IDLE_SEC = 0.25
+
+
+class LineFramer:
+    def __init__(
+        self,
+        emit: Callable[[str], None],
+        max_chars: int = 64 * 1024,
+        max_inflight: int = 2,
+        frame_sec: float = 1.0 / 60.0,
+        max_pending: int = 4 * 1024 * 1024,
+        spill_path: Optional[str] = None,
+    ) -> None:
+        self._emit = emit
+        self.max_chars = max(1024, int(max_chars))
+        self.max_inflight = max(1, int(max_inflight))
+        self.frame_sec = max(0.0, float(frame_sec))
+        self.max_pending = max(self.max_chars, int(max_pending))
+        self._cv = threading.Condition()
+        self._lines: Deque[str] = deque()  # complete lines, ending in "\n" or "\r"
+        self._chars = 0
+        self._partial = ""
+        self._partial_at = 0.0
+        self._inflight = 0
+        self._last_emit = 0.0
+        self._closed = False
+        self._dropped = 0
+        self.spill_path = spill_path
+        self._spill = None
+        if spill_path:
+            try:
+                os.makedirs(os.path.dirname(spill_path) or ".", exist_ok=True)
+                self._spill = open(spill_path, "a", encoding="utf-8", errors="replace", newline="")
+            except Exception:
+                self._spill = None
+                self.spill_path = None
+
+    # Reader side -----------------------------------------------------------
+    def push(self, text: str) -> None:
+        if not text:
+            return
+        if self._spill is not None:
+            try:
+                self._spill.write(text)
+            except Exception:
+                pass
+        with self._cv:
+            data = self._partial + text
+            cut = data.rfind("\n") + 1
+            if cut:
+                for line in data[:cut].splitlines(keepends=True):
+                    self._lines.append(line)
+                    self._chars += len(line)
+                data = data[cut:]
+            # A "\r" redraw (tqdm-style progress) is a boundary too, or a live
+            # bar would never go idle and be held until max_chars. A trailing
+            # "\r" may be half of "\r\n", so it waits for the next push.
+            cut = data.rfind("\r", 0, len(data) - 1) + 1
+            if cut:
+                self._lines.append(data[:cut])
+                self._chars += cut
+                data = data[cut:]
+            if len(data) >= self.max_chars:
+                # A "line" this long (CR-only progress output) goes as it is
+                self._lines.append(data)
+                self._chars += len(data)
+                data = ""
+            if data and data != self._partial:
+                self._partial_at = time.monotonic()
+            self._partial = data
+            self._cv.notify_all()
+            while self._chars > self.max_pending and not self._closed:
+                if self._spill is not None:
+                    self._drop_oldest()
+                    break
+                # No spill file: hold the reader until the consumer catches up
+                self._cv.wait(0.5)
+
+    def _drop_oldest(self) -> None:
+        while self._chars > self.max_pending // 2 and self._lines:
+            self._chars -= len(self._lines.popleft())
+            self._dropped += 1
+
+    def close(self) -> None:
+        """Reader finished: the partial line becomes the last line."""
+        with self._cv:
+            if self._partial:
+                self._lines.append(self._partial)
+                self._chars += len(self._partial)
+                self._partial = ""
+            self._closed = True
+            self._cv.notify_all()
+        if self._spill is not None:
+            try:
+                self._spill.close()
+            except Exception:
+                pass
+            self._spill = None
+
+    # Consumer side ---------------------------------------------------------
+    def ack(self) -> None:
+        """Called by the consumer once it has handled a chunk."""
+        with self._cv:
+            if self._inflight:
+                self._inflight -= 1
+            self._cv.notify_all()
+
+    def _take_chunk(self) -> str:
+        parts = []
+        n = 0
+        if self._dropped:
+            where = f"; full output in {self.spill_path}" if self.spill_path else ""
+            parts.append(f"[… {self._dropped} lines not shown{where}]\n")
+            self._dropped = 0
+        while self._lines and (not parts or n + len(self._lines[0]) <= self.max_chars):
+            line = self._lines.popleft()
+            parts.append(line)
+            n += len(line)
+        self._chars -= n
+        return "".join(parts)
+
+    def deliver(self) -> None:
+        """Runs the delivery loop until closed and drained (job thread)."""
+        last_ack_wait = None
+        with self._cv:
+            while True:
+                now = time.monotonic()
+                if self._partial and now - self._partial_at >= _PARTIAL_IDLE_SEC:
+                    self._lines.append(self._partial)
+                    self._chars += len(self._partial)
+                    self._partial = ""
+                if not self._lines and not self._dropped:
+                    if self._closed:
+                        return
+                    self._cv.wait(_PARTIAL_IDLE_SEC if self._partial else None)
+                    continue
+                if self._inflight >= self.max_inflight:
+                    last_ack_wait = last_ack_wait or now
+                    if now - last_ack_wait < _ACK_TIMEOUT_SEC:
+                        self._cv.wait(_ACK_TIMEOUT_SEC - (now - last_ack_wait))
+                        continue
+                    self._inflight = 0  # consumer went away
+                last_ack_wait = None
+                due = self._last_emit + self.frame_sec
+                if now < due and self._chars < self.max_chars and not self._closed:
+                    self._cv.wait(due - now)
+                    continue
+                chunk = self._take_chunk()
+                self._inflight += 1
+                self._last_emit = now
+                self._cv.notify_all()  # a blocked push() may continue
+                self._cv.release()
+                try:
+                    self._emit(chunk)
+                finally:
+                    self._cv.acquire()
@@ -8,14 +8,16 @@ from PyQt6.QtWidgets import (
 )
 
 from .ssh_exec import RemoteListDirJob
+from .ssh_mux import SSHMultiplexer
 
 
 class RemoteFileDialog(QDialog):
-    def __init__(self, host_params: Dict[str, Any], parent=None) -> None:
+    def __init__(self, host_params: Dict[str, Any], parent=None, mux: Optional[SSHMultiplexer] = None) -> None:
         super().__init__(parent)
         self.setWindowTitle("Browse Remote Files")
         self.resize(700, 520)
         self._hp = host_params
+        self._mux = mux
         self._cwd = ""
         self._selected: Optional[str] = None
 
@@ -80,7 +82,7 @@ class RemoteFileDialog(QDialog):
 
     def _list_dir(self, path: str) -> None:
         try:
-            job = RemoteListDirJob(self._hp["host"], int(self._hp["port"]), self._hp.get("username"), self._hp.get("identity"), self._hp.get("password"), path)
+            job = RemoteListDirJob(self._hp["host"], int(self._hp["port"]), self._hp.get("username"), self._hp.get("identity"), self._hp.get("password"), path, mux=self._mux)
         except Exception:
             return
         def _res(cwd: str, entries: list) -> None:
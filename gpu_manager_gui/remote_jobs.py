@@ -0,0 +1,207 @@
+"""Detached remote runs (no Qt).
+
+A detached run lives in its own directory on the remote host,
+`~/.isaaclab_gpu_manager/jobs/<id>/`:
+
+    cmd.sh    the composed command (same as a Runner launch)
+    run.sh    wrapper: records pid, runs cmd.sh with output appended to
+              `log`, writes the exit code to `rc`
+    name, mode, started, pid, rc, killed, log
+
+The wrapper runs inside a tmux session `gm-<id>` when tmux is installed
+(output is tee'd, so `tmux attach` shows it live), otherwise under
+`setsid nohup`. Either way the run no longer depends on the SSH channel
+that started it: the GUI can disconnect, sleep or crash, and the job list
+is rebuilt from the directories. Following output is a tail of `log` by
+byte offset (ssh_exec.RemoteLogTailJob).
+
+Killing a docker-mode run stops the `docker exec` client; processes inside
+the container only see that as a closed stdin.
+
+The functions here only build bash scripts and parse their output; run
+them with ssh_exec.RemoteScriptJob (a coroutine on the shared async engine).
+"""
+
+from __future__ import annotations
+
+import re
+import shlex
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+# Relative to the remote home (ssh sessions start there)
+JOBS_DIR = ".isaaclab_gpu_manager/jobs"
+SESSION_PREFIX = "gm-"
+_HEREDOC = "__GM_JOB_EOF__"
+_ID_OK = re.compile(r"^[A-Za-z0-9._-]{1,80}$")
+
+_RUN_SH = r"""D="$(cd "$(dirname "$0")" && pwd)"
+echo $$ > "$D/pid"
+export PYTHONUNBUFFERED=1
+if [ -n "$GM_TEE" ]; then
+  bash -l "$D/cmd.sh" 2>&1 | tee -a "$D/log"; rc=${PIPESTATUS[0]}
+else
+  bash -l "$D/cmd.sh" >> "$D/log" 2>&1 < /dev/null; rc=$?
+fi
+echo "$rc" > "$D/rc"
+"""
+
+# Prints the size of file $1 (GNU stat, BSD stat, wc fallback)
+_SIZE_FN = 'sz() { stat -c %s "$1" 2>/dev/null || stat -f %z "$1" 2>/dev/null || wc -c < "$1"; }; '
+
+
+@dataclass
+class RemoteJob:
+    id: str
+    name: str
+    mode: str  # "tmux" | "setsid" | "nohup"
+    started: float
+    pid: Optional[int]
+    running: bool
+    rc: Optional[str]  # exit code, "killed", or None while running
+    log_size: int
+
+    @property
+    def session(self) -> str:
+        return SESSION_PREFIX + self.id
+
+    @property
+    def log_path(self) -> str:
+        return log_path(self.id)
+
+    @property
+    def state(self) -> str:
+        if self.running:
+            return "running"
+        if self.rc is None:
+            # No pid yet (just launched) or the host rebooted under it
+            return "starting" if self.pid is None and time.time() - self.started < 30 else "lost"
+        if self.rc == "killed":
+            return "killed"
+        return "done" if self.rc == "0" else f"failed ({self.rc})"
+
+
+def new_job_id(name: str) -> str:
+    """Sortable id: timestamp plus a filesystem/tmux-safe slug of `name`."""
+    slug = re.sub(r"[^A-Za-z0-9_-]+", "-", name or "run").strip("-")[:40] or "run"
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{slug}"
+
+
+def _check_id(job_id: str) -> str:
+    if not _ID_OK.match(job_id or ""):
+        raise ValueError(f"invalid job id: {job_id!r}")
+    return job_id
+
+
+def job_dir(job_id: str) -> str:
+    return f"{JOBS_DIR}/{_check_id(job_id)}"
+
+
+def log_path(job_id: str) -> str:
+    return f"{job_dir(job_id)}/log"
+
+
+def _home(rel: str) -> str:
+    """Shell word for `rel` under the remote $HOME."""
+    return f"\"$HOME\"/{shlex.quote(rel)}"
+
+
+def launch_script(job_id: str, name: str, inner_command: str, use_tmux: bool = True) -> str:
+    """Creates the job directory and starts it detached; prints `mode`."""
+    d = job_dir(job_id)
+    if _HEREDOC in inner_command:
+        raise ValueError("command contains the job script delimiter")
+    return (
+        f"D={_home(d)}; mkdir -p \"$D\" || exit 1; "
+        f"printf '%s\\n' {shlex.quote(name.replace(chr(10), ' '))} > \"$D/name\"; "
+        "date +%s > \"$D/started\"; : > \"$D/log\"\n"
+        f"cat > \"$D/cmd.sh\" <<'{_HEREDOC}'\n{inner_command}\n{_HEREDOC}\n"
+        f"cat > \"$D/run.sh\" <<'{_HEREDOC}'\n{_RUN_SH}{_HEREDOC}\n"
+        f"S={shlex.quote(SESSION_PREFIX + job_id)}; "
+        + ("if command -v tmux >/dev/null 2>&1; then " if use_tmux else "if false; then ")
+        + "tmux new-session -d -s \"$S\" \"GM_TEE=1 bash $(printf %q \"$D/run.sh\")\" || exit 1; mode=tmux; "
+        "elif command -v setsid >/dev/null 2>&1; then "
+        "setsid nohup bash \"$D/run.sh\" > /dev/null 2>&1 < /dev/null & mode=setsid; "
+        "else nohup bash \"$D/run.sh\" > /dev/null 2>&1 < /dev/null & mode=nohup; fi; "
+        "echo \"$mode\" > \"$D/mode\"; echo \"$mode\""
+    )
+
+
+def list_script() -> str:
+    """One `JOB\\t...` line per job directory (see parse_list)."""
+    return (
+        _SIZE_FN
+        + f"R={_home(JOBS_DIR)}; [ -d \"$R\" ] || exit 0; "
+        "for D in \"$R\"/*/; do D=${D%/}; [ -f \"$D/run.sh\" ] || continue; "
+        "id=${D##*/}; name=$(head -n 1 \"$D/name\" 2>/dev/null | tr -d '\\t'); "
+        "mode=$(cat \"$D/mode\" 2>/dev/null); started=$(cat \"$D/started\" 2>/dev/null); "
+        "pid=$(cat \"$D/pid\" 2>/dev/null); rc=$(cat \"$D/rc\" 2>/dev/null); "
+        "alive=0; if [ -z \"$rc\" ] && [ -n \"$pid\" ] && kill -0 \"$pid\" 2>/dev/null; then alive=1; fi; "
+        "if [ -z \"$rc\" ] && [ -f \"$D/killed\" ]; then rc=killed; fi; "
+        "size=$(sz \"$D/log\" 2>/dev/null || echo 0); "
+        "printf 'JOB\\t%s\\t%s\\t%s\\t%s\\t%s\\t%s\\t%s\\t%s\\n' "
+        "\"$id\" \"$name\" \"$mode\" \"$started\" \"$pid\" \"$alive\" \"$rc\" \"$size\"; done"
+    )
+
+
+def parse_list(out: str) -> List[RemoteJob]:
+    """Jobs from list_script() output, newest first."""
+    jobs: List[RemoteJob] = []
+    for ln in (out or "").splitlines():
+        parts = ln.rstrip("\r").split("\t")
+        if len(parts) != 9 or parts[0] != "JOB":
+            continue
+        _, jid, name, mode, started, pid, alive, rc, size = parts
+        try:
+            jobs.append(RemoteJob(
+                id=jid,
+                name=name or jid,
+                mode=mode or "?",
+                started=float(started or 0),
+                pid=int(pid) if pid.strip().isdigit() else None,
+                running=alive == "1",
+                rc=rc.strip() or None,
+                log_size=int(size.strip() or 0),
+            ))
+        except ValueError:
+            continue
+    jobs.sort(key=lambda j: j.id, reverse=True)
+    return jobs
+
+
+def kill_script(job_id: str) -> str:
+    """Terminates the run's process group (then KILL after 5 s) and its tmux session."""
+    d = job_dir(job_id)
+    return (
+        f"D={_home(d)}; S={shlex.quote(SESSION_PREFIX + job_id)}; "
+        "[ -d \"$D\" ] || { echo 'no such job' >&2; exit 2; }; "
+        "[ -f \"$D/rc\" ] || touch \"$D/killed\"; "
+        "pid=$(cat \"$D/pid\" 2>/dev/null); "
+        "if [ -n \"$pid\" ] && kill -0 \"$pid\" 2>/dev/null; then "
+        "pg=$(ps -o pgid= -p \"$pid\" 2>/dev/null | tr -d ' '); "
+        "if [ -n \"$pg\" ] && [ \"$pg\" != \"$(ps -o pgid= -p $$ | tr -d ' ')\" ]; then kill -TERM -- -\"$pg\" 2>/dev/null; "
+        "else pkill -TERM -P \"$pid\" 2>/dev/null; kill -TERM \"$pid\" 2>/dev/null; fi; "
+        "for _ in 1 2 3 4 5 6 7 8 9 10; do kill -0 \"$pid\" 2>/dev/null || break; sleep 0.5; done; "
+        "if kill -0 \"$pid\" 2>/dev/null; then [ -n \"$pg\" ] && kill -KILL -- -\"$pg\" 2>/dev/null; kill -KILL \"$pid\" 2>/dev/null; fi; "
+        "fi; "
+        "command -v tmux >/dev/null 2>&1 && tmux kill-session -t \"$S\" 2>/dev/null; true"
+    )
+
+
+def remove_script(job_id: str) -> str:
+    """Deletes a finished job's directory (refuses while it runs)."""
+    d = job_dir(job_id)
+    return (
+        f"D={_home(d)}; [ -d \"$D\" ] || exit 0; "
+        "pid=$(cat \"$D/pid\" 2>/dev/null); "
+        "if [ ! -f \"$D/rc\" ] && [ -n \"$pid\" ] && kill -0 \"$pid\" 2>/dev/null; then echo 'job is still running' >&2; exit 3; fi; "
+        "rm -rf -- \"$D\""
+    )
+
+
+def attach_command(job: RemoteJob) -> str:
+    """Shell command that shows the run live in a console."""
+    if job.mode == "tmux" and job.running:
+        return f"tmux attach -t {shlex.quote(job.session)}"
+    return f"tail -n 200 -F {shlex.quote(job.log_path)}"
@@ -0,0 +1,269 @@
+"""Scrollback store for the terminal view (no Qt).
+
+History lines never change once they scroll off the screen, so they are kept
+compact: the cells as one str (a tuple only when the line holds wide or
+combining characters), the attributes as a single int when the whole line
+shares one, otherwise an `array('I')`, and trailing default blanks dropped.
+That is roughly 100-200 bytes per log line instead of a list + array per
+cell row.
+
+Lines live in fixed-size chunks. Past `max_lines` the oldest lines are
+skipped and a chunk is freed once all its lines are gone, so append and
+eviction are O(1). Line ids (`first_id + index`) stay stable while lines are
+evicted, which is what search results refer to.
+
+Search runs `str.find` over a per-chunk lower-cased text blob with line
+offsets. The blob is built the first time a chunk is searched and kept
+(history is immutable); only the open tail chunk is rebuilt when it grew.
+"""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+
+CHUNK_LINES = 4096
+# Stop collecting matches past this (the find bar shows "N+")
+MAX_MATCHES = 50000
+
+Cells = Union[str, Tuple[str, ...]]
+
+
+class HistoryLine:
+    """Read-only view of a stored line; same fields as vt_screen.Line."""
+
+    __slots__ = ("chars", "attrs", "wrapped")
+
+    def __init__(self, chars: List[str], attrs: array, wrapped: bool) -> None:
+        self.chars = chars
+        self.attrs = attrs
+        self.wrapped = wrapped
+
+    def text(self) -> str:
+        return "".join(self.chars).rstrip()
+
+
+class _Chunk:
+    __slots__ = ("cells", "attrs", "wrapped", "blob", "starts")
+
+    def __init__(self) -> None:
+        self.cells: List[Cells] = []
+        self.attrs: List[Union[int, array]] = []
+        self.wrapped = bytearray()
+        self.blob: Optional[str] = None
+        self.starts: Optional[List[int]] = None
+
+    def index(self) -> Tuple[str, List[int]]:
+        """Lower-cased text of all lines joined by "\\n" plus line offsets."""
+        if self.starts is None or len(self.starts) != len(self.cells):
+            texts = [(c if isinstance(c, str) else "".join(c)).lower() for c in self.cells]
+            self.blob = "\n".join(texts)
+            self.starts = [0]
+            self.starts.extend(accumulate(len(t) + 1 for t in texts[:-1]))
+        return self.blob, self.starts  # type: ignore[return-value]
+
+
+class Scrollback:
+    """Bounded line history; deque-like (`append`, `len`, `[i]`, `clear`)."""
+
+    def __init__(self, max_lines: int = 100000, default_attr: int = 0) -> None:
+        self.maxlen = max(0, int(max_lines))
+        self._default = default_attr
+        self._chunks: List[_Chunk] = []
+        # Lines of _chunks[0] already evicted
+        self._skip = 0
+        self._len = 0
+        # Ids of evicted lines run below this
+        self.first_id = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __bool__(self) -> bool:
+        return self._len > 0
+
+    def clear(self) -> None:
+        self.first_id += self._len
+        self._chunks = []
+        self._skip = 0
+        self._len = 0
+
+    # Storage -----------------------------------------------------------------
+    def _tail(self) -> _Chunk:
+        if not self._chunks or len(self._chunks[-1].cells) >= CHUNK_LINES:
+            self._chunks.append(_Chunk())
+        return self._chunks[-1]
+
+    def _evict(self) -> None:
+        over = self._len - self.maxlen
+        while over > 0:
+            head = self._chunks[0]
+            take = min(over, len(head.cells) - self._skip)
+            self._skip += take
+            self._len -= take
+            self.first_id += take
+            over -= take
+            if self._skip >= len(head.cells):
+                self._chunks.pop(0)
+                self._skip = 0
+
+    def append(self, line) -> None:
+        """Stores a vt_screen.Line (or anything with chars/attrs/wrapped)."""
+        if not self.maxlen:
+            return
+        chars, attrs = line.chars, line.attrs
+        text = "".join(chars)
+        n = len(chars)
+        default = self._default
+        if len(text) == n:
+            # One code point per cell: the str is the cell row
+            stripped = text.rstrip(" ")
+            k = len(stripped)
+            if k < n and attrs[k:].count(default) == n - k:
+                n = k
+                text = stripped
+            cells: Cells = text[:n]
+        else:
+            while n and chars[n - 1] == " " and attrs[n - 1] == default:
+                n -= 1
+            cells = tuple(chars[:n])
+        a = attrs[:n]
+        packed: Union[int, array] = a[0] if n and a.count(a[0]) == n else (default if not n else a)
+        tail = self._tail()
+        tail.cells.append(cells)
+        tail.attrs.append(packed)
+        tail.wrapped.append(1 if line.wrapped else 0)
+        self._len += 1
+        if self._len > self.maxlen:
+            self._evict()
+
+    def extend_text(self, lines: List[str], cols: int) -> int:
+        """Appends plain lines (default colours), soft-wrapping at `cols`.
+
+        Used for output that scrolled past faster than it could be shown;
+        returns the number of rows pushed (some may already be evicted).
+        """
+        if not self.maxlen or not lines:
+            return 0
+        cols = max(1, int(cols))
+        if max(map(len, lines)) > cols:
+            rows: List[str] = []
+            flags = bytearray()
+            for text in lines:
+                while len(text) > cols:
+                    rows.append(text[:cols])
+                    flags.append(1)
+                    text = text[cols:]
+                rows.append(text)
+                flags.append(0)
+        else:
+            rows = lines
+            flags = bytearray(len(lines))
+        pushed = len(rows)
+        # Only the newest maxlen rows can survive
+        if pushed > self.maxlen:
+            self.clear()
+            self.first_id += pushed - self.maxlen
+            rows, flags = rows[-self.maxlen:], flags[-self.maxlen:]
+        i, total = 0, len(rows)
+        while i < total:
+            tail = self._tail()
+            take = min(CHUNK_LINES - len(tail.cells), total - i)
+            tail.cells.extend(r.rstrip(" ") for r in rows[i:i + take])
+            tail.attrs.extend([self._default] * take)
+            tail.wrapped.extend(flags[i:i + take])
+            i += take
+        self._len += total
+        if self._len > self.maxlen:
+            self._evict()
+        return pushed
+
+    # Access --------------------------------------------------------------
+    def _locate(self, i: int) -> Tuple[_Chunk, int]:
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError("scrollback index out of range")
+        j = i + self._skip
+        return self._chunks[j // CHUNK_LINES], j % CHUNK_LINES
+
+    def __getitem__(self, i: int) -> HistoryLine:
+        chunk, k = self._locate(i)
+        cells = chunk.cells[k]
+        packed = chunk.attrs[k]
+        n = len(cells)
+        attrs = array("I", [packed]) * n if isinstance(packed, int) else packed
+        return HistoryLine(list(cells), attrs, bool(chunk.wrapped[k]))
+
+    def __iter__(self) -> Iterator[HistoryLine]:
+        for i in range(self._len):
+            yield self[i]
+
+    def text(self, i: int) -> str:
+        chunk, k = self._locate(i)
+        cells = chunk.cells[k]
+        return cells if isinstance(cells, str) else "".join(cells)
+
+    # Search --------------------------------------------------------------
+    def search(self, needle: str, since_id: int = 0, limit: int = MAX_MATCHES) -> List[Tuple[int, int]]:
+        """Case-insensitive matches as (line id, cell column), oldest first.
+
+        Only lines with id >= `since_id` are scanned, so a caller can pick up
+        new history without rescanning the old.
+        """
+        needle = needle.lower()
+        out: List[Tuple[int, int]] = []
+        if not needle or "\n" in needle:
+            return out
+        base = self.first_id - self._skip  # id of _chunks[0].cells[0]
+        for ci, chunk in enumerate(self._chunks):
+            chunk_id = base + ci * CHUNK_LINES
+            if chunk_id + len(chunk.cells) <= max(since_id, self.first_id):
+                continue
+            blob, starts = chunk.index()
+            first = max(0, max(since_id, self.first_id) - chunk_id)
+            pos = blob.find(needle, starts[first] if first < len(starts) else len(blob))
+            while pos >= 0:
+                k = bisect_right(starts, pos) - 1
+                out.append((chunk_id + k, cell_col(chunk.cells[k], pos - starts[k])))
+                if len(out) >= limit:
+                    return out
+                pos = blob.find(needle, pos + 1)
+        return out
+
+    def refine(self, matches: List[Tuple[int, int]], needle: str) -> List[Tuple[int, int]]:
+        """Matches of `needle` among `matches` of a prefix of it.
+
+        Any hit of the longer query starts where a hit of its prefix does, so
+        extending the query only re-checks known hits instead of the history.
+        """
+        needle = needle.lower()
+        out: List[Tuple[int, int]] = []
+        for lid, col in matches:
+            i = lid - self.first_id
+            if i < 0 or i >= self._len:
+                continue
+            chunk, k = self._locate(i)
+            blob, starts = chunk.index()
+            cells = chunk.cells[k]
+            off = col if isinstance(cells, str) else len("".join(cells[:col]))
+            if blob.startswith(needle, starts[k] + off):
+                out.append((lid, col))
+        return out
+
+
+def cell_col(cells: Union[str, Sequence[str]], offset: int) -> int:
+    """Cell column of character `offset` in the text of a cell row."""
+    if isinstance(cells, str):
+        return offset
+    # Wide glyphs have a "" continuation cell, combining marks share one
+    n = 0
+    for col, c in enumerate(cells):
+        if not c:
+            continue
+        if n >= offset:
+            return col
+        n += len(c)
+    return len(cells)
@@ -1,12 +1,24 @@
 from __future__ import annotations
 
+import asyncio
+import codecs
+import select
 import shlex
+import socket
 import subprocess
+import threading
+import time
 from typing import Dict, List, Optional, Tuple
 
-from PyQt6.QtCore import QThread, pyqtSignal
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
 import re
 
+from . import async_engine, ssh_pool
+from .log_follow import LogOffsetStore, accepted_encodings, parse_response, tail_script
+from .output_framer import LineFramer
+from .ssh_mux import SSHMultiplexer, ssh_base_argv
+from .vt_screen import trim_backlog
+
 
 def _compose_inner_command(env: Dict[str, str], conda_env: Optional[str], base_cmd: str, docker_container: Optional[str] = None) -> str:
     # Build environment prefix (KEY=VAL ...) with proper quoting
@@ -55,7 +67,18 @@ def _compose_inner_command(env: Dict[str, str], conda_env: Optional[str], base_c
 
 
 class SSHCommandJob(QThread):
-    line = pyqtSignal(str)
+    """Runs one remote command and streams its output.
+
+    Output arrives as `chunk` signals of whole lines (see output_framer):
+    bounded in size, at most one per frame, and no more than two in flight.
+    The consumer calls `ack()` once it has handled a chunk; until then the
+    job holds further output, and past a few MB of backlog stops reading,
+    which pauses the remote command. With `spill_path` the full output is
+    also written to that file and the display skips lines instead of
+    pausing the command.
+    """
+
+    chunk = pyqtSignal(str)
     finished = pyqtSignal(int)
     error = pyqtSignal(str)
 
@@ -68,6 +91,8 @@ class SSHCommandJob(QThread):
         password: Optional[str],
         inner_command: str,
         timeout: float = 0.0,
+        mux: Optional[SSHMultiplexer] = None,
+        spill_path: Optional[str] = None,
     ) -> None:
         super().__init__()
         self._host = host
@@ -77,130 +102,164 @@ class SSHCommandJob(QThread):
         self._password = password
         self._inner_cmd = inner_command
         self._timeout = float(timeout or 0.0)
+        self._mux = mux
+        self._framer = LineFramer(self.chunk.emit, spill_path=spill_path)
+
+    @property
+    def spill_path(self) -> Optional[str]:
+        return self._framer.spill_path
+
+    def ack(self) -> None:
+        """Consumer is done with the last chunk (any thread)."""
+        self._framer.ack()
 
     @staticmethod
     def build_inner(env: Dict[str, str], conda_env: Optional[str], base_cmd: str, docker_container: Optional[str] = None) -> str:
         return _compose_inner_command(env, conda_env, base_cmd, docker_container)
 
+    def _pump(self, read) -> threading.Thread:
+        """Reader thread: `read()` returns bytes, b"" at EOF."""
+        def loop() -> None:
+            dec = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            try:
+                while True:
+                    data = read()
+                    if not data:
+                        break
+                    self._framer.push(dec.decode(data))
+                self._framer.push(dec.decode(b"", final=True))
+            except Exception:
+                pass
+            finally:
+                self._framer.close()
+
+        t = threading.Thread(target=loop, name="ssh-job-reader", daemon=True)
+        t.start()
+        return t
+
     def run(self) -> None:  # type: ignore[override]
         if self._password:
             try:
-                import paramiko  # type: ignore
+                ssh_pool.import_paramiko()
             except Exception:
                 self.error.emit("Paramiko not installed; cannot run password-based SSH command")
                 self.finished.emit(1)
                 return
+            conn = ssh_pool.acquire(self._host, self._port, self._user, self._password, self._identity)
             try:
-                client = paramiko.SSHClient()
-                client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                client.connect(
-                    hostname=self._host,
-                    port=self._port,
-                    username=self._user,
-                    password=self._password,
-                    key_filename=self._identity,
-                    timeout=10.0,
-                    banner_timeout=15.0,
-                    auth_timeout=15.0,
-                    allow_agent=True,
-                    look_for_keys=True,
-                )
                 cmd = f"bash -lc {shlex.quote(self._inner_cmd)}"
-                transport = client.get_transport()
-                chan = transport.open_session()  # type: ignore[union-attr]
+                chan = conn.open_session()
+                # One ordered stream, as with 2>&1 on the subprocess path
+                chan.set_combine_stderr(True)
                 chan.exec_command(cmd)
-                # Stream output
-                import select
-                while True:
-                    if chan.exit_status_ready():
-                        while chan.recv_ready():
-                            data = chan.recv(4096).decode(errors="ignore")
-                            if data:
-                                self.line.emit(data)
-                        while chan.recv_stderr_ready():
-                            data = chan.recv_stderr(4096).decode(errors="ignore")
-                            if data:
-                                self.line.emit(data)
-                        break
-                    r, _, _ = select.select([chan], [], [], 0.2)
-                    if r:
-                        while chan.recv_ready():
-                            data = chan.recv(4096).decode(errors="ignore")
-                            if data:
-                                self.line.emit(data)
-                        while chan.recv_stderr_ready():
-                            data = chan.recv_stderr(4096).decode(errors="ignore")
-                            if data:
-                                self.line.emit(data)
+                # Blocking reads; while the framer holds the reader, the SSH
+                # window fills and the remote side waits
+                reader = self._pump(lambda: chan.recv(65536))
+                self._framer.deliver()
+                reader.join()
                 rc = chan.recv_exit_status()
                 chan.close()
-                client.close()
                 self.finished.emit(int(rc))
             except Exception as e:  # noqa: BLE001
+                self._framer.close()
                 self.error.emit(str(e))
                 self.finished.emit(1)
+            finally:
+                ssh_pool.release(conn)
             return
 
         # ssh subprocess path
-        dest = f"{self._user}@{self._host}" if self._user else self._host
-        cmd = [
-            "ssh",
-            "-p",
-            str(self._port),
-            "-o",
-            "BatchMode=yes",
-            "-o",
-            "ConnectTimeout=5",
-        ]
-        if self._identity:
-            cmd += ["-i", self._identity]
-        cmd += [dest, "--", "bash", "-lc", self._inner_cmd]
+        cmd = ssh_base_argv(self._host, self._port, self._user, self._identity, mux=self._mux)
+        cmd += ["--", "bash", "-lc", self._inner_cmd]
 
         try:
             p = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
             )
             assert p.stdout is not None
-            for line in p.stdout:
-                self.line.emit(line)
-            p.stdout.close()
+            out = p.stdout
+            reader = self._pump(lambda: out.read1(65536))
+            self._framer.deliver()
+            reader.join()
+            out.close()
             rc = p.wait()
             self.finished.emit(int(rc))
         except Exception as e:  # noqa: BLE001
+            self._framer.close()
             self.error.emit(str(e))
             self.finished.emit(1)
 
 
-class CondaEnvListJob(QThread):
-    result = pyqtSignal(list)
-    error = pyqtSignal(str)
-    debug = pyqtSignal(str)
+class EngineJob(QObject):
+    """Remote work run as a coroutine on the shared async engine.
+
+    One-shot listings and scripts used to be a QThread each (with their own
+    ssh process or paramiko client); these ride on `async_engine.run_ssh`
+    instead, so N concurrent jobs cost no threads. The API mirrors the
+    QThread jobs: `start()`, `isRunning()` and a `finished` signal. Every
+    signal is emitted on the GUI thread (through `engine.post`).
+    """
+    finished = pyqtSignal()
 
-    def __init__(self, host: str, port: int, username: Optional[str], identity: Optional[str], password: Optional[str]) -> None:
+    def __init__(self, host: str, port: int, username: Optional[str], identity: Optional[str], password: Optional[str], mux: Optional[SSHMultiplexer] = None) -> None:
         super().__init__()
         self._host = host
         self._port = int(port)
         self._user = username
         self._identity = identity
         self._password = password
+        self._mux = mux
+        self._future = None
 
-    def _run_remote(self, inner: str) -> Tuple[int, str, str]:
-        dest = f"{self._user}@{self._host}" if self._user else self._host
-        cmd = ["ssh", "-p", str(self._port), "-o", "BatchMode=yes", "-o", "ConnectTimeout=5"]
-        if self._identity:
-            cmd += ["-i", self._identity]
-        cmd += [dest, "--", "bash", "-lc", inner]
+    def start(self) -> None:
+        self._future = async_engine.engine().submit(self._main())
+
+    def isRunning(self) -> bool:  # noqa: N802 - QThread-compatible
+        return self._future is not None and not self._future.done()
+
+    def cancel(self) -> None:
+        if self._future is not None:
+            self._future.cancel()
+
+    def _post(self, signal, *args) -> None:
+        """Emits `signal(*args)` on the GUI thread."""
+        async_engine.engine().post(lambda _=None: signal.emit(*args))
+
+    async def _main(self) -> None:
         try:
-            p = subprocess.run(cmd, capture_output=True, text=True, timeout=12)
-            return p.returncode, p.stdout, p.stderr
-        except Exception as e:  # noqa: BLE001
-            return 1, "", str(e)
+            await self._run()
+        finally:
+            self._post(self.finished)
 
-    def run(self) -> None:  # type: ignore[override]
+    async def _run(self) -> None:
+        raise NotImplementedError
+
+    async def _ssh(self, script: str, timeout: float) -> Tuple[int, str, str]:
+        """Runs `bash -lc script` (pooled transport in password mode, else ssh + mux)."""
+        rc, out, err = await self._ssh_bytes(script, timeout)
+        return rc, out.decode(errors="replace"), err
+
+    async def _ssh_bytes(self, script: str, timeout: float, login: bool = True) -> Tuple[int, bytes, str]:
+        eng = async_engine.engine()
+        conn = None
+        if self._password:
+            # acquire() may have to connect; keep that off the loop
+            conn = await eng.run_blocking(ssh_pool.acquire, self._host, self._port, self._user, self._password, self._identity)
+        try:
+            return await async_engine.run_ssh_bytes(self._host, self._port, self._user, self._identity, script, timeout, conn=conn, mux=self._mux, login=login)
+        finally:
+            if conn is not None:
+                ssh_pool.release(conn)
+
+
+class CondaEnvListJob(EngineJob):
+    result = pyqtSignal(list)
+    error = pyqtSignal(str)
+    debug = pyqtSignal(str)
+
+    async def _run(self) -> None:
         # Build robust detection script: source common conda.sh locations, then try JSON, then text, finally list envs directories
         detect_script = (
             # Header
@@ -231,56 +290,20 @@ class CondaEnvListJob(QThread):
             "printf %s \"$ENV_OUT\""
         )
 
-        if self._password:
-            try:
-                import paramiko  # type: ignore
-                client = paramiko.SSHClient()
-                client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                client.connect(
-                    hostname=self._host,
-                    port=self._port,
-                    username=self._user,
-                    password=self._password,
-                    key_filename=self._identity,
-                    timeout=10.0,
-                    banner_timeout=15.0,
-                    auth_timeout=15.0,
-                    allow_agent=True,
-                    look_for_keys=True,
-                )
-                cmd = f"bash -lc {shlex.quote(detect_script)}"
-                stdin, stdout, stderr = client.exec_command(cmd, timeout=20)
-                out = stdout.read().decode(errors="ignore")
-                err = stderr.read().decode(errors="ignore")
-                client.close()
-                if err:
-                    self.debug.emit(err)
-                if out:
-                    self.debug.emit(out)
-                envs = self._parse_envs(out)
-                try:
-                    self.debug.emit("[conda-detect] parsed envs: %d -> %s" % (len(envs), ", ".join(envs)))
-                except Exception:
-                    pass
-                self.result.emit(envs)
-                return
-            except Exception as e:  # noqa: BLE001
-                self.error.emit(str(e))
-                self.result.emit([])
-                return
-
-        rc, out, err = self._run_remote(detect_script)
-        if rc != 0 and err:
-            self.debug.emit(err)
+        try:
+            rc, out, err = await self._ssh(detect_script, timeout=20.0)
+        except Exception as e:  # noqa: BLE001
+            self._post(self.error, str(e))
+            self._post(self.result, [])
+            return
+        if err:
+            self._post(self.debug, err)
         # Also emit stdout when debugging to help diagnosis
         if out:
-            self.debug.emit(out)
+            self._post(self.debug, out)
         envs = self._parse_envs(out)
-        try:
-            self.debug.emit("[conda-detect] parsed envs: %d -> %s" % (len(envs), ", ".join(envs)))
-        except Exception:
-            pass
-        self.result.emit(envs)
+        self._post(self.debug, "[conda-detect] parsed envs: %d -> %s" % (len(envs), ", ".join(envs)))
+        self._post(self.result, envs)
 
     @staticmethod
     def _parse_envs(out: str) -> List[str]:
@@ -324,20 +347,12 @@ class CondaEnvListJob(QThread):
         return envs
 
 
-class RemoteOSInfoJob(QThread):
+class RemoteOSInfoJob(EngineJob):
     """Fetch remote OS info (pretty name, kernel, hostname) via SSH and emit a one-line summary."""
     result = pyqtSignal(str)
     error = pyqtSignal(str)
 
-    def __init__(self, host: str, port: int, username: Optional[str], identity: Optional[str], password: Optional[str]) -> None:
-        super().__init__()
-        self._host = host
-        self._port = int(port)
-        self._user = username
-        self._identity = identity
-        self._password = password
-
-    def run(self) -> None:  # type: ignore[override]
+    async def _run(self) -> None:
         script = (
             "name=\"\"; "
             "if [ -r /etc/os-release ]; then . /etc/os-release >/dev/null 2>&1; name=\"$PRETTY_NAME\"; fi; "
@@ -346,79 +361,24 @@ class RemoteOSInfoJob(QThread):
             "kernel=\"$(uname -r 2>/dev/null)\"; host=\"$(hostname 2>/dev/null)\"; "
             "echo \"$name | kernel $kernel | $host\""
         )
-        cmd = f"bash -lc {shlex.quote(script)}"
-        if self._password:
-            try:
-                import paramiko  # type: ignore
-                client = paramiko.SSHClient()
-                client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                client.connect(
-                    hostname=self._host,
-                    port=self._port,
-                    username=self._user,
-                    password=self._password,
-                    key_filename=self._identity,
-                    timeout=10.0,
-                    banner_timeout=15.0,
-                    auth_timeout=15.0,
-                    allow_agent=True,
-                    look_for_keys=True,
-                )
-                _, stdout, stderr = client.exec_command(cmd, timeout=10)
-                out = stdout.read().decode(errors="ignore").strip()
-                err = stderr.read().decode(errors="ignore").strip()
-                client.close()
-                if out:
-                    self.result.emit(out)
-                elif err:
-                    self.error.emit(err)
-                else:
-                    self.error.emit("empty os info output")
-            except Exception as e:  # noqa: BLE001
-                self.error.emit(str(e))
-            return
-
-        dest = f"{self._user}@{self._host}" if self._user else self._host
-        ssh_cmd = ["ssh", "-p", str(self._port), "-o", "BatchMode=yes", "-o", "ConnectTimeout=5"]
-        if self._identity:
-            ssh_cmd += ["-i", self._identity]
-        ssh_cmd += [dest, "--", cmd]
         try:
-            p = subprocess.run(ssh_cmd, capture_output=True, text=True, timeout=12)
-            out = (p.stdout or "").strip()
-            if out:
-                self.result.emit(out)
-            else:
-                self.error.emit((p.stderr or "os info command failed").strip())
+            _, out, err = await self._ssh(script, timeout=10.0)
         except Exception as e:  # noqa: BLE001
-            self.error.emit(str(e))
-            
-class DockerContainerListJob(QThread):
+            self._post(self.error, str(e))
+            return
+        out = out.strip()
+        if out:
+            self._post(self.result, out)
+        else:
+            self._post(self.error, err.strip() or "os info command failed")
+
+
+class DockerContainerListJob(EngineJob):
     result = pyqtSignal(list)
     error = pyqtSignal(str)
     debug = pyqtSignal(str)
 
-    def __init__(self, host: str, port: int, username: Optional[str], identity: Optional[str], password: Optional[str]) -> None:
-        super().__init__()
-        self._host = host
-        self._port = int(port)
-        self._user = username
-        self._identity = identity
-        self._password = password
-
-    def _run_remote(self, inner: str) -> Tuple[int, str, str]:
-        dest = f"{self._user}@{self._host}" if self._user else self._host
-        cmd = ["ssh", "-p", str(self._port), "-o", "BatchMode=yes", "-o", "ConnectTimeout=5"]
-        if self._identity:
-            cmd += ["-i", self._identity]
-        cmd += [dest, "--", "bash", "-lc", inner]
-        try:
-            p = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-            return p.returncode, p.stdout, p.stderr
-        except Exception as e:  # noqa: BLE001
-            return 1, "", str(e)
-
-    def run(self) -> None:  # type: ignore[override]
+    async def _run(self) -> None:
         script = (
             "echo '[docker-detect] start' 1>&2; "
             "echo '[docker-detect] whoami='$(whoami)' shell='$SHELL 1>&2; "
@@ -437,35 +397,16 @@ class DockerContainerListJob(QThread):
             "OUT2=\"$(sudo -n docker ps --format '{{.Names}}\t{{.ID}}' 2>/dev/null || true)\"; "
             "printf '%s\n%s\n' \"$OUT1\" \"$OUT2\" | awk 'NF' | sort -u"
         )
-        if self._password:
-            try:
-                import paramiko  # type: ignore
-                client = paramiko.SSHClient()
-                client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                client.connect(
-                    hostname=self._host, port=self._port, username=self._user, password=self._password,
-                    key_filename=self._identity, timeout=10.0, banner_timeout=15.0, auth_timeout=15.0,
-                    allow_agent=True, look_for_keys=True,
-                )
-                cmd = f"bash -lc {shlex.quote(script)}"
-                _, stdout, stderr = client.exec_command(cmd, timeout=12)
-                out = stdout.read().decode(errors="ignore")
-                err = stderr.read().decode(errors="ignore")
-                client.close()
-                if err:
-                    self.debug.emit(err)
-                if out:
-                    self.debug.emit(out)
-            except Exception as e:  # noqa: BLE001
-                self.error.emit(str(e))
-                self.result.emit([])
-                return
-        else:
-            rc, out, err = self._run_remote(script)
-            if rc != 0 and err:
-                self.debug.emit(err)
-            if out:
-                self.debug.emit(out)
+        try:
+            _, out, err = await self._ssh(script, timeout=12.0)
+        except Exception as e:  # noqa: BLE001
+            self._post(self.error, str(e))
+            self._post(self.result, [])
+            return
+        if err:
+            self._post(self.debug, err)
+        if out:
+            self._post(self.debug, out)
         # Parse out -> list of names (prefer names, fallback to ids)
         names = []
         for line in (out or "").splitlines():
@@ -480,9 +421,9 @@ class DockerContainerListJob(QThread):
             # Also try plain `docker ps --format {{.Names}}` as a fallback
             more = []
             try:
-                rc2, out2, err2 = self._run_remote("docker ps --format '{{.Names}}' 2>/dev/null || true")
+                _, out2, _ = await self._ssh("docker ps --format '{{.Names}}' 2>/dev/null || true", timeout=10.0)
                 if out2:
-                    self.debug.emit(out2)
+                    self._post(self.debug, out2)
                     for ln in out2.splitlines():
                         ln = ln.strip();
                         if ln:
@@ -491,15 +432,23 @@ class DockerContainerListJob(QThread):
                 pass
             if more:
                 names = sorted(set(more))
-        self.result.emit(names)
+        self._post(self.result, names)
 
 
 class SSHInteractiveShell(QThread):
-    """Interactive SSH shell with PTY. Emits raw text; supports send/close.
+    """Interactive SSH shell with PTY. Buffers raw text; supports send/close.
 
     Designed for a single session per MainWindow. Use write() to send keys.
+    Output is not emitted per read: the reader thread appends to a buffer
+    and emits `output_ready` once until the view calls `take_output()`, so
+    a fast producer costs one queued signal per frame, not one per recv().
     """
-    data = pyqtSignal(str)
+    # Buffered output kept while the view is behind; beyond this the oldest
+    # plain-log lines are dropped (trim_backlog) so memory stays bounded
+    MAX_BUFFERED = 16 * 1024 * 1024
+    MAX_BUFFERED_LINES = 100000
+
+    output_ready = pyqtSignal()
     error = pyqtSignal(str)
     connected = pyqtSignal()
     closed = pyqtSignal()
@@ -515,36 +464,55 @@ class SSHInteractiveShell(QThread):
         self._chan = None
         self._stop = False
         self._strip_ansi = bool(strip_ansi)
+        self._out: List[str] = []
+        self._out_len = 0
+        self._out_lock = threading.Lock()
+        self._notified = False
+
+    def _push_output(self, text: str) -> None:
+        with self._out_lock:
+            self._out.append(text)
+            self._out_len += len(text)
+            if self._out_len > self.MAX_BUFFERED:
+                kept = trim_backlog("".join(self._out), self.MAX_BUFFERED_LINES)
+                self._out = [kept]
+                self._out_len = len(kept)
+            if self._notified:
+                return
+            self._notified = True
+        self.output_ready.emit()
+
+    def take_output(self) -> str:
+        """Returns (and clears) everything received since the last call."""
+        with self._out_lock:
+            text = "".join(self._out)
+            self._out = []
+            self._out_len = 0
+            self._notified = False
+        return text
 
     def run(self) -> None:  # type: ignore[override]
         try:
-            import paramiko  # type: ignore
-        except Exception:
-            self.error.emit("paramiko not installed; please pip install paramiko")
+            ssh_pool.import_paramiko()
+        except Exception as e:
+            self.error.emit(str(e))
             self.closed.emit()
             return
+        conn = ssh_pool.acquire(self._host, self._port, self._user, self._password, self._identity)
         try:
-            client = paramiko.SSHClient()
-            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            client.connect(
-                hostname=self._host,
-                port=self._port,
-                username=self._user,
-                password=self._password,
-                key_filename=self._identity,
-                timeout=10.0,
-                banner_timeout=15.0,
-                auth_timeout=15.0,
-                allow_agent=True,
-                look_for_keys=True,
-            )
-            chan = client.invoke_shell(term='xterm')
+            # Shell channel on the pooled transport (same as SSHClient.invoke_shell)
+            chan = conn.open_session()
+            # TerminalWidget emulates xterm incl. 256 colours (see vt_screen)
+            chan.get_pty(term='xterm-256color', width=80, height=24)
+            chan.invoke_shell()
+            # Bounds write() (GUI thread) when the remote window is full; reads
+            # block in select() below instead of polling
             chan.settimeout(0.2)
-            self._client = client
+            self._client = conn
             self._chan = chan
+            if self._stop:
+                chan.close()  # stop_shell() ran before the channel was published
             self.connected.emit()
-            # Read loop
-            import time
             # ANSI/OSC escape filters
             ansi_csi = re.compile(r"\x1b\[[0-?]*[ -/]*[@-~]")
             osc = re.compile(r"\x1b\].*?(\x07|\x1b\\)")  # OSC ... BEL or ST
@@ -558,37 +526,36 @@ class SSHInteractiveShell(QThread):
                 # Normalize CRLF
                 s = s.replace("\r\n", "\n").replace("\r", "\n")
                 return s
+            # Multi-byte UTF-8 (box drawing, CJK) may be split across reads
+            decoder = codecs.getincrementaldecoder("utf-8")("replace")
             while not self._stop:
                 try:
-                    if chan.recv_ready():
-                        data = chan.recv(4096)
-                        if not data:
-                            break
-                        text = data.decode(errors='ignore')
-                        if self._strip_ansi:
-                            # Backward-compatible cleaning when requested
-                            ansi_csi = re.compile(r'\x1b\[[0-?]*[ -/]*[@-~]')
-                            osc = re.compile(r'\x1b\].*?(\x07|\x1b\\)')
-                            bracketed_paste = re.compile(r'\x1b\\?2004[hl]') if False else re.compile(r'\x1b\[\?2004[hl]')
-                            text = osc.sub('', text)
-                            text = bracketed_paste.sub('', text)
-                            text = ansi_csi.sub('', text)
-                            text = text.replace('\r\n', '\n').replace('\r', '\n')
-                        self.data.emit(text)
-                    else:
-                        time.sleep(0.05)
+                    # Sleeps until output arrives or the channel closes (paramiko
+                    # signals its fileno() pipe for both): echo latency is the
+                    # network RTT and an idle pane never wakes up
+                    select.select([chan], [], [])
+                    data = chan.recv(65536)
+                except socket.timeout:
+                    continue
                 except Exception:
-                    time.sleep(0.05)
+                    break  # channel/transport closed under us
+                if not data:
+                    break
+                text = decoder.decode(data)
+                if self._strip_ansi:
+                    # Backward-compatible cleaning when requested
+                    text = _clean(text)
+                if text:
+                    self._push_output(text)
             try:
                 chan.close()
             except Exception:
                 pass
-            try:
-                client.close()
-            except Exception:
-                pass
         except Exception as e:  # noqa: BLE001
             self.error.emit(str(e))
+        finally:
+            self._client = None
+            ssh_pool.release(conn)
         self.closed.emit()
 
     def write(self, text: str) -> None:
@@ -616,7 +583,7 @@ class SSHInteractiveShell(QThread):
         except Exception:
             pass
 
-class RemoteListDirJob(QThread):
+class RemoteListDirJob(EngineJob):
     """List a remote directory via SSH and emit (cwd, entries) where entries is a list of dicts.
 
     Each entry: { 'name': str, 'type': 'D'|'F'|'O' }
@@ -624,28 +591,11 @@ class RemoteListDirJob(QThread):
     result = pyqtSignal(str, list)
     error = pyqtSignal(str)
 
-    def __init__(self, host: str, port: int, username: Optional[str], identity: Optional[str], password: Optional[str], path: Optional[str] = None) -> None:
-        super().__init__()
-        self._host = host
-        self._port = int(port)
-        self._user = username
-        self._identity = identity
-        self._password = password
+    def __init__(self, host: str, port: int, username: Optional[str], identity: Optional[str], password: Optional[str], path: Optional[str] = None, mux: Optional[SSHMultiplexer] = None) -> None:
+        super().__init__(host, port, username, identity, password, mux)
         self._path = path or ""
 
-    def _run_remote(self, inner: str) -> Tuple[int, str, str]:
-        dest = f"{self._user}@{self._host}" if self._user else self._host
-        cmd = ["ssh", "-p", str(self._port), "-o", "BatchMode=yes", "-o", "ConnectTimeout=5"]
-        if self._identity:
-            cmd += ["-i", self._identity]
-        cmd += [dest, "--", "bash", "-lc", inner]
-        try:
-            p = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-            return p.returncode, p.stdout, p.stderr
-        except Exception as e:  # noqa: BLE001
-            return 1, "", str(e)
-
-    def run(self) -> None:  # type: ignore[override]
+    async def _run(self) -> None:
         # Resolve directory and list entries. Print CWD on first line.
         inner = (
             "DIR=\"%s\"; " % shlex.quote(self._path)
@@ -656,42 +606,17 @@ class RemoteListDirJob(QThread):
             + "elif [ -f \"$n\" ]; then printf 'F\t%s\n' \"$n\"; "
             + "else printf 'O\t%s\n' \"$n\"; fi; done"
         )
-        if self._password:
-            try:
-                import paramiko  # type: ignore
-                client = paramiko.SSHClient()
-                client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-                client.connect(
-                    hostname=self._host,
-                    port=self._port,
-                    username=self._user,
-                    password=self._password,
-                    key_filename=self._identity,
-                    timeout=10.0,
-                    banner_timeout=15.0,
-                    auth_timeout=15.0,
-                    allow_agent=True,
-                    look_for_keys=True,
-                )
-                cmd = f"bash -lc {shlex.quote(inner)}"
-                _, stdout, stderr = client.exec_command(cmd, timeout=12)
-                out = stdout.read().decode(errors="ignore")
-                err = stderr.read().decode(errors="ignore")
-                client.close()
-                if err and not out:
-                    self.error.emit(err.strip())
-                    return
-            except Exception as e:  # noqa: BLE001
-                self.error.emit(str(e))
-                return
-        else:
-            rc, out, err = self._run_remote(inner)
-            if rc != 0 and err and not out:
-                self.error.emit(err.strip())
-                return
+        try:
+            rc, out, err = await self._ssh(inner, timeout=12.0)
+        except Exception as e:  # noqa: BLE001
+            self._post(self.error, str(e))
+            return
+        if rc != 0 and err and not out:
+            self._post(self.error, err.strip())
+            return
         lines = (out or "").splitlines()
         if not lines:
-            self.error.emit("empty listing output")
+            self._post(self.error, "empty listing output")
             return
         cwd = lines[0].strip()
         entries = []
@@ -704,7 +629,172 @@ class RemoteListDirJob(QThread):
             except ValueError:
                 t, name = 'O', ln
             entries.append({'type': t, 'name': name})
-        self.result.emit(cwd, entries)
+        self._post(self.result, cwd, entries)
+
+
+class RemoteScriptJob(EngineJob):
+    """Runs one bash script (e.g. from remote_jobs) and emits (rc, stdout, stderr)."""
+    result = pyqtSignal(int, str, str)
+    error = pyqtSignal(str)
+
+    def __init__(self, host: str, port: int, username: Optional[str], identity: Optional[str], password: Optional[str], script: str, timeout: float = 20.0, mux: Optional[SSHMultiplexer] = None) -> None:
+        super().__init__(host, port, username, identity, password, mux)
+        self._script = script
+        self._timeout = float(timeout)
+
+    async def _run(self) -> None:
+        try:
+            rc, out, err = await self._ssh(self._script, self._timeout)
+        except Exception as e:  # noqa: BLE001
+            self._post(self.error, str(e) or "ssh error")
+            return
+        self._post(self.result, int(rc), out, err)
+
+
+class RemoteLogTailJob(EngineJob):
+    """Follows a remote file by byte offset (job logs, train.log, ...).
+
+    Every `interval` seconds fetches only the bytes past the last offset
+    (at most `max_bytes` per request, back to back while catching up),
+    compressed on the wire when the delta is large (see log_follow).
+    Emits `chunk(text, offset)` with the offset after that text; the
+    consumer calls `ack()` before the next chunk is fetched, so catching up
+    on a long backlog never queues more than one chunk on the GUI.
+
+    Start position: `offset` if given, else the offset saved in `store`
+    under `key` (a reconnect or restart resends nothing), else the last
+    `initial_bytes` of the file. Delivered offsets are saved to `store`.
+    The loop is a coroutine on the shared engine, so following any number
+    of logs costs no threads.
+    """
+    chunk = pyqtSignal(str, int)
+    # The file shrank or was replaced; following restarts at 0
+    reset = pyqtSignal()
+    error = pyqtSignal(str)
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str],
+        identity: Optional[str],
+        password: Optional[str],
+        path: str,
+        offset: Optional[int] = None,
+        interval: float = 1.0,
+        max_bytes: int = 1024 * 1024,
+        initial_bytes: int = 256 * 1024,
+        mux: Optional[SSHMultiplexer] = None,
+        store: Optional[LogOffsetStore] = None,
+    ) -> None:
+        super().__init__(host, port, username, identity, password, mux)
+        self.path = path
+        self._store = store
+        self.key = LogOffsetStore.key(host, port, username, path)
+        self.inode = 0
+        saved = store.get(self.key) if (store is not None and offset is None) else None
+        if saved is not None:
+            offset, self.inode = saved
+        self.offset = offset
+        self.resumed = saved is not None
+        self._initial = max(0, int(initial_bytes))
+        self._interval = max(0.2, float(interval))
+        self._max_bytes = max(4096, int(max_bytes))
+        self._encodings = accepted_encodings()
+        # Transfer counters: bytes received over SSH vs. log bytes delivered
+        self.wire_bytes = 0
+        self.data_bytes = 0
+        # Set from the GUI thread; the loop is woken through _wake
+        self._stopped = False
+        self._acked = True
+        self._wake: Optional[asyncio.Event] = None
+
+    def _notify(self) -> None:
+        wake = self._wake
+        if wake is not None:
+            async_engine.engine().loop.call_soon_threadsafe(wake.set)
+
+    def stop(self) -> None:
+        # Also drops an in-flight fetch; offsets only move on delivery
+        self._stopped = True
+        self.cancel()
+
+    def ack(self) -> None:
+        self._acked = True
+        self._notify()
+
+    async def _sleep(self, sec: float, until=lambda: False) -> None:
+        """Sleeps up to `sec`, returning early on stop() or once `until()` holds."""
+        deadline = time.monotonic() + sec
+        while not self._stopped and not until():
+            left = deadline - time.monotonic()
+            if left <= 0:
+                return
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), left)
+            except asyncio.TimeoutError:
+                return
+
+    async def _run(self) -> None:
+        self._wake = asyncio.Event()
+        try:
+            await self._follow()
+        finally:
+            if self._store is not None:
+                self._store.flush()
+
+    async def _follow(self) -> None:
+        dec = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        failures = 0
+        while not self._stopped:
+            want = self.offset if self.offset is not None else -self._initial
+            script = tail_script(self.path, want, self._max_bytes, self.inode, self._encodings)
+            try:
+                rc, out, err = await self._ssh_bytes(script, 30.0, login=False)
+                try:
+                    resp = parse_response(out)
+                except ValueError:
+                    raise RuntimeError((err or f"tail failed (rc={rc})").strip())
+            except Exception as e:  # noqa: BLE001
+                failures += 1
+                if failures == 1:
+                    self._post(self.error, str(e) or "tail failed")
+                # Back off while the host is unreachable (laptop asleep, VPN down)
+                await self._sleep(min(30.0, self._interval * 2 ** min(failures, 5)))
+                continue
+            failures = 0
+            self.wire_bytes += resp.wire_bytes
+            if resp.size < 0:
+                await self._sleep(self._interval)
+                continue
+            start, data = resp.offset, resp.data
+            if self.offset is not None and start != self.offset:
+                dec.reset()
+                self._post(self.reset)
+            elif self.offset is None and start > 0:
+                # Started mid-file: drop the partial first line
+                nl = data.find(b"\n")
+                if 0 <= nl < len(data) - 1:
+                    start += nl + 1
+                    data = data[nl + 1:]
+            end = start + len(data)
+            self.inode = resp.inode
+            if data:
+                text = dec.decode(data)
+                await self._sleep(5.0, lambda: self._acked)
+                self._acked = False
+                if self._stopped:
+                    break  # not delivered: keep the old offset
+                self.offset = end
+                self.data_bytes += len(data)
+                self._post(self.chunk, text, end)
+            else:
+                self.offset = end
+            if self._store is not None:
+                self._store.set(self.key, self.offset, self.inode)
+            if len(resp.data) < self._max_bytes:
+                await self._sleep(self._interval)
 
 
 class ReverseTunnelJob(QThread):
@@ -783,6 +873,14 @@ class ReverseTunnelJob(QThread):
         except Exception as e:  # noqa: BLE001
             self.error.emit(str(e))
 
+    def stop_tunnel(self) -> None:
+        self._stop = True
+        try:
+            if self._proc is not None:
+                self._proc.terminate()
+        except Exception:
+            pass
+
 
 class ReverseTunnelParamikoJob(QThread):
     """Reverse SSH tunnel using Paramiko Transport.request_port_forward.
@@ -812,37 +910,20 @@ class ReverseTunnelParamikoJob(QThread):
 
     def run(self) -> None:  # type: ignore[override]
         try:
-            import paramiko  # type: ignore
-        except Exception:
-            self.error.emit("paramiko not installed; please pip install paramiko")
+            ssh_pool.import_paramiko()
+        except Exception as e:
+            self.error.emit(str(e))
             return
+        conn = ssh_pool.acquire(self._r_host, self._r_port, self._r_user, self._password, self._identity)
         try:
-            client = paramiko.SSHClient()
-            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            client.connect(
-                hostname=self._r_host,
-                port=self._r_port,
-                username=self._r_user,
-                password=self._password,
-                key_filename=self._identity,
-                timeout=10.0,
-                banner_timeout=15.0,
-                auth_timeout=15.0,
-                allow_agent=True,
-                look_for_keys=True,
-            )
-            self._client = client
-            transport = client.get_transport()
+            self._client = conn
+            transport = conn.transport()
             self._transport = transport
             # Request remote port forward on loopback (matches ssh -R default)
             try:
                 transport.request_port_forward(self._bind_addr, self._bind_port)
             except Exception as e:
                 self.error.emit(f"request_port_forward failed: {e}")
-                try:
-                    client.close()
-                except Exception:
-                    pass
                 return
             self.debug.emit(f"[reverse-tunnel:paramiko] remote bind {self._bind_addr}:{self._bind_port} -> localhost:{self._local_port}")
             self.started.emit()
@@ -917,21 +998,19 @@ class ReverseTunnelParamikoJob(QThread):
                         chan.close()
                     except Exception:
                         pass
-            # Cleanup
-            try:
-                if transport and transport.is_active():
-                    try:
-                        transport.cancel_port_forward(self._bind_addr, self._bind_port)
-                    except Exception:
-                        pass
-            finally:
+            # Cleanup: only cancel our forward; the transport is shared
+            if transport and transport.is_active():
                 try:
-                    client.close()
+                    transport.cancel_port_forward(self._bind_addr, self._bind_port)
                 except Exception:
                     pass
             self.stopped.emit(0)
         except Exception as e:  # noqa: BLE001
             self.error.emit(str(e))
+        finally:
+            self._transport = None
+            self._client = None
+            ssh_pool.release(conn)
 
     def stop_tunnel(self) -> None:
         self._stop = True
@@ -943,11 +1022,3 @@ class ReverseTunnelParamikoJob(QThread):
                     pass
         except Exception:
             pass
-
-    def stop_tunnel(self) -> None:
-        self._stop = True
-        try:
-            if self._proc is not None:
-                self._proc.terminate()
-        except Exception:
-            pass
@@ -0,0 +1,199 @@
+"""OpenSSH connection multiplexing (ControlMaster) for subprocess-mode jobs.
+
+Every key/agent based job shells out to the local `ssh` binary. Without
+multiplexing each call pays a full TCP + key exchange + auth round trip. An
+`SSHMultiplexer` owns one background master connection per host (started with
+`ssh -M -N -f`) and hands out argv prefixes that ride on its control socket.
+
+If the master cannot be started (Windows OpenSSH, old ssh, auth failure) the
+argv silently degrades to a plain connection, so callers never need to care.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from typing import List, Optional
+
+
+def ssh_dest(host: str, username: Optional[str]) -> str:
+    return f"{username}@{host}" if username else host
+
+
+def ssh_base_argv(
+    host: str,
+    port: int,
+    username: Optional[str],
+    identity: Optional[str],
+    ssh_bin: str = "ssh",
+    mux: Optional["SSHMultiplexer"] = None,
+    connect_timeout: int = 5,
+) -> List[str]:
+    """Builds `ssh -p PORT -o BatchMode=yes ... [mux opts] [-i ID] DEST`.
+
+    Pass the result plus `["--", "bash", "-lc", cmd]` to subprocess. When a
+    multiplexer is given (and usable) the command reuses its master channel.
+    """
+    cmd = [ssh_bin, "-p", str(int(port)), "-o", "BatchMode=yes", "-o", f"ConnectTimeout={int(connect_timeout)}"]
+    if mux is not None:
+        cmd += mux.client_options()
+    if identity:
+        cmd += ["-i", identity]
+    cmd.append(ssh_dest(host, username))
+    return cmd
+
+
+class SSHMultiplexer:
+    """Owns an OpenSSH ControlMaster for one host for the lifetime of a connection.
+
+    - `client_options()` is cheap and thread-safe; the first caller lazily
+      starts the master (from a worker thread, never the GUI thread). A live
+      master is trusted for CHECK_TTL seconds before `ssh -O check` runs
+      again; callers that see ssh itself fail (rc 255) call `invalidate()`
+      so the next caller re-checks right away.
+    - A master that fails to start (auth, network down) is not retried for
+      RETRY_SEC; until then callers get plain ssh options.
+    - `close()` sends `ssh -O exit` and removes the socket directory.
+    """
+
+    # Seconds a confirmed master is assumed alive without `ssh -O check`
+    CHECK_TTL = 60.0
+    # Seconds to wait before trying again after a master failed to start
+    RETRY_SEC = 60.0
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 22,
+        username: Optional[str] = None,
+        identity: Optional[str] = None,
+        ssh_bin: str = "ssh",
+        persist_sec: int = 600,
+    ) -> None:
+        self._host = host
+        self._port = int(port)
+        self._username = username
+        self._identity = identity
+        self._ssh_bin = ssh_bin
+        self._persist = int(persist_sec)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._started = False
+        # monotonic() before which no new master is attempted
+        self._retry_at = 0.0
+        # monotonic() of the last start/check that found the master alive
+        self._alive_at = 0.0
+        # Unix socket paths are limited to ~104 bytes; keep them short
+        self._dir: Optional[str] = None
+        self._enabled = os.name != "nt"
+        if self._enabled:
+            try:
+                self._dir = tempfile.mkdtemp(prefix="gpumgr-")
+            except Exception:
+                self._enabled = False
+
+    # Identity -------------------------------------------------------------
+    def matches(self, host: str, port: int, username: Optional[str], identity: Optional[str]) -> bool:
+        return (
+            self._host == host
+            and self._port == int(port)
+            and (self._username or None) == (username or None)
+            and (self._identity or None) == (identity or None)
+        )
+
+    @property
+    def control_path(self) -> str:
+        return os.path.join(self._dir or "", "cm")
+
+    # Master lifecycle -----------------------------------------------------
+    def _base(self) -> List[str]:
+        return ssh_base_argv(self._host, self._port, self._username, self._identity, self._ssh_bin)
+
+    def _control_argv(self, op: str) -> List[str]:
+        return [self._ssh_bin, "-p", str(self._port), "-o", f"ControlPath={self.control_path}", "-O", op, ssh_dest(self._host, self._username)]
+
+    def _master_alive(self) -> bool:
+        if not os.path.exists(self.control_path):
+            return False
+        try:
+            p = subprocess.run(self._control_argv("check"), capture_output=True, timeout=5)
+            return p.returncode == 0
+        except Exception:
+            return False
+
+    def ensure_master(self) -> bool:
+        """Starts the master if needed. Blocks for one handshake; call off the GUI thread."""
+        if not self._enabled or self._closed:
+            return False
+        if self._started and time.monotonic() - self._alive_at < self.CHECK_TTL:
+            return True  # fast path: no process, no lock
+        with self._lock:
+            if self._closed or time.monotonic() < self._retry_at:
+                return False
+            if self._started and time.monotonic() - self._alive_at < self.CHECK_TTL:
+                return True  # another caller just checked
+            if self._started and self._master_alive():
+                self._alive_at = time.monotonic()
+                return True
+            # A master that died (network drop, remote reboot) may leave its
+            # socket behind; ssh -M refuses to bind over it
+            try:
+                os.unlink(self.control_path)
+            except OSError:
+                pass
+            base = self._base()
+            cmd = base[:1] + [
+                "-M", "-N", "-f",
+                "-o", f"ControlPath={self.control_path}",
+                "-o", f"ControlPersist={self._persist}",
+                "-o", "ServerAliveInterval=30",
+                "-o", "ServerAliveCountMax=3",
+            ] + base[1:]
+            try:
+                # -f backgrounds after auth; stdio must not be inherited pipes or
+                # the daemonised master would keep them open forever.
+                p = subprocess.run(
+                    cmd,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    timeout=20,
+                )
+                self._started = p.returncode == 0 and os.path.exists(self.control_path)
+            except Exception:
+                self._started = False
+            if self._started:
+                self._alive_at = time.monotonic()
+            else:
+                # Do not retry on every call (e.g. auth fails); plain ssh still works
+                self._retry_at = time.monotonic() + self.RETRY_SEC
+            return self._started
+
+    def invalidate(self) -> None:
+        """Forces the next caller to re-check the master (call after an ssh failure)."""
+        self._alive_at = 0.0
+
+    def client_options(self) -> List[str]:
+        """ssh -o options to reuse the master; empty when multiplexing is unavailable."""
+        if not self.ensure_master():
+            return []
+        # ControlMaster=no: never let a job become (and hang on) a master itself
+        return ["-o", "ControlMaster=no", "-o", f"ControlPath={self.control_path}"]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._started:
+                try:
+                    subprocess.run(self._control_argv("exit"), capture_output=True, timeout=5)
+                except Exception:
+                    pass
+            self._started = False
+        if self._dir:
+            shutil.rmtree(self._dir, ignore_errors=True)
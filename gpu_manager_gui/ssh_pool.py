@@ -0,0 +1,302 @@
+"""Pooled paramiko connections for password-mode SSH.
+
+Without pooling every job (poller, shell panes, conda/docker/listing jobs, the
+reverse tunnel) opened its own `paramiko.SSHClient`, i.e. one TCP connection and
+one auth exchange each. The pool keeps one authenticated Transport per
+host+credentials and hands out channels on it:
+
+    conn = ssh_pool.acquire(host, port, user, password, identity)
+    try:
+        rc, out, err = conn.exec_command("bash -lc 'uptime'", timeout=10)
+    finally:
+        ssh_pool.release(conn)
+
+or, for one-shot jobs, `with ssh_pool.lease(...) as conn:`.
+
+Connections are ref-counted and closed when the last user releases them;
+MainWindow holds a reference for the lifetime of a login so short jobs reuse
+the same Transport. Keepalives are enabled and a dead Transport is re-created
+transparently on the next use; live Transports are only closed with the
+connection, since shells, tunnels and jobs share them. If the server refuses more sessions on one
+connection (sshd MaxSessions), an overflow connection is added.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+_paramiko = None
+
+
+def import_paramiko():
+    """Imports paramiko once; raises ImportError with a user-facing hint."""
+    global _paramiko
+    if _paramiko is None:
+        try:
+            import paramiko  # type: ignore
+        except Exception as e:  # noqa: BLE001
+            raise ImportError("paramiko not installed; please pip install paramiko") from e
+        _paramiko = paramiko
+    return _paramiko
+
+
+class SessionLimitError(RuntimeError):
+    """All MAX_CLIENTS transports refuse more sessions (sshd MaxSessions)."""
+
+
+class PooledConnection:
+    """One logical SSH connection (host + credentials) shared by many users."""
+
+    # Safety cap on overflow connections when sshd refuses more sessions
+    MAX_CLIENTS = 4
+
+    def __init__(
+        self,
+        key: Tuple[Any, ...],
+        host: str,
+        port: int,
+        username: Optional[str],
+        password: Optional[str],
+        identity: Optional[str],
+        timeout: float = 10.0,
+        keepalive_sec: int = 30,
+    ) -> None:
+        self.key = key
+        self._host = host
+        self._port = int(port)
+        self._username = username
+        self._password = password
+        self._identity = identity
+        self._timeout = float(timeout)
+        self._keepalive = int(keepalive_sec)
+        self._clients: List[Any] = []
+        self._lock = threading.RLock()
+        # Overflow connections being handshaken (count towards MAX_CLIENTS)
+        self._connecting = 0
+        self.refs = 0
+        self.closed = False
+
+    # Connection management ---------------------------------------------
+    def _new_client(self):
+        paramiko = import_paramiko()
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        client.connect(
+            hostname=self._host,
+            port=self._port,
+            username=self._username,
+            password=self._password,
+            key_filename=self._identity,
+            timeout=self._timeout,
+            banner_timeout=max(self._timeout, 15.0),
+            auth_timeout=max(self._timeout, 15.0),
+            allow_agent=True,
+            look_for_keys=True,
+        )
+        t = client.get_transport()
+        if t is not None and self._keepalive > 0:
+            t.set_keepalive(self._keepalive)
+        return client
+
+    @staticmethod
+    def _alive(client) -> bool:
+        try:
+            t = client.get_transport()
+            return bool(t is not None and t.is_active())
+        except Exception:
+            return False
+
+    def _prune(self) -> None:
+        live = []
+        for c in self._clients:
+            if self._alive(c):
+                live.append(c)
+            else:
+                try:
+                    c.close()
+                except Exception:
+                    pass
+        self._clients = live
+
+    def client(self):
+        """Primary SSHClient, (re)connecting if needed. Raises on failure.
+
+        The handshake runs outside the lock, so other users of the host keep
+        opening channels on live transports meanwhile.
+        """
+        with self._lock:
+            if self.closed:
+                raise RuntimeError("connection closed")
+            self._prune()
+            if self._clients:
+                return self._clients[0]
+        return self._add_client()
+
+    def _add_client(self):
+        c = self._new_client()
+        with self._lock:
+            if self.closed:
+                try:
+                    c.close()
+                except Exception:
+                    pass
+                raise RuntimeError("connection closed")
+            self._clients.append(c)
+            return c
+
+    def transport(self):
+        return self.client().get_transport()
+
+    def ensure_connected(self) -> Optional[str]:
+        """Connects if needed; returns an error string instead of raising."""
+        try:
+            self.client()
+            return None
+        except Exception as e:  # noqa: BLE001
+            return str(e)
+
+    def drop_dead(self) -> bool:
+        """Forgets transports that are no longer active; returns True if any
+        were dropped (i.e. a retry may succeed). Live transports are never
+        closed: channels of shells, tunnels and other jobs ride on them."""
+        with self._lock:
+            n = len(self._clients)
+            self._prune()
+            return len(self._clients) < n
+
+    def open_session(self):
+        """Opens a channel on a shared transport (adding an overflow connection
+        when the server refuses more sessions on the existing ones)."""
+        paramiko = import_paramiko()
+        self.client()
+        with self._lock:
+            clients = list(self._clients)
+        for c in clients:
+            try:
+                return c.get_transport().open_session(timeout=self._timeout)
+            except paramiko.ChannelException:
+                continue  # MaxSessions reached on this transport
+            except Exception:
+                continue  # transport died meanwhile; pruned on the next call
+        with self._lock:
+            self._prune()
+            if len(self._clients) + self._connecting >= self.MAX_CLIENTS:
+                raise SessionLimitError("too many SSH sessions open on this host")
+            self._connecting += 1
+        try:
+            c = self._add_client()
+        finally:
+            with self._lock:
+                self._connecting -= 1
+        return c.get_transport().open_session(timeout=self._timeout)
+
+    def exec_command(self, command: str, timeout: Optional[float] = None) -> Tuple[int, str, str]:
+        """Runs a command on a fresh channel; returns (rc, stdout, stderr).
+
+        Retries once on a new transport if the pooled one turned out dead. A
+        timeout or a session-limit error fails only this call.
+        """
+        rc, out, err = self.exec_bytes(command, timeout)
+        return rc, out.decode(errors="ignore"), err
+
+    def exec_bytes(self, command: str, timeout: Optional[float] = None) -> Tuple[int, bytes, str]:
+        """As exec_command, with stdout left undecoded (binary/partial output)."""
+        for attempt in (0, 1):
+            try:
+                chan = self.open_session()
+            except Exception:
+                # Retry only when a dead transport was the cause; a session
+                # limit is a failure of this call alone
+                if attempt or not self.drop_dead():
+                    raise
+                continue
+            try:
+                if timeout:
+                    chan.settimeout(timeout)
+                chan.exec_command(command)
+                out = chan.makefile("rb", -1).read()
+                err = chan.makefile_stderr("rb", -1).read().decode(errors="ignore")
+                rc = chan.recv_exit_status()
+                return int(rc), out, err
+            finally:
+                try:
+                    chan.close()
+                except Exception:
+                    pass
+        return 1, b"", "ssh error"
+
+    def close(self) -> None:
+        """Closes every transport (last user released the connection)."""
+        with self._lock:
+            self.closed = True
+            clients, self._clients = self._clients, []
+        for c in clients:
+            try:
+                c.close()
+            except Exception:
+                pass
+
+
+class SSHConnectionPool:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._conns: Dict[Tuple[Any, ...], PooledConnection] = {}
+
+    def acquire(
+        self,
+        host: str,
+        port: int,
+        username: Optional[str],
+        password: Optional[str],
+        identity: Optional[str],
+        timeout: float = 10.0,
+    ) -> PooledConnection:
+        """Returns the shared connection for these credentials (lazy connect)."""
+        key = (host, int(port), username or None, password or None, identity or None)
+        with self._lock:
+            conn = self._conns.get(key)
+            if conn is None or conn.closed:
+                conn = PooledConnection(key, host, int(port), username or None, password or None, identity or None, timeout)
+                self._conns[key] = conn
+            conn.refs += 1
+            return conn
+
+    def release(self, conn: Optional[PooledConnection]) -> None:
+        if conn is None:
+            return
+        with self._lock:
+            conn.refs -= 1
+            if conn.refs > 0:
+                return
+            if self._conns.get(conn.key) is conn:
+                del self._conns[conn.key]
+        conn.close()
+
+    def close_all(self) -> None:
+        with self._lock:
+            conns = list(self._conns.values())
+            self._conns.clear()
+        for c in conns:
+            c.close()
+
+
+POOL = SSHConnectionPool()
+
+
+def acquire(host: str, port: int, username: Optional[str], password: Optional[str], identity: Optional[str], timeout: float = 10.0) -> PooledConnection:
+    return POOL.acquire(host, port, username, password, identity, timeout)
+
+
+def release(conn: Optional[PooledConnection]) -> None:
+    POOL.release(conn)
+
+
+@contextlib.contextmanager
+def lease(host: str, port: int, username: Optional[str], password: Optional[str], identity: Optional[str], timeout: float = 10.0) -> Iterator[PooledConnection]:
+    conn = acquire(host, port, username, password, identity, timeout)
+    try:
+        yield conn
+    finally:
+        release(conn)
@@ -1,14 +1,101 @@
 from __future__ import annotations
 
+import os
+import select
 import shlex
 import subprocess
+import threading
 import time
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 from PyQt6.QtCore import QThread, pyqtSignal
 
-from .nvidia_parser import summarize, GpuInfo, ComputeApp, parse_pmon
+from . import nvml_collector, ssh_pool
+from .ssh_mux import SSHMultiplexer, ssh_base_argv
+from .nvidia_parser import (
+    summarize, GpuInfo, ComputeApp, parse_pmon, parse_ps_pid_user, apps_from_pmon,
+    split_fused_sections, FUSED_MARKER, GpuCsvStreamParser,
+    RecordFramer, parse_collector_record,
+)
+
+GPU_QUERY_CMD = "nvidia-smi --query-gpu=index,name,uuid,utilization.gpu,memory.total,memory.used --format=csv,noheader,nounits"
+APPS_QUERY_CMD = "nvidia-smi --query-compute-apps=gpu_uuid,pid,process_name,used_memory --format=csv,noheader,nounits"
+
+# One remote round trip per poll: every query runs in the same shell and the
+# results come back as `__GPUMGR__ <section>` framed blocks (see
+# nvidia_parser.split_fused_sections). pmon only runs when compute-apps is empty,
+# mirroring the multi-call fallback.
+FUSED_POLL_SCRIPT = (
+    f"M={FUSED_MARKER}; "
+    f"GPUS=$({GPU_QUERY_CMD} 2>&1); RC=$?; "
+    "echo \"$M gpu\"; printf '%s\\n' \"$GPUS\"; echo \"$M gpu_rc\"; echo $RC; "
+    f"APPS=$({APPS_QUERY_CMD} 2>/dev/null); "
+    "echo \"$M apps\"; printf '%s\\n' \"$APPS\"; "
+    "PIDS=$(printf '%s\\n' \"$APPS\" | awk -F', *' '$2 ~ /^[0-9]+$/ {print $2}' | paste -sd, -); "
+    "if [ -z \"$PIDS\" ]; then "
+    "  PMON=$(nvidia-smi pmon -c 1 2>/dev/null); echo \"$M pmon\"; printf '%s\\n' \"$PMON\"; "
+    "  PIDS=$(printf '%s\\n' \"$PMON\" | awk '$1 !~ /^#/ && $2 ~ /^[0-9]+$/ {print $2}' | paste -sd, -); "
+    "fi; "
+    "echo \"$M ps\"; if [ -n \"$PIDS\" ]; then ps -o pid=,user= -p \"$PIDS\" 2>/dev/null; fi; "
+    "echo \"$M end\""
+)
+
+
+class _RemoteStream:
+    """A long-lived remote command whose stdout is consumed incrementally.
+
+    Wraps either a local `ssh` subprocess or a paramiko channel. `read()` returns
+    bytes, b"" at EOF, or None when nothing arrived within the poll timeout so
+    the caller can check its stop flag.
+    """
+
+    def __init__(self, proc: Optional[subprocess.Popen] = None, chan=None, poll_sec: float = 1.0) -> None:
+        self._proc = proc
+        self._chan = chan
+        self._poll = float(poll_sec)
+        if chan is not None:
+            chan.settimeout(self._poll)
+
+    def read(self, n: int = 65536) -> Optional[bytes]:
+        if self._chan is not None:
+            import socket
+            try:
+                return self._chan.recv(n)
+            except socket.timeout:
+                return None
+        assert self._proc is not None and self._proc.stdout is not None
+        fd = self._proc.stdout.fileno()
+        if os.name != "nt":
+            r, _, _ = select.select([fd], [], [], self._poll)
+            if not r:
+                return None
+        return os.read(fd, n)
+
+    def exit_status(self) -> Optional[int]:
+        """Exit status of the remote command once it has ended, else None."""
+        if self._chan is not None:
+            try:
+                return self._chan.recv_exit_status() if self._chan.exit_status_ready() else None
+            except Exception:
+                return None
+        return self._proc.returncode if self._proc is not None else None
+
+    def close(self) -> None:
+        if self._chan is not None:
+            try:
+                self._chan.close()
+            except Exception:
+                pass
+        if self._proc is not None:
+            try:
+                self._proc.terminate()
+                self._proc.wait(timeout=2)
+            except Exception:
+                try:
+                    self._proc.kill()
+                except Exception:
+                    pass
 
 
 @dataclass
@@ -21,6 +108,106 @@ class Snapshot:
     pid_user_map: Dict[int, str] = None  # pid -> user (filled when available)
 
 
+def snapshot_from_fused_output(rc: int, out: str, err: str) -> Snapshot:
+    """Builds a Snapshot from one run of FUSED_POLL_SCRIPT (rc/stdout/stderr)."""
+    errors: List[str] = []
+    sections = split_fused_sections(out)
+    if "gpu" not in sections:
+        # Nothing framed came back (connect failure, timeout, odd shell)
+        errors.append(err.strip() or f"gpu query failed rc={rc}")
+        return Snapshot(time.time(), [], [], {}, errors, {})
+    if "end" not in sections:
+        errors.append(err.strip() or "poll output truncated")
+    out_gpus = sections.get("gpu", "")
+    try:
+        gpu_rc = int((sections.get("gpu_rc") or "0").strip() or 0)
+    except ValueError:
+        gpu_rc = 0
+    if gpu_rc != 0:
+        # nvidia-smi output (merged with stderr) is the most useful message
+        errors.append(out_gpus.strip() or f"gpu query failed rc={gpu_rc}")
+        out_gpus = ""
+    out_apps = sections.get("apps", "")
+    out_ps = sections.get("ps", "")
+    pid_user_map = parse_ps_pid_user(out_ps) if out_ps else {}
+    gpus, apps, user_totals = summarize(out_gpus, out_apps, out_ps)
+    if not apps:
+        pmon_rows = parse_pmon(sections.get("pmon", ""))
+        if pmon_rows:
+            apps, user_totals = apps_from_pmon(pmon_rows, gpus, pid_user_map)
+    return Snapshot(time.time(), gpus, apps, user_totals, errors, pid_user_map)
+
+
+class PollSchedule:
+    """Decides how long the poller waits before the next full poll.
+
+    Polls every `fast_sec` while utilisation/memory/processes are moving (or
+    for `boost_sec` after `boost()`, e.g. right after a run is launched), then
+    doubles the wait on every unchanged poll up to `idle_max_sec`. While the
+    monitor is not visible only a heartbeat every `heartbeat_sec` is kept
+    (a boost still applies while hidden).
+    With `adaptive=False` the wait is always `base_sec` (old behaviour).
+    """
+
+    # Smallest deltas that count as "changed"
+    UTIL_DELTA = 3
+    MEM_DELTA_MIB = 64
+
+    def __init__(
+        self,
+        base_sec: float = 5.0,
+        fast_sec: float = 0.5,
+        idle_max_sec: float = 60.0,
+        heartbeat_sec: float = 60.0,
+        boost_sec: float = 30.0,
+        adaptive: bool = True,
+    ) -> None:
+        self.base = max(0.1, float(base_sec))
+        self.fast = max(0.1, min(float(fast_sec), self.base))
+        self.idle_max = max(self.base, float(idle_max_sec))
+        self.heartbeat = max(self.base, float(heartbeat_sec))
+        self.boost_sec = float(boost_sec)
+        self.adaptive = bool(adaptive)
+        self.visible = True
+        self._cur = self.base
+        self._boost_until = 0.0
+        self._last: Optional[Tuple[Dict[int, Tuple[int, int]], frozenset]] = None
+
+    def boost(self, seconds: Optional[float] = None) -> None:
+        self._boost_until = time.time() + (self.boost_sec if seconds is None else float(seconds))
+        self._cur = self.fast
+
+    def observe(self, snap: "Snapshot") -> bool:
+        """Records a full snapshot; returns True if it differs from the last one."""
+        cur = ({g.index: (g.util_percent, g.mem_used_mib) for g in snap.gpus}, frozenset(a.pid for a in snap.apps))
+        prev, self._last = self._last, cur
+        if snap.raw_errors or prev is None:
+            changed = prev is None
+        elif cur[1] != prev[1] or cur[0].keys() != prev[0].keys():
+            changed = True
+        else:
+            changed = any(
+                abs(u - prev[0][i][0]) >= self.UTIL_DELTA or abs(m - prev[0][i][1]) >= self.MEM_DELTA_MIB
+                for i, (u, m) in cur[0].items()
+            )
+        if changed:
+            self._cur = self.fast
+        else:
+            self._cur = min(self.idle_max, max(self.fast, self._cur * 2.0))
+        return changed
+
+    def delay(self, now: Optional[float] = None) -> float:
+        if not self.adaptive:
+            return self.base
+        # A boost (run just launched, usually from the Runner tab) wins over
+        # the hidden-monitor heartbeat, or it would never take effect
+        if (now if now is not None else time.time()) < self._boost_until:
+            return self.fast
+        if not self.visible:
+            return self.heartbeat
+        return self._cur
+
+
 class SSHGpuPoller(QThread):
     """Worker thread that polls a remote server via ssh to fetch GPU metrics.
 
@@ -28,6 +215,18 @@ class SSHGpuPoller(QThread):
       - "ssh" subprocess mode (default): uses local ssh binary, BatchMode.
       - "paramiko" mode: used when a password is provided; maintains a persistent
         SSH connection and runs commands via exec_command.
+
+    With `stream_ms > 0` utilisation/memory come from one long-lived
+    `nvidia-smi --loop-ms` process instead of a new nvidia-smi per cycle;
+    processes/users are still refreshed by a full poll on the PollSchedule.
+
+    Polls are paced by a PollSchedule: fast while values move or after
+    `boost()`, backing off when idle, and heartbeat-only after
+    `set_visible(False)`. Streams are closed while hidden.
+
+    With `collector="nvml"` a small Python script (see nvml_collector) keeps an
+    NVML handle open on the server and streams framed JSON records, which also
+    carry power, temperature, SM clock and PCIe throughput.
     """
 
     snapshot_ready = pyqtSignal(object)  # emits Snapshot
@@ -43,6 +242,11 @@ class SSHGpuPoller(QThread):
         interval_sec: float = 5.0,
         ssh_bin: str = "ssh",
         timeout_sec: float = 8.0,
+        fused: bool = True,
+        mux: Optional[SSHMultiplexer] = None,
+        stream_ms: int = 0,
+        collector: str = "csv",
+        adaptive: bool = True,
     ) -> None:
         super().__init__()
         self._host = host
@@ -54,25 +258,59 @@ class SSHGpuPoller(QThread):
         self._ssh_bin = ssh_bin
         self._timeout = float(timeout_sec)
         self._stop = False
-        self._pmk_client = None
+        self._pmk_conn: Optional[ssh_pool.PooledConnection] = None
         self._use_paramiko = password is not None
+        # Fused mode: one remote script per cycle instead of up to five calls
+        self._fused = bool(fused)
+        # Shared ControlMaster owned by MainWindow (subprocess mode only)
+        self._mux = mux
+        # Streaming mode (nvidia-smi --loop-ms); 0 disables
+        self._stream_ms = max(0, int(stream_ms or 0))
+        self._stream: Optional[_RemoteStream] = None
+        self._stream_lock = threading.Lock()
+        # "nvml": remote pynvml collector (falls back to CSV when unavailable)
+        self._collector = (collector or "csv").lower()
+        self._schedule = PollSchedule(self._interval, adaptive=adaptive)
+        # Set to cut a wait short (stop, boost, becoming visible)
+        self._wake = threading.Event()
+
+    def set_visible(self, visible: bool) -> None:
+        """Called from the GUI when the monitor is shown/hidden or minimised."""
+        visible = bool(visible)
+        if visible == self._schedule.visible:
+            return
+        self._schedule.visible = visible
+        if visible:
+            self._schedule.boost(self._schedule.fast * 4)
+            self._wake.set()
+            return
+        # Hidden: end any stream now; the run loop drops to heartbeat polls
+        with self._stream_lock:
+            if self._stream is not None:
+                self._stream.close()
+
+    def boost(self, seconds: Optional[float] = None) -> None:
+        """Poll fast for a while, e.g. right after launching a run."""
+        self._schedule.boost(seconds)
+        self._wake.set()
 
     def stop(self) -> None:
         self._stop = True
+        self._wake.set()
+        # Unblock a streaming read immediately
+        with self._stream_lock:
+            if self._stream is not None:
+                self._stream.close()
 
     # Internal helpers -----------------------------------------------------
     def _ssh_base(self) -> List[str]:
-        dest = f"{self._username}@{self._host}" if self._username else self._host
-        cmd = [self._ssh_bin, "-p", str(self._port), "-o", "BatchMode=yes", "-o", "ConnectTimeout=5"]
-        if self._identity:
-            cmd += ["-i", self._identity]
-        cmd.append(dest)
-        return cmd
+        return ssh_base_argv(self._host, self._port, self._username, self._identity, self._ssh_bin, self._mux)
 
     def _run_remote(self, remote_cmd: str) -> Tuple[int, str, str]:
         if self._use_paramiko:
             return self._pmk_run(remote_cmd)
-        cmd = self._ssh_base() + ["--", "bash", "-lc", remote_cmd]
+        # ssh joins argv into one string for the remote shell; quote the script
+        cmd = self._ssh_base() + ["--", "bash", "-lc", shlex.quote(remote_cmd)]
         try:
             p = subprocess.run(
                 cmd,
@@ -80,6 +318,8 @@ class SSHGpuPoller(QThread):
                 text=True,
                 timeout=self._timeout,
             )
+            if p.returncode == 255 and self._mux is not None:
+                self._mux.invalidate()  # ssh itself failed; master may be gone
             return p.returncode, p.stdout, p.stderr
         except subprocess.TimeoutExpired:
             return 124, "", "ssh command timed out"
@@ -89,76 +329,63 @@ class SSHGpuPoller(QThread):
     # Paramiko helpers ----------------------------------------------------
     def _pmk_connect(self) -> Optional[str]:
         try:
-            import paramiko  # type: ignore
-        except Exception:
-            return "paramiko not installed; please pip install paramiko"
-        try:
-            client = paramiko.SSHClient()
-            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            client.connect(
-                hostname=self._host,
-                port=self._port,
-                username=self._username,
-                password=self._password,
-                key_filename=self._identity,
-                timeout=self._timeout,
-                banner_timeout=max(self._timeout, 10.0),
-                auth_timeout=max(self._timeout, 10.0),
-                allow_agent=True,
-                look_for_keys=True,
-            )
-            self._pmk_client = client
-            return None
+            if self._pmk_conn is None:
+                self._pmk_conn = ssh_pool.acquire(
+                    self._host, self._port, self._username, self._password, self._identity,
+                    timeout=self._timeout,
+                )
+            err = self._pmk_conn.ensure_connected()
         except Exception as e:  # noqa: BLE001
-            self._pmk_client = None
-            msg = str(e)
-            if "Error reading SSH protocol banner" in msg:
-                msg += \
-                    "; tip: check host/port, firewall, or increase banner timeout; " \
-                    "verify the server runs SSH on this port"
-            return msg
+            err = str(e)
+        if err and "Error reading SSH protocol banner" in err:
+            err += \
+                "; tip: check host/port, firewall, or increase banner timeout; " \
+                "verify the server runs SSH on this port"
+        return err
+
+    def _pmk_release(self) -> None:
+        conn, self._pmk_conn = self._pmk_conn, None
+        ssh_pool.release(conn)
 
     def _pmk_run(self, remote_cmd: str) -> Tuple[int, str, str]:
-        if self._pmk_client is None:
-            err = self._pmk_connect()
-            if err:
-                return 1, "", err
+        err = self._pmk_connect()
+        if err:
+            return 1, "", err
+        # Run with bash -lc to get login-shell semantics
+        cmd = f"bash -lc {shlex.quote(remote_cmd)}"
         try:
-            # Run with bash -lc to get login-shell semantics
-            cmd = f"bash -lc {shlex.quote(remote_cmd)}"
-            stdin, stdout, stderr = self._pmk_client.exec_command(cmd, timeout=self._timeout)  # type: ignore[union-attr]
-            out = stdout.read().decode(errors="ignore")
-            err_s = stderr.read().decode(errors="ignore")
-            rc = stdout.channel.recv_exit_status()  # type: ignore[attr-defined]
-            return rc, out, err_s
+            return self._pmk_conn.exec_command(cmd, timeout=self._timeout)  # type: ignore[union-attr]
         except Exception as e:  # noqa: BLE001
-            # Try reconnect once on failure
+            # Retry once if the transport died; a timeout or session limit
+            # fails this poll only (other jobs share the transport)
+            if not self._pmk_conn.drop_dead():  # type: ignore[union-attr]
+                return 1, "", f"ssh error: {e}"
             err = self._pmk_connect()
             if err:
                 return 1, "", f"reconnect failed: {err}"
             try:
-                cmd = f"bash -lc {shlex.quote(remote_cmd)}"
-                stdin, stdout, stderr = self._pmk_client.exec_command(cmd, timeout=self._timeout)  # type: ignore[union-attr]
-                out = stdout.read().decode(errors="ignore")
-                err_s = stderr.read().decode(errors="ignore")
-                rc = stdout.channel.recv_exit_status()  # type: ignore[attr-defined]
-                return rc, out, err_s
+                return self._pmk_conn.exec_command(cmd, timeout=self._timeout)  # type: ignore[union-attr]
             except Exception as e2:  # noqa: BLE001
                 return 1, "", f"ssh error: {e2}"
 
     def _fetch_cycle(self) -> Snapshot:
+        if self._fused:
+            return self._fetch_cycle_fused()
+        return self._fetch_cycle_multi()
+
+    def _fetch_cycle_fused(self) -> Snapshot:
+        rc, out, err = self._run_remote(FUSED_POLL_SCRIPT)
+        return snapshot_from_fused_output(rc, out, err)
+
+    def _fetch_cycle_multi(self) -> Snapshot:
         errors: List[str] = []
 
-        rc1, out_gpus, err1 = self._run_remote(
-            "nvidia-smi --query-gpu=index,name,uuid,utilization.gpu,memory.total,memory.used --format=csv,noheader,nounits"
-        )
+        rc1, out_gpus, err1 = self._run_remote(GPU_QUERY_CMD)
         if rc1 != 0:
             errors.append(err1.strip() or f"gpu query failed rc={rc1}")
             # Keep going; out_gpus may be empty.
 
-        rc2, out_apps, err2 = self._run_remote(
-            "nvidia-smi --query-compute-apps=gpu_uuid,pid,process_name,used_memory --format=csv,noheader,nounits || true"
-        )
+        rc2, out_apps, err2 = self._run_remote(APPS_QUERY_CMD + " || true")
         if rc2 != 0 and err2:
             errors.append(err2.strip())
 
@@ -182,8 +409,7 @@ class SSHGpuPoller(QThread):
             if rc3 != 0 and err3:
                 errors.append(err3.strip())
         if out_ps:
-            from .nvidia_parser import parse_ps_pid_user as _parse_ps
-            pid_user_map.update(_parse_ps(out_ps))
+            pid_user_map.update(parse_ps_pid_user(out_ps))
 
         gpus, apps, user_totals = summarize(out_gpus, out_apps, out_ps)
 
@@ -194,9 +420,6 @@ class SSHGpuPoller(QThread):
                 errors.append(err4.strip())
             pmon_rows = parse_pmon(out_pmon)
             if pmon_rows:
-                # Build pid->user and user totals from pmon
-                # Prepare uuid map by index
-                idx_to_uuid = {gi.index: gi.uuid for gi in summarize(out_gpus, "", "")[0]}
                 # Collect pids for ps (again, as pmon may include more pids)
                 pids2 = [str(pid) for (_, pid, _, _) in pmon_rows]
                 out_ps2 = ""
@@ -205,18 +428,8 @@ class SSHGpuPoller(QThread):
                     rc5, out_ps2, err5 = self._run_remote(f"ps -o pid=,user= -p {pid_arg2}")
                     if rc5 != 0 and err5:
                         errors.append(err5.strip())
-                pid_map2 = {}
-                # Merge maps: prefer new mapping, fallback to previous mapping
-                from .nvidia_parser import parse_ps_pid_user
                 pid_map2 = parse_ps_pid_user(out_ps2)
-                # Build ComputeApp list and user totals
-                apps = []
-                user_totals = {}
-                for gpu_idx, pid, proc_name, fb_mib in pmon_rows:
-                    uuid = idx_to_uuid.get(gpu_idx, str(gpu_idx))
-                    apps.append(ComputeApp(gpu_uuid=uuid, pid=pid, process_name=proc_name, used_memory_mib=fb_mib))
-                    user = pid_map2.get(pid, "unknown")
-                    user_totals[user] = user_totals.get(user, 0) + max(0, fb_mib)
+                apps, user_totals = apps_from_pmon(pmon_rows, gpus, pid_map2)
                 pid_user_map = pid_map2
         # Ensure map exists
         pid_user_map = pid_user_map or {}
@@ -227,6 +440,172 @@ class SSHGpuPoller(QThread):
             pass
         return snap
 
+    # Streaming -------------------------------------------------------------
+    def _open_stream(self, remote_cmd: str) -> Optional[_RemoteStream]:
+        if self._use_paramiko:
+            err = self._pmk_connect()
+            if err:
+                self.error_msg.emit(err)
+                return None
+            try:
+                chan = self._pmk_conn.open_session()  # type: ignore[union-attr]
+                chan.exec_command(f"bash -lc {shlex.quote(remote_cmd)}")
+                return _RemoteStream(chan=chan)
+            except Exception as e:  # noqa: BLE001
+                self.error_msg.emit(f"stream open failed: {e}")
+                return None
+        cmd = self._ssh_base() + ["--", "bash", "-lc", shlex.quote(remote_cmd)]
+        try:
+            proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+            return _RemoteStream(proc=proc)
+        except Exception as e:  # noqa: BLE001
+            self.error_msg.emit(f"stream open failed: {e}")
+            return None
+
+    def _emit(self, snap: Snapshot) -> None:
+        if snap.raw_errors:
+            self.error_msg.emit("; ".join(snap.raw_errors))
+        self.snapshot_ready.emit(snap)
+
+    def _should_stop(self) -> bool:
+        return self._stop or self.isInterruptionRequested()
+
+    def _wait(self, seconds: float) -> None:
+        """Sleeps up to `seconds`, returning early on stop/boost/visibility change."""
+        if seconds > 0 and not self._should_stop():
+            self._wake.wait(seconds)
+        self._wake.clear()
+
+    def _poll_once(self) -> Snapshot:
+        snap = self._fetch_cycle()
+        self._schedule.observe(snap)
+        self._emit(snap)
+        return snap
+
+    def _heartbeat_while_hidden(self) -> None:
+        """Plain slow polls while the monitor is hidden (fast during a boost;
+        no stream kept open)."""
+        while not self._should_stop() and not self._schedule.visible:
+            self._wait(self._schedule.delay())
+            if self._should_stop() or self._schedule.visible:
+                break
+            self._poll_once()
+
+    def _pump(self, stream: _RemoteStream, on_chunk: Callable[[bytes], bool]) -> None:
+        """Feeds stream output to `on_chunk` until EOF, stop, or on_chunk
+        returning False; always closes the stream."""
+        with self._stream_lock:
+            self._stream = stream
+        try:
+            while not self._should_stop():
+                chunk = stream.read()
+                if chunk is None:
+                    continue
+                if not chunk or not on_chunk(chunk):
+                    break  # remote side ended / consumer is done
+        finally:
+            with self._stream_lock:
+                self._stream = None
+            stream.close()
+
+    def _run_streaming(self) -> bool:
+        """Streams samples until stopped. Returns False if streaming is not
+        possible so the caller can fall back to polling."""
+        full = self._poll_once()
+        last_full = time.time()
+        remote_cmd = f"exec {GPU_QUERY_CMD} --loop-ms={self._stream_ms}"
+        failures = 0
+        while not self._should_stop():
+            if not self._schedule.visible:
+                self._heartbeat_while_hidden()
+                continue
+            stream = self._open_stream(remote_cmd)
+            if stream is None:
+                return False
+            got_frame = False
+            parser = GpuCsvStreamParser(expected=len(full.gpus))
+
+            def on_chunk(chunk: bytes) -> bool:
+                nonlocal full, last_full, got_frame
+                if not self._schedule.visible:
+                    return False  # hidden: drop the stream, heartbeat instead
+                for frame in parser.feed(chunk.decode(errors="ignore")):
+                    got_frame = True
+                    now = time.time()
+                    if now - last_full >= max(self._interval, self._schedule.delay(now)):
+                        # Processes/users change slowly; refresh them on the
+                        # schedule but never faster than the configured interval
+                        # (the stream already gives fast util/memory)
+                        full = self._poll_once()
+                        last_full = now
+                        parser.expected = len(full.gpus)
+                        continue
+                    self._emit(Snapshot(now, frame, full.apps, full.user_vram_mib, [], full.pid_user_map))
+                return True
+
+            self._pump(stream, on_chunk)
+            if self._should_stop():
+                break
+            if not self._schedule.visible:
+                continue
+            failures = 0 if got_frame else failures + 1
+            if failures >= 3:
+                # nvidia-smi without --loop-ms support, or the stream keeps dying
+                self.error_msg.emit("GPU stream ended repeatedly; falling back to polling")
+                return False
+            self._wait(min(5.0, 0.5 * (failures + 1)))
+        return True
+
+    def _run_collector(self) -> bool:
+        """Runs the NVML collector until stopped. Returns False (after telling
+        the user why) when it cannot be used, e.g. pynvml is not installed."""
+        period_ms = self._stream_ms or int(self._interval * 1000)
+        remote_cmd = nvml_collector.remote_command(period_ms)
+        failures = 0
+        while not self._should_stop():
+            if not self._schedule.visible:
+                self._heartbeat_while_hidden()
+                continue
+            stream = self._open_stream(remote_cmd)
+            if stream is None:
+                return False
+            framer = RecordFramer()
+            got_sample = False
+            unusable: List[str] = []
+
+            def on_chunk(chunk: bytes) -> bool:
+                nonlocal got_sample
+                if not self._schedule.visible:
+                    return False
+                for rec in framer.feed(chunk):
+                    if rec.get("type") == "error":
+                        unusable.append(str(rec.get("error") or "collector error"))
+                        return False
+                    if rec.get("type") != "sample":
+                        continue
+                    got_sample = True
+                    gpus, apps, pid_user, totals = parse_collector_record(rec)
+                    self._emit(Snapshot(float(rec.get("t") or time.time()), gpus, apps, totals, [], pid_user))
+                return True
+
+            self._pump(stream, on_chunk)
+            if self._should_stop():
+                break
+            if not unusable and stream.exit_status() == nvml_collector.EXIT_NO_NVML:
+                unusable.append("NVML not available")
+            if not self._schedule.visible and not unusable:
+                continue
+            if unusable or not got_sample:
+                failures += 1
+            else:
+                failures = 0
+            if unusable or failures >= 3:
+                why = unusable[0] if unusable else "no python3 on the server?"
+                self.error_msg.emit(f"NVML collector unavailable ({why}); using nvidia-smi")
+                return False
+            self._wait(min(5.0, 0.5 * (failures + 1)))
+        return True
+
     # QThread --------------------------------------------------------------
     def run(self) -> None:  # noqa: D401 - QThread run
         # If paramiko mode, connect once up-front
@@ -234,15 +613,14 @@ class SSHGpuPoller(QThread):
             err = self._pmk_connect()
             if err:
                 self.error_msg.emit(err)
-        while not self._stop and not self.isInterruptionRequested():
-            snap = self._fetch_cycle()
-            if snap.raw_errors:
-                self.error_msg.emit("; ".join(snap.raw_errors))
-            self.snapshot_ready.emit(snap)
-            # Sleep in small steps to react faster to stop
-            slept = 0.0
-            step = 0.1
-            while slept < self._interval and not self._stop and not self.isInterruptionRequested():
-                time.sleep(step)
-                slept += step
+        try:
+            if self._collector == "nvml" and self._run_collector():
+                return
+            if self._stream_ms > 0 and self._run_streaming():
+                return
+            while not self._should_stop():
+                self._poll_once()
+                self._wait(self._schedule.delay())
+        finally:
+            self._pmk_release()
 
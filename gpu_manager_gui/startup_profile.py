@@ -0,0 +1,85 @@
+"""Start-up timing for `--profile-startup`.
+
+Enabled when the flag is on the command line; otherwise every call is a
+no-op. Records named phases (wall time) and, while enabled, the inclusive
+import time of each absolute module imported for the first time, then
+prints a breakdown once the first window has been painted. Our own
+modules import each other relatively and are covered by the phases; the
+import table shows third-party cost (Qt, yaml, paramiko...).
+"""
+
+from __future__ import annotations
+
+import builtins
+import contextlib
+import sys
+import time
+from typing import Dict, Iterator, List, Tuple
+
+FLAG = "--profile-startup"
+
+_enabled = FLAG in sys.argv
+_t0 = time.perf_counter()
+_phases: List[Tuple[str, float, float]] = []  # (label, start offset, duration)
+_imports: Dict[str, float] = {}
+_orig_import = builtins.__import__
+_depth = 0
+_reported = False
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):  # noqa: A002
+    global _depth
+    if level or name in sys.modules:
+        return _orig_import(name, globals, locals, fromlist, level)
+    _depth += 1
+    t = time.perf_counter()
+    try:
+        return _orig_import(name, globals, locals, fromlist, level)
+    finally:
+        _depth -= 1
+        if _depth == 0:
+            # Outermost only: nested imports are already inside this figure
+            _imports[name] = _imports.get(name, 0.0) + (time.perf_counter() - t)
+
+
+if _enabled:
+    builtins.__import__ = _timed_import
+
+
+@contextlib.contextmanager
+def phase(label: str) -> Iterator[None]:
+    if not _enabled:
+        yield
+        return
+    t = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phases.append((label, t - _t0, time.perf_counter() - t))
+        if _reported:
+            # Late phases (lazy pages, pre-warm) print as they happen
+            sys.stderr.write(f"[startup] {label}: {(time.perf_counter() - t) * 1000:.1f} ms\n")
+
+
+def report(stream=None) -> None:
+    """Prints the breakdown (once) and stops timing imports."""
+    global _reported
+    if not _enabled or _reported:
+        return
+    _reported = True
+    builtins.__import__ = _orig_import
+    out = stream or sys.stderr
+    total = time.perf_counter() - _t0
+    out.write(f"[startup] first paint after {total * 1000:.1f} ms\n")
+    for label, start, dur in _phases:
+        out.write(f"[startup]   {label:<32} {dur * 1000:8.1f} ms  (at {start * 1000:.1f} ms)\n")
+    out.write("[startup] slowest imports (inclusive):\n")
+    for name, dur in sorted(_imports.items(), key=lambda kv: kv[1], reverse=True)[:12]:
+        out.write(f"[startup]   {name:<32} {dur * 1000:8.1f} ms\n")
+    lazy = ", ".join(f"{m}={'loaded' if m in sys.modules else 'deferred'}" for m in ("PyQt6.QtCharts", "paramiko"))
+    out.write(f"[startup] {lazy}\n")
+    out.flush()
@@ -0,0 +1,258 @@
+"""Retained-mode table models for the monitor page.
+
+Each poll hands the models plain row tuples; the model diffs them against the
+previous rows and emits `dataChanged` only for the bounding box of cells that
+actually changed (or resets when the row count changes). Views and delegates
+stay alive across polls, so there is no per-poll widget churn.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, QPointF, Qt
+from PyQt6.QtGui import QColor, QPainter, QPen, QPolygonF
+from PyQt6.QtWidgets import QStyle, QStyledItemDelegate
+
+# Extra role carrying raw values for delegates (e.g. (used, total) for Memory)
+ValueRole = Qt.ItemDataRole.UserRole + 1
+# Recent values (0-100) for a delegate sparkline
+SparkRole = Qt.ItemDataRole.UserRole + 2
+
+_CENTER = int(Qt.AlignmentFlag.AlignCenter)
+
+
+class _DiffTableModel(QAbstractTableModel):
+    HEADERS: Sequence[str] = ()
+    # Columns shown centred
+    CENTERED: Sequence[int] = ()
+    # Row tuple field -> column it is shown in (None: field i is column i)
+    FIELD_COL: Optional[Sequence[int]] = None
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._rows: List[Tuple[Any, ...]] = []
+
+    # Qt model API ---------------------------------------------------------
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: B008
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:  # noqa: B008
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            if 0 <= section < len(self.HEADERS):
+                return self.HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        r, c = index.row(), index.column()
+        if r >= len(self._rows):
+            return None
+        row = self._rows[r]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.display(row, c)
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return _CENTER if c in self.CENTERED else None
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return self.tooltip(row, c)
+        if role == ValueRole:
+            return self.value(row, c)
+        if role == SparkRole:
+            return self.spark(row, c)
+        return None
+
+    # Subclass hooks ---------------------------------------------------------
+    def display(self, row: Tuple[Any, ...], col: int) -> Any:
+        return row[col]
+
+    def tooltip(self, row: Tuple[Any, ...], col: int) -> Optional[str]:
+        return None
+
+    def value(self, row: Tuple[Any, ...], col: int) -> Any:
+        return None
+
+    def spark(self, row: Tuple[Any, ...], col: int) -> Any:
+        return None
+
+    # Update -----------------------------------------------------------------
+    def row(self, r: int) -> Optional[Tuple[Any, ...]]:
+        return self._rows[r] if 0 <= r < len(self._rows) else None
+
+    def set_rows(self, rows: List[Tuple[Any, ...]]) -> None:
+        """Replaces the rows, signalling only what changed."""
+        if len(rows) != len(self._rows):
+            self.beginResetModel()
+            self._rows = rows
+            self.endResetModel()
+            return
+        field_col = self.FIELD_COL
+        top = left = None
+        bottom = right = -1
+        for r, (old, new) in enumerate(zip(self._rows, rows)):
+            if old == new:
+                continue
+            for f in range(len(new)):
+                if old[f] != new[f]:
+                    c = field_col[f] if field_col else f
+                    top = r if top is None else top
+                    bottom = r
+                    left = c if left is None else min(left, c)
+                    right = max(right, c)
+        self._rows = rows
+        if top is not None:
+            self.dataChanged.emit(self.index(top, left), self.index(bottom, right))  # type: ignore[arg-type]
+
+
+class GpuTableModel(_DiffTableModel):
+    """Rows: (index, name, util %, mem used MiB, mem total MiB, procs, tooltip,
+    util sparkline tuple)."""
+
+    HEADERS = ("GPU", "Name", "Util %", "Memory", "Procs")
+    CENTERED = (0, 2, 4)
+    FIELD_COL = (0, 1, 2, 3, 3, 4, 1, 2)
+    COL_UTIL = 2
+    COL_MEM = 3
+
+    def display(self, row, col):
+        idx, name, util, used, total, procs = row[:6]
+        if col == 0:
+            return str(idx)
+        if col == 1:
+            return name
+        if col == 2:
+            return f"{util}%"
+        if col == 3:
+            return f"{used} / {total} MiB"
+        if col == 4:
+            return str(procs)
+        return None
+
+    def tooltip(self, row, col):
+        return (row[6] or None) if col == 1 else None
+
+    def value(self, row, col):
+        if col == self.COL_MEM:
+            return (row[3], row[4])
+        if col == self.COL_UTIL:
+            return row[2]
+        return None
+
+    def spark(self, row, col):
+        return row[7] if col == self.COL_UTIL and len(row) > 7 else None
+
+
+class ProcTableModel(_DiffTableModel):
+    """Rows: (pid, user, mem MiB, gpu index, name)."""
+
+    HEADERS = ("PID", "User", "Mem (MiB)", "GPU", "Name")
+    CENTERED = (0, 2, 3)
+
+    def display(self, row, col):
+        v = row[col]
+        return v if isinstance(v, str) else str(v)
+
+
+class BarDelegate(QStyledItemDelegate):
+    """Paints a value as a filled bar straight from model data (no per-cell widgets).
+
+    Look follows the plugin's BarRenderers.kt: flat bar from the left, 1 px
+    border, centred text. The fill colour ramps to amber/red past `thresholds`
+    (percent), and if the model provides SparkRole data a sparkline of recent
+    values (0-100) is drawn over the bar.
+
+    kind="percent": ValueRole is an int 0-100.
+    kind="memory":  ValueRole is (used MiB, total MiB); text is shown in GB.
+    """
+
+    WARN = QColor(251, 140, 0)
+    CRIT = QColor(229, 57, 53)
+    BASE = {"percent": QColor(67, 160, 71), "memory": QColor(30, 136, 229)}
+
+    def __init__(self, kind: str = "percent", thresholds: Tuple[float, float] = (85.0, 95.0), parent=None) -> None:
+        super().__init__(parent)
+        self.kind = kind
+        self.thresholds = thresholds
+        self._base = self.BASE.get(kind, self.BASE["percent"])
+        spark = QColor(self._base).darker(160)
+        spark.setAlpha(200)
+        self._spark_pen = QPen(spark, 1.2)
+
+    def bar_color(self, pct: float) -> QColor:
+        warn, crit = self.thresholds
+        if pct >= crit:
+            return self.CRIT
+        if pct >= warn:
+            return self.WARN
+        return self._base
+
+    def _pct_and_text(self, val: Any) -> Tuple[float, str]:
+        if self.kind == "memory":
+            used, total = val
+            total = max(1, int(total))
+            return max(0.0, min(100.0, used * 100.0 / total)), f"{used / 1024.0:.1f} / {total / 1024.0:.1f} GB"
+        pct = max(0.0, min(100.0, float(val)))
+        return pct, f"{int(pct)}%"
+
+    def paint(self, painter, option, index) -> None:  # type: ignore[override]
+        val = index.data(ValueRole)
+        if val is None:
+            super().paint(painter, option, index)
+            return
+        pct, text = self._pct_and_text(val)
+        rect = option.rect
+        pal = option.palette
+        selected = bool(option.state & QStyle.StateFlag.State_Selected)
+        painter.save()
+        painter.fillRect(rect, pal.highlight() if selected else pal.base())
+        inner = rect.adjusted(1, 1, -1, -1)
+        bw = int(inner.width() * pct / 100.0)
+        if bw > 0:
+            painter.fillRect(inner.x(), inner.y(), bw, inner.height(), self.bar_color(pct))
+        spark = index.data(SparkRole)
+        if spark and len(spark) > 1:
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+            painter.setPen(self._spark_pen)
+            n = len(spark)
+            x0, y0, w, h = inner.x(), inner.y() + 2, inner.width(), max(1, inner.height() - 4)
+            pts = [QPointF(x0 + w * i / (n - 1), y0 + h * (1.0 - max(0.0, min(100.0, v)) / 100.0)) for i, v in enumerate(spark)]
+            painter.drawPolyline(QPolygonF(pts))
+        painter.setPen(pal.mid().color())
+        painter.drawRect(rect.adjusted(0, 0, -1, -1))
+        painter.setPen(pal.highlightedText().color() if selected else pal.text().color())
+        painter.drawText(rect, int(Qt.AlignmentFlag.AlignCenter), text)
+        painter.restore()
+
+    def sizeHint(self, option, index):  # type: ignore[override]
+        hint = super().sizeHint(option, index)
+        val = index.data(ValueRole)
+        if val is None:
+            return hint
+        _, text = self._pct_and_text(val)
+        fm = option.fontMetrics
+        hint.setWidth(max(hint.width(), fm.horizontalAdvance(text) + (32 if self.kind == "memory" else 24)))
+        hint.setHeight(max(hint.height(), fm.height() + 6))
+        return hint
+
+
+def pie_slices(gpus, user_vram_mib: Dict[str, int]) -> List[Tuple[str, str, float]]:
+    """(key, label, value) slices for the per-user VRAM pie, largest user first."""
+    base_total = sum(max(0, g.mem_total_mib) for g in gpus)
+    used_total = sum(max(0, g.mem_used_mib) for g in gpus)
+    user_totals = dict(user_vram_mib)
+    used_by_users = sum(max(0, v) for v in user_totals.values())
+    system_other = max(0.0, float(used_total) - float(used_by_users))
+    free_rest = max(0.0, float(base_total) - float(used_total))
+    out: List[Tuple[str, str, float]] = []
+    for user, mib in sorted(user_totals.items(), key=lambda kv: kv[1], reverse=True):
+        out.append(("user:" + user, f"{user} ({int(mib)} MiB)", max(0.01, float(mib))))
+    if system_other > 0.5:
+        out.append(("system", f"system/other ({int(system_other)} MiB)", system_other))
+    if base_total <= 0:
+        out.append(("idle", "idle", 1.0))
+    elif free_rest > 0.5:
+        out.append(("free", f"free ({int(free_rest)} MiB)", free_rest))
+    return out
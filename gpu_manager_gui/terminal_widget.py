@@ -1,57 +1,110 @@
 from __future__ import annotations
 
-import math
-import re
-from typing import Optional
+import sys
+import time
+from bisect import bisect_left, bisect_right
+from itertools import groupby
+from typing import List, Optional, Tuple
 
-from PyQt6.QtCore import Qt, QEvent, QTimer
-from PyQt6.QtGui import QKeyEvent, QTextCursor, QPainter
-from PyQt6.QtWidgets import QPlainTextEdit
+from PyQt6.QtCore import Qt, QEvent, QPoint, QRect, QTimer
+from PyQt6.QtGui import QColor, QFont, QFontDatabase, QGuiApplication, QKeyEvent, QPainter
+from PyQt6.QtWidgets import QAbstractScrollArea, QFrame, QHBoxLayout, QLabel, QLineEdit, QMenu, QToolButton
 
+from .scrollback import MAX_MATCHES, cell_col
 
-class TerminalWidget(QPlainTextEdit):
-    """Lightweight interactive terminal view.
+from .vt_screen import (
+    BOLD, CONCEAL, DEFAULT_COLOR, DIM, ITALIC, REVERSE, STRIKE, UNDERLINE,
+    Line, Screen, attr_bg, attr_fg,
+)
 
-    Goals: a near-native shell experience good enough for everyday SSH usage
-    (readline editing, colors stripped, carriage-return progress bars, line
-    clearing). Full TUI apps (vim, top) require a full VT emulator and are
-    not in scope here.
+# xterm's 16 base colours; 16-231 are the 6x6x6 cube, 232-255 the grey ramp
+_BASE16 = [
+    (0, 0, 0), (205, 0, 0), (0, 205, 0), (205, 205, 0), (0, 0, 238), (205, 0, 205), (0, 205, 205), (229, 229, 229),
+    (127, 127, 127), (255, 0, 0), (0, 255, 0), (255, 255, 0), (92, 92, 255), (255, 0, 255), (0, 255, 255), (255, 255, 255),
+]
 
-    - Read-only from the editor perspective; all keyboard input is forwarded
-      to the attached shell via `write()`.
-    - Handles a small subset of VT100 controls: CR, LF, BS, ESC[K], ESC[2J],
-      and strips color CSI sequences (ESC[...m).
-    - Maps common keys to terminal sequences (arrows, Home/End, PgUp/PgDn,
-      Delete, Ctrl-C/D/Z/L, etc.). Supports paste.
+
+def _xterm_palette() -> List[QColor]:
+    out = [QColor(*rgb) for rgb in _BASE16]
+    steps = [0, 95, 135, 175, 215, 255]
+    for r in steps:
+        for g in steps:
+            for b in steps:
+                out.append(QColor(r, g, b))
+    for i in range(24):
+        v = 8 + 10 * i
+        out.append(QColor(v, v, v))
+    return out
+
+
+class TerminalWidget(QAbstractScrollArea):
+    """Interactive terminal view backed by a vt_screen.Screen.
+
+    Output is interpreted by the VT/xterm emulator (cursor addressing, scroll
+    regions, alternate screen, colours), so full-screen programs such as
+    htop, nvtop, vim and tmux work. The widget paints the cell grid itself
+    and only repaints rows the emulator marks dirty.
+
+    - All keyboard input is forwarded to the attached shell via `write()`
+      (application cursor keys and bracketed paste are honoured).
+    - Lines scrolled off the top are kept (100k, compact scrollback store)
+      and reachable with the scroll bar / wheel; only visible rows are
+      painted. Ctrl+Shift+F searches the whole scrollback; mouse selection
+      + Ctrl+Shift+C copies, Ctrl+Shift+V (or the context menu) pastes.
     - Resizes the remote PTY when the widget resizes.
+
+    Shell output is pulled (`take_output()`) at most once per frame, so a
+    flood of output costs one parse and one repaint per ~16 ms; each frame
+    interprets at most FRAME_BUDGET characters and leaves the rest for the
+    next one so input and painting stay responsive.
     """
 
+    HISTORY_LINES = 100000
+    FRAME_MS = 16
+    FRAME_BUDGET = 64 * 1024
+    # False until __init__ finishes; Qt delivers events (FontChange,
+    # Resize) while the widget is still being built
+    _ready = False
+
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
-        # Display settings
-        self.setReadOnly(True)
-        try:
-            # No wrapping for terminal-like look
-            self.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
-        except Exception:
-            pass
-        # Keep at most 1000 lines (blocks) to bound memory usage
-        try:
-            self.setMaximumBlockCount(1000)
-        except Exception:
-            pass
-        self.setUndoRedoEnabled(False)
-        self.setCursorWidth(0)  # hide Qt cursor; we draw our own blinking caret
-        # Keep a simple last-line buffer and column position to implement CR/EL
-        self._line_buf: str = ""
-        self._col: int = 0
+        # Named _screen: `screen` would shadow QWidget.screen()
+        self._screen = Screen(80, 24, history=self.HISTORY_LINES)
+        font = QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont)
+        self.setFont(font)
+        self._bold_font = QFont(font)
+        self._bold_font.setBold(True)
+        self._palette256 = _xterm_palette()
+        self._update_metrics()
         # Attached shell (must expose write(), send_line(), and optional resize_pty())
         self._shell = None
-        # Pre-compiled regex for minimal ANSI filtering
-        self._re_csi_color = re.compile(r"\x1b\[[0-9;]*m")
-        self._re_osc = re.compile(r"\x1b\].*?(\x07|\x1b\\)")
-        self._re_bracketed = re.compile(r"\x1b\[\?2004[hl]")
-        self._pending_scroll_to_end = False
+        # Lines scrolled back from the live screen (0 = following output)
+        self._scroll_back = 0
+        # Selection in absolute line coordinates: (line, col) anchor/end
+        self._sel: Optional[Tuple[Tuple[int, int], Tuple[int, int]]] = None
+        self._selecting = False
+        # Row the caret was last painted on (repainted when it moves away)
+        self._last_cursor_row = 0
+        # Output pulled from the shell but not yet interpreted
+        self._backlog = ""
+        # Optional callable(str) that sees all shell output, before coalescing
+        # (log_metrics taps consoles this way)
+        self.output_tap = None
+        self._last_frame = 0.0
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.timeout.connect(self._on_frame)
+        # Find bar state: matches are (line id, column), oldest first
+        self._find_bar: Optional[_FindBar] = None
+        self._find_query = ""
+        self._find_hist: List[Tuple[int, int]] = []
+        self._find_scanned = 0
+        self._find_matches: List[Tuple[int, int]] = []
+        self._find_cur: Optional[Tuple[int, int]] = None
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.verticalScrollBar().valueChanged.connect(self._on_scrollbar)
+        self.viewport().setCursor(Qt.CursorShape.IBeamCursor)
+        self.viewport().setAutoFillBackground(False)
         # Blinking caret state
         self._blink_timer = QTimer(self)
         self._blink_timer.setInterval(530)
@@ -59,6 +112,13 @@ class TerminalWidget(QPlainTextEdit):
         self._cursor_on = True
         # Ensure focus to capture keys
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        self._ready = True
+
+    def _update_metrics(self) -> None:
+        fm = self.fontMetrics()
+        self._cw = max(1, fm.horizontalAdvance("M"))
+        self._ch = max(1, fm.height())
+        self._ascent = fm.ascent()
 
     # Shell attachment ---------------------------------------------------
     def attach_shell(self, shell) -> None:
@@ -68,181 +128,367 @@ class TerminalWidget(QPlainTextEdit):
         resize_pty(cols, rows).
         """
         self._shell = shell
+        try:
+            shell.output_ready.connect(self._schedule_frame)
+        except Exception:
+            pass
         # Initial resize once connected (do a later event to be safe)
         self._send_resize()
 
     def detach_shell(self) -> None:
-        self._shell = None
+        shell, self._shell = self._shell, None
+        if shell is None:
+            return
+        try:
+            shell.output_ready.disconnect(self._schedule_frame)
+        except Exception:
+            pass
+        # Show whatever arrived before the shell closed
+        self._take_shell_output(shell)
+        while self._backlog:
+            self._on_frame()
+        self.output_tap = None
+
+    def _take_shell_output(self, shell) -> bool:
+        try:
+            text = shell.take_output()
+        except Exception:
+            return False
+        if text and self.output_tap is not None:
+            try:
+                self.output_tap(text)
+            except Exception:
+                pass
+        self._backlog += text
+        return bool(text)
+
+    def _schedule_frame(self) -> None:
+        if self._frame_timer.isActive():
+            return
+        wait = self.FRAME_MS - (time.monotonic() - self._last_frame) * 1000.0
+        self._frame_timer.start(max(0, int(wait)))
+
+    def _on_frame(self) -> None:
+        if self._shell is not None:
+            self._take_shell_output(self._shell)
+        if not self._backlog:
+            return
+        pushed = self._screen.history_pushed
+        text = self._screen.coalesce(self._backlog)
+        if len(text) > self.FRAME_BUDGET:
+            cut = text.rfind("\n", 0, self.FRAME_BUDGET) + 1 or self.FRAME_BUDGET
+            text, self._backlog = text[:cut], text[cut:]
+        else:
+            self._backlog = ""
+        self._render(text, pushed)
+        self._last_frame = time.monotonic()
+        if self._backlog:
+            self._schedule_frame()
 
     # Output rendering ---------------------------------------------------
     def feed(self, data: str) -> None:
-        """Render incoming terminal data with minimal VT handling."""
-        if not data:
+        """Interpret terminal output and repaint the rows it changed."""
+        if data:
+            self._render(data, self._screen.history_pushed)
+
+    def queue_output(self, data: str) -> None:
+        """Like feed(), but rendered by the frame loop within its budget."""
+        if data:
+            self._backlog += data
+            self._schedule_frame()
+
+    def _render(self, data: str, pushed: int) -> None:
+        # `pushed`: history_pushed before this batch (coalesce may push too)
+        scr = self._screen
+        scr.feed(data)
+        replies = scr.take_replies()
+        if replies and self._shell is not None:
+            try:
+                self._shell.write(replies)
+            except Exception:
+                pass
+        grew = scr.history_pushed - pushed
+        if scr.alt_active:
+            self._scroll_back = 0
+        elif grew and self._scroll_back:
+            # Keep the scrolled-back view on the same text
+            self._scroll_back = min(len(scr.history), self._scroll_back + grew)
+        self._sync_scrollbar()
+        dirty = scr.take_dirty()
+        if self._scroll_back or grew or len(dirty) > scr.rows // 2:
+            self._last_cursor_row = scr.cursor.y
+            self.viewport().update()
             return
-        # Normalize newlines early, but preserve CR semantics
-        data = data.replace("\r\n", "\n")
-        i = 0
-        while i < len(data):
-            ch = data[i]
-            i += 1
-            if ch == "\x08":  # BS
-                if self._col > 0:
-                    self._col -= 1
-                    try:
-                        self._line_buf = self._line_buf[: self._col] + self._line_buf[self._col + 1 :]
-                    except Exception:
-                        pass
-                    self._replace_last_line(self._line_buf)
-                continue
-            if ch == "\r":  # CR
-                self._col = 0
-                continue
-            if ch == "\n":  # LF
-                self._append_newline()
-                continue
-            if ch == "\x1b":  # ESC ... parse few sequences
-                seq, consumed = self._parse_escape(data[i - 1 :])
-                if consumed > 0:
-                    i += consumed - 1  # already consumed ESC in ch
-                    if seq == "EL":  # ESC[K
-                        self._line_buf = self._line_buf[: self._col]
-                        self._replace_last_line(self._line_buf)
-                    elif seq == "ED":  # ESC[2J (clear screen)
-                        self._clear_screen()
-                    # Other sequences are ignored/stripped
-                    continue
-                # Unknown escape -> drop it
-                continue
-            # Printable chunk: extend from this point until control/esc
-            start = i - 1
-            while i < len(data) and data[i] not in "\x08\r\n\x1b":
-                i += 1
-            text = data[start:i]
-            # Strip common OSC/title and color CSI
-            text = self._re_osc.sub("", text)
-            text = self._re_bracketed.sub("", text)
-            text = self._re_csi_color.sub("", text)
-            if not text:
+        cur_y = scr.cursor.y
+        dirty.add(cur_y)
+        dirty.add(self._last_cursor_row)
+        w = self.viewport().width()
+        for y in dirty:
+            self.viewport().update(QRect(0, y * self._ch, w, self._ch))
+        self._last_cursor_row = cur_y
+
+    def clear(self) -> None:
+        self._screen.reset()
+        self._screen.history.clear()
+        self._scroll_back = 0
+        self._sel = None
+        self._find_reset()
+        self._sync_scrollbar()
+        self.viewport().update()
+
+    def _sync_scrollbar(self) -> None:
+        sb = self.verticalScrollBar()
+        n = len(self._screen.history) if not self._screen.alt_active else 0
+        sb.blockSignals(True)
+        sb.setRange(0, n)
+        sb.setPageStep(self._screen.rows)
+        sb.setValue(n - min(self._scroll_back, n))
+        sb.blockSignals(False)
+
+    def _on_scrollbar(self, value: int) -> None:
+        self._scroll_back = max(0, self.verticalScrollBar().maximum() - value)
+        self.viewport().update()
+
+    def _line_at(self, abs_line: int) -> Optional[Line]:
+        """History lines first, then the screen (absolute line numbering)."""
+        hist = self._screen.history if not self._screen.alt_active else ()
+        if abs_line < 0:
+            return None
+        if abs_line < len(hist):
+            return hist[abs_line]
+        y = abs_line - len(hist)
+        return self._screen.lines[y] if y < self._screen.rows else None
+
+    def _first_visible(self) -> int:
+        hist = len(self._screen.history) if not self._screen.alt_active else 0
+        return hist - self._scroll_back
+
+    def _color(self, idx: int, fg: bool) -> QColor:
+        if idx == DEFAULT_COLOR:
+            pal = self.palette()
+            return pal.text().color() if fg else pal.base().color()
+        return self._palette256[idx]
+
+    def paintEvent(self, ev) -> None:  # noqa: N802 - Qt override
+        p = QPainter(self.viewport())
+        try:
+            r = ev.rect()
+            ch = self._ch
+            p.fillRect(r, self._color(DEFAULT_COLOR, False))
+            first = self._first_visible()
+            y0 = max(0, r.top() // ch)
+            y1 = min(self._screen.rows - 1, r.bottom() // ch)
+            for y in range(y0, y1 + 1):
+                line = self._line_at(first + y)
+                if line is not None:
+                    self._paint_line(p, line, y * ch, first + y)
+            if self._find_matches:
+                self._paint_matches(p, first + y0, first + y1)
+            self._paint_cursor(p, first)
+        finally:
+            p.end()
+
+    def _paint_line(self, p: QPainter, line: Line, top: int, abs_line: int) -> None:
+        cw, ch = self._cw, self._ch
+        base = top + self._ascent
+        chars, attrs = line.chars, line.attrs
+        x = 0
+        for attr, run in groupby(attrs):
+            n = sum(1 for _ in run)
+            text = "".join(chars[x:x + n])
+            fg, bg = attr_fg(attr), attr_bg(attr)
+            if attr & BOLD and fg < 8:
+                fg += 8  # bold brightens the base colours, like xterm
+            fgc, bgc = self._color(fg, True), self._color(bg, False)
+            if attr & REVERSE:
+                fgc, bgc = bgc, fgc
+            if attr & DIM:
+                fgc = QColor(fgc)
+                fgc.setAlpha(150)
+            if bg != DEFAULT_COLOR or attr & REVERSE:
+                p.fillRect(x * cw, top, n * cw, ch, bgc)
+            if text.strip() and not attr & CONCEAL:
+                font = self._bold_font if attr & BOLD else self.font()
+                if attr & (ITALIC | UNDERLINE | STRIKE):
+                    font = QFont(font)
+                    font.setItalic(bool(attr & ITALIC))
+                    font.setUnderline(bool(attr & UNDERLINE))
+                    font.setStrikeOut(bool(attr & STRIKE))
+                p.setFont(font)
+                p.setPen(fgc)
+                if len(text) == n and text.isascii():
+                    p.drawText(x * cw, base, text)
+                else:
+                    # Wide/combining glyphs: place each cell explicitly
+                    for i in range(n):
+                        c = chars[x + i]
+                        if c and c != " ":
+                            p.drawText((x + i) * cw, base, c)
+            x += n
+        sel = self._selection_span(abs_line, len(chars))
+        if sel is not None:
+            c0, c1 = sel
+            hl = QColor(self.palette().highlight().color())
+            hl.setAlpha(110)
+            p.fillRect(c0 * cw, top, (c1 - c0) * cw, ch, hl)
+
+    def _paint_matches(self, p: QPainter, a0: int, a1: int) -> None:
+        base = self._id_base()
+        ms = self._find_matches
+        n = len(self._find_query)
+        first = self._first_visible()
+        hit = QColor(255, 200, 0, 90)
+        cur = QColor(255, 140, 0, 170)
+        for i in range(bisect_left(ms, (base + a0, -1)), bisect_left(ms, (base + a1 + 1, -1))):
+            lid, col = ms[i]
+            y = (lid - base - first) * self._ch
+            p.fillRect(col * self._cw, y, n * self._cw, self._ch, cur if ms[i] == self._find_cur else hit)
+
+    def _paint_cursor(self, p: QPainter, first: int) -> None:
+        scr = self._screen
+        if self._shell is None or not scr.cursor_visible:
+            return
+        row = len(scr.history) - first + scr.cursor.y if not scr.alt_active else scr.cursor.y
+        if not (0 <= row < scr.rows):
+            return
+        color = QColor(self.palette().text().color())
+        x, y = scr.cursor.x * self._cw, row * self._ch
+        if self.hasFocus():
+            if not self._cursor_on:
+                return
+            color.setAlpha(190)
+            # Bar-style caret
+            p.fillRect(x, y, max(2, int(self._cw * 0.15)), self._ch, color)
+        else:
+            p.setPen(color)
+            p.drawRect(x, y, self._cw - 1, self._ch - 1)
+
+    # Selection / clipboard ------------------------------------------------
+    def _cell_at(self, pos: QPoint) -> Tuple[int, int]:
+        y = max(0, min(self._screen.rows - 1, pos.y() // self._ch))
+        x = max(0, min(self._screen.cols, (pos.x() + self._cw // 2) // self._cw))
+        return self._first_visible() + y, x
+
+    def _selection_span(self, abs_line: int, cols: int) -> Optional[Tuple[int, int]]:
+        if self._sel is None:
+            return None
+        (l0, c0), (l1, c1) = sorted(self._sel)
+        if abs_line < l0 or abs_line > l1 or (l0, c0) == (l1, c1):
+            return None
+        start = c0 if abs_line == l0 else 0
+        end = c1 if abs_line == l1 else cols
+        return (start, end) if end > start else None
+
+    def selected_text(self) -> str:
+        if self._sel is None:
+            return ""
+        (l0, c0), (l1, c1) = sorted(self._sel)
+        out: List[str] = []
+        for ln in range(l0, l1 + 1):
+            line = self._line_at(ln)
+            if line is None:
                 continue
-            # Ensure line is long enough, pad with spaces
-            if self._col > len(self._line_buf):
-                self._line_buf += " " * (self._col - len(self._line_buf))
-            # Overwrite from current col
-            new_line = (
-                self._line_buf[: self._col] + text + self._line_buf[self._col + len(text) :]
-            )
-            self._line_buf = new_line
-            self._col += len(text)
-            self._replace_last_line(self._line_buf)
-        # Scroll to end lazily to reduce cursor flicker
-        if not self._pending_scroll_to_end:
-            self._pending_scroll_to_end = True
-            self.viewport().update()
+            a = c0 if ln == l0 else 0
+            b = c1 if ln == l1 else len(line.chars)
+            text = "".join(line.chars[a:b]).rstrip()
+            if out and not self._line_at(ln - 1).wrapped:  # type: ignore[union-attr]
+                out.append("\n")
+            out.append(text)
+        return "".join(out)
 
-    def paintEvent(self, ev):  # noqa: N802 - Qt override
-        super().paintEvent(ev)
-        if self._pending_scroll_to_end:
-            self._pending_scroll_to_end = False
-            cur = self.textCursor()
-            cur.movePosition(QTextCursor.MoveOperation.End)
-            self.setTextCursor(cur)
-            self.ensureCursorVisible()
-        # Draw a simple blinking caret at (_col) on the last line when focused
+    def copy(self) -> None:
+        text = self.selected_text()
+        if text:
+            QGuiApplication.clipboard().setText(text)
+
+    def paste(self) -> None:
+        text = QGuiApplication.clipboard().text()
+        if not text or self._shell is None:
+            return
+        text = text.replace("\r\n", "\r").replace("\n", "\r")
+        if self._screen.bracketed_paste:
+            text = "\x1b[200~" + text + "\x1b[201~"
         try:
-            if self._shell is not None and self.hasFocus() and self._cursor_on:
-                doc = self.document()
-                blk = doc.lastBlock()
-                # Last block length includes a separator; clamp to visible chars
-                max_pos = max(0, blk.length() - 1)
-                pos = blk.position() + min(max(self._col, 0), max_pos)
-                cur2 = QTextCursor(doc)
-                cur2.setPosition(pos)
-                r = self.cursorRect(cur2)
-                p = QPainter(self.viewport())
-                try:
-                    # Bar-style caret: thin rect using text color with slight transparency
-                    w = max(2, int(self.fontMetrics().horizontalAdvance("M") * 0.08))
-                    color = self.palette().text().color()
-                    color.setAlpha(190)
-                    p.fillRect(r.left(), r.top(), w, r.height(), color)
-                finally:
-                    p.end()
+            self._shell.write(text)
         except Exception:
             pass
 
-    def _append_newline(self) -> None:
-        cur = self.textCursor()
-        cur.movePosition(QTextCursor.MoveOperation.End)
-        # Replace last line content before inserting newline
-        cur.movePosition(QTextCursor.MoveOperation.StartOfBlock, QTextCursor.MoveMode.KeepAnchor)
-        cur.insertText(self._line_buf)
-        cur.movePosition(QTextCursor.MoveOperation.End)
-        cur.insertText("\n")
-        self.setTextCursor(cur)
-        self._line_buf = ""
-        self._col = 0
-
-    def _replace_last_line(self, line: str) -> None:
-        cur = self.textCursor()
-        cur.movePosition(QTextCursor.MoveOperation.End)
-        cur.movePosition(QTextCursor.MoveOperation.StartOfBlock, QTextCursor.MoveMode.KeepAnchor)
-        cur.insertText(line)
-        self.setTextCursor(cur)
-
-    def _clear_screen(self) -> None:
-        super().clear()
-        self._line_buf = ""
-        self._col = 0
-
-    def clear(self) -> None:  # type: ignore[override]
-        self._clear_screen()
-
-    # Minimal ESC parser: return (token, consumed)
-    # Tokens: 'EL' for ESC[K, 'ED' for ESC[2J]; otherwise consumed>0 just strips
-    def _parse_escape(self, tail: str) -> tuple[str, int]:
-        # tail starts with ESC
-        if not tail:
-            return "", 0
-        # Support ESC[K and ESC[2J and strip OSC/color sequences quickly here when split across chunks
-        if tail.startswith("\x1b[K"):
-            return "EL", 3
-        # ESC[2J or ESC[H or other CSI ... just consume until final byte
-        if tail.startswith("\x1b["):
-            # Find end of CSI (final byte 0x40..0x7E)
-            j = 2
-            while j < len(tail):
-                b = tail[j]
-                if 64 <= ord(b) <= 126:
-                    tok = tail[2:j+1]
-                    if tok == "2J":
-                        return "ED", j + 1
-                    # Treat any color/style '...m' as strip-only
-                    return "", j + 1
-                j += 1
-            # Incomplete; consume all to avoid jitter
-            return "", len(tail)
-        # OSC sequence ESC ] ... BEL or ST; strip it
-        if tail.startswith("\x1b]"):
-            # Find BEL (\x07) or ST (ESC\\)
-            j = 2
-            while j < len(tail):
-                if tail[j] == "\x07":
-                    return "", j + 1
-                if tail[j] == "\x1b" and j + 1 < len(tail) and tail[j + 1] == "\\":
-                    return "", j + 2
-                j += 1
-            return "", len(tail)
-        # Unknown escapes: consume ESC only
-        return "", 1
+    def mousePressEvent(self, ev) -> None:  # noqa: N802 - Qt override
+        if ev.button() == Qt.MouseButton.LeftButton:
+            cell = self._cell_at(ev.position().toPoint())
+            self._sel = (cell, cell)
+            self._selecting = True
+            self.viewport().update()
+        elif ev.button() == Qt.MouseButton.MiddleButton:
+            self.paste()
+        super().mousePressEvent(ev)
+
+    def mouseMoveEvent(self, ev) -> None:  # noqa: N802 - Qt override
+        if self._selecting and self._sel is not None:
+            self._sel = (self._sel[0], self._cell_at(ev.position().toPoint()))
+            self.viewport().update()
+
+    def mouseReleaseEvent(self, ev) -> None:  # noqa: N802 - Qt override
+        self._selecting = False
+        if self._sel is not None and self._sel[0] == self._sel[1]:
+            self._sel = None
+        super().mouseReleaseEvent(ev)
+
+    def contextMenuEvent(self, ev) -> None:  # noqa: N802 - Qt override
+        m = QMenu(self)
+        a_copy = m.addAction("Copy")
+        a_copy.setEnabled(bool(self.selected_text()))
+        a_paste = m.addAction("Paste")
+        a_paste.setEnabled(self._shell is not None)
+        a_find = m.addAction("Find…")
+        m.addSeparator()
+        a_clear = m.addAction("Clear")
+        act = m.exec(ev.globalPos())
+        if act is a_copy:
+            self.copy()
+        elif act is a_paste:
+            self.paste()
+        elif act is a_find:
+            self.show_find()
+        elif act is a_clear:
+            self.clear()
+
+    def wheelEvent(self, ev) -> None:  # noqa: N802 - Qt override
+        steps = int(ev.angleDelta().y() / 40)
+        if not steps:
+            return
+        if self._screen.alt_active and self._shell is not None:
+            # Full-screen apps without mouse support: wheel scrolls via arrows
+            key = ("\x1bOA" if self._screen.app_cursor else "\x1b[A") if steps > 0 else ("\x1bOB" if self._screen.app_cursor else "\x1b[B")
+            try:
+                self._shell.write(key * abs(steps))
+            except Exception:
+                pass
+            return
+        sb = self.verticalScrollBar()
+        sb.setValue(sb.value() - steps)
 
     # Input handling ------------------------------------------------------
     def keyPressEvent(self, ev: QKeyEvent) -> None:  # noqa: N802 - Qt override
+        key = ev.key()
+        mod = ev.modifiers()
+        ctrl_shift = Qt.KeyboardModifier.ControlModifier | Qt.KeyboardModifier.ShiftModifier
+        # Ctrl+Shift+C/V (Cmd+C/V on macOS) are copy/paste, not sent to the shell
+        if (mod & ctrl_shift) == ctrl_shift or (sys.platform == "darwin" and mod & Qt.KeyboardModifier.ControlModifier):
+            if key == Qt.Key.Key_C and self._sel is not None:
+                self.copy()
+                return
+            if key == Qt.Key.Key_V:
+                self.paste()
+                return
+            if key == Qt.Key.Key_F:
+                self.show_find()
+                return
         if self._shell is None:
             super().keyPressEvent(ev)
             return
         text = ""
-        key = ev.key()
-        mod = ev.modifiers()
+        app = self._screen.app_cursor
 
         # Ctrl shortcuts
         if mod & Qt.KeyboardModifier.ControlModifier:
@@ -261,6 +507,11 @@ class TerminalWidget(QPlainTextEdit):
                 text = ctrl_map[key]
             elif key in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
                 text = "\r"
+            elif Qt.Key.Key_A <= key <= Qt.Key.Key_Z:
+                # Remaining Ctrl-letters (tmux prefix ^B, ^R search...)
+                text = chr(int(key) - int(Qt.Key.Key_A) + 1)
+            elif key == Qt.Key.Key_BracketLeft:
+                text = "\x1b"
         else:
             if key in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
                 text = "\r"
@@ -268,24 +519,34 @@ class TerminalWidget(QPlainTextEdit):
                 text = "\x7f"  # DEL (most shells expect ^?)
             elif key == Qt.Key.Key_Tab:
                 text = "\t"
+            elif key == Qt.Key.Key_Backtab:
+                text = "\x1b[Z"
             elif key == Qt.Key.Key_Escape:
                 text = "\x1b"
             elif key == Qt.Key.Key_Left:
-                text = "\x1b[D"
+                text = "\x1bOD" if app else "\x1b[D"
             elif key == Qt.Key.Key_Right:
-                text = "\x1b[C"
+                text = "\x1bOC" if app else "\x1b[C"
             elif key == Qt.Key.Key_Up:
-                text = "\x1b[A"
+                text = "\x1bOA" if app else "\x1b[A"
             elif key == Qt.Key.Key_Down:
-                text = "\x1b[B"
+                text = "\x1bOB" if app else "\x1b[B"
             elif key == Qt.Key.Key_Home:
-                text = "\x1b[H"
+                text = "\x1bOH" if app else "\x1b[H"
             elif key == Qt.Key.Key_End:
-                text = "\x1b[F"
+                text = "\x1bOF" if app else "\x1b[F"
             elif key == Qt.Key.Key_PageUp:
+                if mod & Qt.KeyboardModifier.ShiftModifier and not self._screen.alt_active:
+                    self._scroll_page(-1)
+                    return
                 text = "\x1b[5~"
             elif key == Qt.Key.Key_PageDown:
+                if mod & Qt.KeyboardModifier.ShiftModifier and not self._screen.alt_active:
+                    self._scroll_page(1)
+                    return
                 text = "\x1b[6~"
+            elif key == Qt.Key.Key_Insert:
+                text = "\x1b[2~"
             elif key == Qt.Key.Key_Delete:
                 text = "\x1b[3~"
             elif key in (
@@ -316,11 +577,7 @@ class TerminalWidget(QPlainTextEdit):
                     Qt.Key.Key_F11: "[23~",
                     Qt.Key.Key_F12: "[24~",
                 }
-                suf = f_map.get(key, "")
-                if suf.startswith("O"):
-                    text = "\x1b" + suf
-                else:
-                    text = "\x1b" + suf
+                text = "\x1b" + f_map.get(key, "")
             else:
                 # Regular text (ignore when only modifiers held)
                 t = ev.text()
@@ -332,45 +589,56 @@ class TerminalWidget(QPlainTextEdit):
                         text = t
 
         if text:
+            # Typing returns the view to the live screen
+            if self._scroll_back:
+                self._scroll_back = 0
+                self._sync_scrollbar()
+                self.viewport().update()
             try:
                 self._shell.write(text)
             except Exception:
                 pass
-            # Do not let the editor insert text locally
             return
-        # Fallback to default handling
         super().keyPressEvent(ev)
 
-    def insertFromMimeData(self, source) -> None:  # noqa: N802 - Qt override
-        # Paste: send raw text to remote
-        if self._shell is not None:
-            try:
-                text = source.text()
-            except Exception:
-                text = None
-            if text:
-                try:
-                    self._shell.write(text)
-                except Exception:
-                    pass
-            return
-        super().insertFromMimeData(source)
+    def _scroll_page(self, direction: int) -> None:
+        sb = self.verticalScrollBar()
+        sb.setValue(sb.value() + direction * max(1, self._screen.rows - 1))
+
+    def focusNextPrevChild(self, nxt: bool) -> bool:  # noqa: N802 - Qt override
+        # Tab/Backtab belong to the shell, not focus navigation
+        return False if self._shell is not None else super().focusNextPrevChild(nxt)
 
     # Resize handling -----------------------------------------------------
     def resizeEvent(self, ev) -> None:  # noqa: N802 - Qt override
         super().resizeEvent(ev)
+        if not self._ready:
+            return
+        self._place_find_bar()
         self._send_resize()
 
+    def changeEvent(self, ev) -> None:  # noqa: N802 - Qt override
+        super().changeEvent(ev)
+        if self._ready and ev.type() == QEvent.Type.FontChange:
+            self._bold_font = QFont(self.font())
+            self._bold_font.setBold(True)
+            self._update_metrics()
+            self._send_resize()
+
+    def _grid_size(self) -> Tuple[int, int]:
+        cols = max(40, int(self.viewport().width() / self._cw))
+        rows = max(10, int(self.viewport().height() / self._ch))
+        return cols, rows
+
     def _send_resize(self) -> None:
+        cols, rows = self._grid_size()
+        if (cols, rows) != (self._screen.cols, self._screen.rows):
+            self._screen.resize(cols, rows)
+            self._sync_scrollbar()
+            self.viewport().update()
         if not self._shell or not hasattr(self._shell, "resize_pty"):
             return
         try:
-            fm = self.fontMetrics()
-            # Avoid divide-by-zero
-            char_w = max(1, fm.horizontalAdvance("M"))
-            char_h = max(1, fm.height())
-            cols = max(40, int(self.viewport().width() / char_w))
-            rows = max(10, int(self.viewport().height() / char_h))
             self._shell.resize_pty(cols, rows)
         except Exception:
             pass
@@ -378,17 +646,152 @@ class TerminalWidget(QPlainTextEdit):
     # Convenience ---------------------------------------------------------
     def local_echo(self, text: str) -> None:
         """Show a local message in the terminal (prefixed already)."""
-        self.feed(text + "\n")
+        self.feed("\r\n".join(text.split("\n")) + "\r\n")
 
     def send_resize(self) -> None:
         """Public wrapper to trigger a PTY resize based on current widget size."""
         self._send_resize()
 
+    def toPlainText(self) -> str:  # noqa: N802 - QPlainTextEdit-compatible
+        h = self._screen.history
+        hist = [] if self._screen.alt_active else [h.text(i).rstrip() for i in range(len(h))]
+        return "\n".join(hist + [l.text() for l in self._screen.lines]).rstrip("\n")
+
+    # Find in scrollback ---------------------------------------------------
+    def _id_base(self) -> int:
+        """Line id of absolute line 0 (ids survive history eviction)."""
+        return self._screen.history.first_id
+
+    def show_find(self) -> None:
+        if self._find_bar is None:
+            self._find_bar = _FindBar(self)
+        bar = self._find_bar
+        sel = self.selected_text()
+        if sel and "\n" not in sel:
+            bar.edit.setText(sel)
+        bar.show()
+        self._place_find_bar()
+        bar.edit.setFocus()
+        bar.edit.selectAll()
+        if bar.edit.text():
+            self._find_update(bar.edit.text())
+
+    def hide_find(self) -> None:
+        if self._find_bar is not None:
+            self._find_bar.hide()
+        self._find_reset()
+        self.viewport().update()
+        self.setFocus()
+
+    def _place_find_bar(self) -> None:
+        bar = self._find_bar
+        if bar is None or not bar.isVisible():
+            return
+        bar.adjustSize()
+        vp = self.viewport().geometry()
+        bar.move(vp.right() - bar.width() - 6, vp.top() + 4)
+
+    def _find_reset(self) -> None:
+        self._find_query = ""
+        self._find_hist = []
+        self._find_scanned = 0
+        self._find_matches = []
+        self._find_cur = None
+
+    def _find_changed(self, query: str) -> None:
+        self._find_update(query)
+        self.find_step(0)
+
+    def _find_update(self, query: str) -> None:
+        """Recomputes matches for `query` incrementally.
+
+        History is searched once; later calls only re-check earlier hits when
+        the query grew (refine) and scan lines pushed since. The screen rows
+        are few and change all the time, so they are searched every call.
+        """
+        scr = self._screen
+        hist = scr.history
+        if not query or scr.alt_active:
+            self._find_reset()
+            self._find_query = query
+            self._update_find_label()
+            return
+        if self._find_query and query.lower().startswith(self._find_query.lower()) and len(self._find_hist) < MAX_MATCHES:
+            found = hist.refine(self._find_hist, query)
+            since = self._find_scanned
+        else:
+            found, since = [], 0
+        found += hist.search(query, since_id=since, limit=MAX_MATCHES - len(found))
+        self._find_hist = found
+        self._find_scanned = hist.first_id + len(hist)
+        self._find_query = query
+        q = query.lower()
+        base = self._find_scanned
+        on_screen: List[Tuple[int, int]] = []
+        for y, line in enumerate(scr.lines):
+            text = "".join(line.chars).lower()
+            pos = text.find(q)
+            while pos >= 0:
+                on_screen.append((base + y, cell_col(line.chars, pos)))
+                pos = text.find(q, pos + 1)
+        self._find_matches = found + on_screen
+
+    def find_step(self, direction: int) -> None:
+        """Moves to the next (1), previous/older (-1) or nearest (0) match."""
+        if direction and self._find_bar is not None:
+            # Pick up output that arrived since the last search
+            self._find_update(self._find_bar.edit.text())
+        ms = self._find_matches
+        if not ms:
+            self._find_cur = None
+        else:
+            cur = self._find_cur
+            if cur is None:
+                i = len(ms) - 1  # start from the newest
+            elif direction > 0:
+                i = bisect_right(ms, cur) % len(ms)
+            elif direction < 0:
+                i = (bisect_left(ms, cur) - 1) % len(ms)
+            else:
+                i = max(0, bisect_right(ms, cur) - 1)
+            self._find_cur = ms[i]
+            self._reveal(self._find_cur[0] - self._id_base())
+        self._update_find_label()
+        self.viewport().update()
+
+    def _reveal(self, abs_line: int) -> None:
+        first = self._first_visible()
+        if first <= abs_line < first + self._screen.rows:
+            return
+        n = len(self._screen.history)
+        want_first = abs_line - self._screen.rows // 2
+        self._scroll_back = max(0, min(n, n - want_first))
+        self._sync_scrollbar()
+
+    def _update_find_label(self) -> None:
+        bar = self._find_bar
+        if bar is None:
+            return
+        ms = self._find_matches
+        if not self._find_query:
+            bar.count.setText("")
+            return
+        more = "+" if len(self._find_hist) >= MAX_MATCHES else ""
+        pos = bisect_left(ms, self._find_cur) + 1 if self._find_cur is not None else 0
+        bar.count.setText(f"{pos}/{len(ms)}{more}")
+
     # Caret blink helpers -------------------------------------------------
+    def _update_cursor_cell(self) -> None:
+        scr = self._screen
+        if self._scroll_back:
+            return
+        self.viewport().update(QRect(0, scr.cursor.y * self._ch, self.viewport().width(), self._ch))
+
     def focusInEvent(self, ev: QEvent) -> None:  # noqa: N802 - Qt override
         try:
             self._cursor_on = True
             self._blink_timer.start()
+            self._update_cursor_cell()
         except Exception:
             pass
         super().focusInEvent(ev)
@@ -397,7 +800,7 @@ class TerminalWidget(QPlainTextEdit):
         try:
             self._blink_timer.stop()
             self._cursor_on = False
-            self.viewport().update()
+            self._update_cursor_cell()
         except Exception:
             pass
         super().focusOutEvent(ev)
@@ -409,6 +812,51 @@ class TerminalWidget(QPlainTextEdit):
                 self._cursor_on = False
                 return
             self._cursor_on = not self._cursor_on
-            self.viewport().update()
+            self._update_cursor_cell()
         except Exception:
             pass
+
+
+class _FindBar(QFrame):
+    """Search box floating over the top-right of a TerminalWidget.
+
+    Enter jumps to the previous (older) match, Shift+Enter to the next one,
+    Esc closes the bar.
+    """
+
+    def __init__(self, term: TerminalWidget) -> None:
+        super().__init__(term)
+        self._term = term
+        self.setFrameShape(QFrame.Shape.StyledPanel)
+        self.setAutoFillBackground(True)
+        self.edit = QLineEdit()
+        self.edit.setPlaceholderText("Find in scrollback")
+        self.edit.setMinimumWidth(220)
+        self.count = QLabel("")
+        self.count.setMinimumWidth(70)
+        prev_btn = QToolButton(); prev_btn.setText("▲"); prev_btn.setToolTip("Previous match (Enter)")
+        next_btn = QToolButton(); next_btn.setText("▼"); next_btn.setToolTip("Next match (Shift+Enter)")
+        close_btn = QToolButton(); close_btn.setText("✕"); close_btn.setToolTip("Close (Esc)")
+        h = QHBoxLayout(self)
+        h.setContentsMargins(6, 4, 6, 4)
+        h.setSpacing(4)
+        h.addWidget(self.edit)
+        h.addWidget(self.count)
+        h.addWidget(prev_btn)
+        h.addWidget(next_btn)
+        h.addWidget(close_btn)
+        self.edit.textChanged.connect(term._find_changed)
+        prev_btn.clicked.connect(lambda: term.find_step(-1))
+        next_btn.clicked.connect(lambda: term.find_step(1))
+        close_btn.clicked.connect(term.hide_find)
+        self.edit.installEventFilter(self)
+
+    def eventFilter(self, obj, ev) -> bool:  # noqa: N802 - Qt override
+        if obj is self.edit and ev.type() == QEvent.Type.KeyPress:
+            if ev.key() in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
+                self._term.find_step(1 if ev.modifiers() & Qt.KeyboardModifier.ShiftModifier else -1)
+                return True
+            if ev.key() == Qt.Key.Key_Escape:
+                self._term.hide_find()
+                return True
+        return super().eventFilter(obj, ev)
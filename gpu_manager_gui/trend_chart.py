@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import copy
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from PyQt6.QtCore import Qt, QDateTime, QMargins, QPointF
+from PyQt6.QtGui import QPainter
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox
+from PyQt6.QtCharts import QChart, QChartView, QLineSeries, QDateTimeAxis, QValueAxis
+
+from . import async_engine
+from .downsample import downsample
+
+
+def _downsample_all(data: Sequence[Tuple[int, Any, Any]], points: int) -> List[Tuple[int, List[QPointF]]]:
+    """Worker side of a refresh: window copies -> chart-ready points per GPU."""
+    out = []
+    for idx, ts, vals in data:
+        xs, ys = downsample(ts, vals, points)
+        out.append((idx, [QPointF(x * 1000.0, y) for x, y in zip(xs, ys)]))
+    return out
+
+
+class TrendChart(QWidget):
+    """Rolling per-GPU util%/memory lines fed from a HostHistory.
+
+    One QLineSeries per GPU lives for the widget's lifetime; each refresh
+    downsamples the window (min/max + LTTB) to `max_points` and swaps the data
+    in with `replace()`. Downsampling runs on the async engine's worker
+    threads and only the series swap happens on the GUI thread; results of
+    a superseded refresh are dropped. Long windows are recomputed at most
+    once per bucket width, since new samples cannot visibly change them
+    sooner.
+    """
+
+    WINDOWS = [("1 min", 60), ("15 min", 900), ("1 h", 3600), ("24 h", 86400)]
+    METRICS = [("Util %", "util"), ("Memory used (MiB)", "mem")]
+
+    def __init__(self, max_points: int = 1500) -> None:
+        super().__init__()
+        self._max_points = max(16, int(max_points))
+        self._history: Any = None
+        self._mem_max = 1
+        self._next_due = 0.0
+        self._gen = 0  # bumped per refresh; stale worker results are ignored
+        self._series: Dict[int, QLineSeries] = {}
+
+        self.window_combo = QComboBox()
+        for label, _ in self.WINDOWS:
+            self.window_combo.addItem(label)
+        self.window_combo.setCurrentIndex(1)
+        self.metric_combo = QComboBox()
+        for label, _ in self.METRICS:
+            self.metric_combo.addItem(label)
+        bar = QHBoxLayout()
+        bar.addWidget(QLabel("Trend"))
+        bar.addWidget(self.metric_combo)
+        bar.addWidget(self.window_combo)
+        bar.addStretch(1)
+
+        self.chart = QChart()
+        self.chart.setAnimationOptions(QChart.AnimationOption.NoAnimation)
+        self.chart.legend().setAlignment(Qt.AlignmentFlag.AlignRight)
+        self.chart.setMargins(QMargins(4, 4, 4, 4))
+        self.x_axis = QDateTimeAxis()
+        self.x_axis.setTickCount(6)
+        self.y_axis = QValueAxis()
+        self.y_axis.setLabelFormat("%d")
+        self.chart.addAxis(self.x_axis, Qt.AlignmentFlag.AlignBottom)
+        self.chart.addAxis(self.y_axis, Qt.AlignmentFlag.AlignLeft)
+        self.view = QChartView(self.chart)
+        self.view.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        v = QVBoxLayout(self)
+        v.setContentsMargins(0, 0, 0, 0)
+        v.addLayout(bar)
+        v.addWidget(self.view, 1)
+
+        self.window_combo.currentIndexChanged.connect(lambda _=None: self.refresh(force=True))
+        self.metric_combo.currentIndexChanged.connect(lambda _=None: self.refresh(force=True))
+
+    # Data -----------------------------------------------------------------
+    def window_sec(self) -> int:
+        return self.WINDOWS[max(0, self.window_combo.currentIndex())][1]
+
+    def metric_key(self) -> str:
+        # Not metric(): that would override QWidget.metric()
+        return self.METRICS[max(0, self.metric_combo.currentIndex())][1]
+
+    def set_history(self, history: Any, mem_max_mib: int = 0) -> None:
+        """Points the chart at a HostHistory (None clears it) and refreshes if due."""
+        if history is not self._history:
+            self._history = history
+            self._next_due = 0.0
+        if mem_max_mib > 0 and mem_max_mib != self._mem_max:
+            self._mem_max = int(mem_max_mib)
+            if self.metric_key() == "mem":
+                self.y_axis.setRange(0, self._mem_max)
+        self.refresh()
+
+    def _series_for(self, idx: int) -> QLineSeries:
+        s = self._series.get(idx)
+        if s is None:
+            s = QLineSeries()
+            s.setName(f"GPU {idx}")
+            self.chart.addSeries(s)
+            s.attachAxis(self.x_axis)
+            s.attachAxis(self.y_axis)
+            self._series[idx] = s
+        return s
+
+    def refresh(self, force: bool = False) -> None:
+        if not self.isVisible() and not force:
+            return
+        now = time.time()
+        if not force and now < self._next_due:
+            return
+        window = self.window_sec()
+        # Bucket width of the downsampled plot; no point redrawing faster
+        self._next_due = now + max(1.0, window / float(self._max_points))
+        hist = self._history
+        gpus: List[int] = hist.gpu_indices() if hist is not None else []
+        for idx in list(self._series):
+            if idx not in gpus:
+                self.chart.removeSeries(self._series.pop(idx))
+        metric = self.metric_key()
+        latest: Optional[float] = hist.latest_time() if hist is not None and len(hist) else None
+        # Copy the windows here: the ring buffer keeps moving under the worker
+        data = [(idx,) + tuple(copy.copy(c) for c in hist.series((metric, idx), window)) for idx in gpus]
+        end = latest if latest is not None else now
+        self._gen += 1
+        job = (self._gen, metric, window, end)
+        eng = async_engine.engine()
+        points = self._max_points
+
+        async def _run() -> None:
+            out = await eng.run_blocking(_downsample_all, data, points)
+            eng.post(self._apply, (job, out))
+
+        eng.submit(_run())
+
+    def _apply(self, result: Tuple[Tuple[int, str, int, float], List[Tuple[int, List[QPointF]]]]) -> None:
+        (gen, metric, window, end), out = result
+        if gen != self._gen:
+            return  # a newer refresh is on its way
+        for idx, pts in out:
+            self._series_for(idx).replace(pts)
+        self.x_axis.setFormat("HH:mm:ss" if window <= 900 else "HH:mm")
+        self.x_axis.setRange(QDateTime.fromMSecsSinceEpoch(int((end - window) * 1000)), QDateTime.fromMSecsSinceEpoch(int(end * 1000)))
+        self.y_axis.setRange(0, 100 if metric == "util" else max(1, self._mem_max))
+
+    def showEvent(self, e) -> None:  # type: ignore[override]
+        super().showEvent(e)
+        self.refresh(force=True)
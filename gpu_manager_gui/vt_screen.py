@@ -0,0 +1,910 @@
+"""VT100/xterm screen-buffer emulator (no Qt).
+
+`Screen.feed(text)` interprets terminal output into a grid of cells: cursor
+addressing, scroll regions, insert/delete line/char, alternate screen, tab
+stops, DEC line drawing and SGR colours (16/256/truecolor). Enough for
+bash/readline, less, htop, nvtop, vim and tmux.
+
+Cells are stored per row as a list of 1-char strings plus an `array('I')` of
+packed attributes (see `pack_attr`); a wide (CJK) glyph occupies its cell and
+a "" continuation cell. Rows touched since the last `take_dirty()` are
+tracked so a view only repaints what changed. Lines scrolled off the top of
+the main screen go to `history`, a compact `scrollback.Scrollback` (not
+while the alternate screen is active).
+
+Escape sequences split across `feed()` calls are carried over. Replies the
+terminal owes the host (cursor position reports, device attributes) are
+queued and returned by `take_replies()`.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from array import array
+from typing import List, Optional, Set, Tuple
+
+from .scrollback import Scrollback
+
+# Attribute word: fg (9 bits) | bg (9 bits) << 9 | flags << 18.
+# Colour 0-255 is the xterm palette; DEFAULT_COLOR means "terminal default".
+DEFAULT_COLOR = 256
+BOLD = 1 << 18
+DIM = 1 << 19
+ITALIC = 1 << 20
+UNDERLINE = 1 << 21
+REVERSE = 1 << 22
+CONCEAL = 1 << 23
+STRIKE = 1 << 24
+DEFAULT_ATTR = DEFAULT_COLOR | (DEFAULT_COLOR << 9)
+_FG_MASK = 0x1FF
+_BG_MASK = 0x1FF << 9
+
+
+def pack_attr(fg: int = DEFAULT_COLOR, bg: int = DEFAULT_COLOR, flags: int = 0) -> int:
+    return (fg & _FG_MASK) | ((bg & _FG_MASK) << 9) | flags
+
+
+def attr_fg(a: int) -> int:
+    return a & _FG_MASK
+
+
+def attr_bg(a: int) -> int:
+    return (a >> 9) & _FG_MASK
+
+
+def rgb_to_index(r: int, g: int, b: int) -> int:
+    """Nearest xterm-256 colour for a truecolor SGR (cube or grey ramp)."""
+    def q(v: int) -> int:
+        return 0 if v < 48 else 1 if v < 115 else (v - 35) // 40
+    if abs(r - g) < 8 and abs(g - b) < 8:
+        if r < 8:
+            return 16
+        if r > 238:
+            return 231
+        return 232 + min(23, (r - 8) // 10)
+    return 16 + 36 * q(r) + 6 * q(g) + q(b)
+
+
+# DEC Special Graphics (ESC ( 0): line drawing used by tmux/htop borders
+_DEC_GRAPHICS = str.maketrans({
+    "`": "◆", "a": "▒", "f": "°", "g": "±", "j": "┘", "k": "┐", "l": "┌", "m": "└",
+    "n": "┼", "o": "⎺", "p": "⎻", "q": "─", "r": "⎼", "s": "⎽", "t": "├", "u": "┤",
+    "v": "┴", "w": "┬", "x": "│", "y": "≤", "z": "≥", "{": "π", "|": "≠", "}": "£", "~": "·",
+})
+
+# C0 controls, DEL and ESC: everything else is printable
+_SPECIAL = re.compile(r"[\x00-\x1f\x7f]")
+_CSI = re.compile(r"\[([\x30-\x3f]*)([\x20-\x2f]*)([\x40-\x7e])")
+_CSI_PARTIAL = re.compile(r"\[[\x30-\x3f]*[\x20-\x2f]*")
+# Controls other than CR/LF: text without these (and ESC) is plain lines
+_NOT_PLAIN = re.compile(r"[\x00-\x09\x0b\x0c\x0e-\x1f\x7f]")
+# Longest unterminated OSC/DCS kept across feeds before it is dropped
+_MAX_PENDING = 8192
+
+
+def char_width(c: str) -> int:
+    if c.isascii():
+        return 1
+    if unicodedata.combining(c):
+        return 0
+    return 2 if unicodedata.east_asian_width(c) in ("W", "F") else 1
+
+
+# Batching helpers: the shell reader hands the view everything that arrived
+# since the last frame, and most of a fast burst never needs interpreting
+_SGR_ONLY = re.compile(r"\x1b\[[0-9;:]*m")
+_CTRL_NO_CR = re.compile(r"[\x00-\x0c\x0e-\x1f\x7f]")
+
+
+def collapse_cr(text: str, cols: int) -> str:
+    """Drops progress-bar frames that a later CR rewrite overwrites.
+
+    `a\rb\rc` on one line (tqdm, pip, wget...) ends up showing `c` over
+    what is left of `b` and `a`; only plain ASCII lines narrower than the
+    screen are merged, so the result is exactly what the screen would show
+    and the cursor ends in the same place.
+    """
+    if "\r" not in text:
+        return text
+    out = []
+    for seg in text.split("\n"):
+        if seg.count("\r") < 3 or "\x1b" in seg or not seg.isascii() or _CTRL_NO_CR.search(seg):
+            out.append(seg)
+            continue
+        frames = seg.split("\r")
+        tail_cr = frames[-1] == ""
+        if tail_cr:
+            frames.pop()
+        # frames[0] starts wherever the cursor was; the rest start at column 0
+        head, frames = frames[0], frames[1:]
+        widest = max(map(len, frames), default=0)
+        if len(frames) < 2 or widest >= cols:
+            out.append(seg)
+            continue
+        # Newest frame wins; older ones only show past its end. Bars redraw
+        # at a fixed width, so this usually stops after one step
+        shown = frames[-1]
+        for f in reversed(frames):
+            if len(shown) >= widest:
+                break
+            if len(f) > len(shown):
+                shown += f[len(shown):]
+        # Rewrite the last frame so the cursor stops where it would have
+        out.append(head + "\r" + shown + "\r" + frames[-1] + ("\r" if tail_cr else ""))
+    return "\n".join(out)
+
+
+def split_backlog(text: str, keep_lines: int) -> Optional[Tuple[str, str, str]]:
+    """Splits a large plain-log backlog into (older lines, SGR state, last
+    `keep_lines` lines), or returns None when it cannot be split safely.
+
+    Everything before the last `keep_lines` lines would scroll off the
+    screen before the next frame is shown. Splitting is only allowed when
+    that part holds nothing but text and SGR colour changes. The colour
+    changes are returned (from the last reset on) so the kept part prints in
+    the right colours; cursor addressing or mode switches mean no split.
+    """
+    if keep_lines <= 0 or text.count("\n") <= keep_lines:
+        return None
+    cut = len(text)
+    for _ in range(keep_lines):
+        cut = text.rfind("\n", 0, cut)
+    dropped = text[:cut + 1]
+    if "\x0e" in dropped or "\x0f" in dropped:
+        return None  # charset shifts change how the kept text prints
+    sgr = ""
+    if "\x1b" in dropped:
+        codes = _SGR_ONLY.findall(dropped)
+        if len(codes) != dropped.count("\x1b"):
+            return None
+        # SGR state is cumulative since the last reset
+        for i in range(len(codes) - 1, -1, -1):
+            if codes[i] in ("\x1b[m", "\x1b[0m"):
+                codes = codes[i:]
+                break
+        sgr = "".join(codes)
+    return dropped, sgr, text[cut + 1:]
+
+
+def trim_backlog(text: str, keep_lines: int) -> str:
+    """Drops all but the last `keep_lines` lines of a plain-log backlog
+    (see `split_backlog`); returns `text` untouched when that is unsafe."""
+    parts = split_backlog(text, keep_lines)
+    return text if parts is None else parts[1] + parts[2]
+
+
+def _plain_row(line: str) -> str:
+    # What a CR-rewritten, control-laden line finally shows, as plain text
+    if "\r" in line:
+        shown = ""
+        for f in line.split("\r"):
+            shown = f + shown[len(f):]
+        line = shown
+    return _CTRL_NO_CR.sub("", line)
+
+
+class Line:
+    __slots__ = ("chars", "attrs", "wrapped")
+
+    def __init__(self, cols: int, attr: int = DEFAULT_ATTR) -> None:
+        self.chars: List[str] = [" "] * cols
+        self.attrs = array("I", [attr]) * cols
+        # True when the text continues on the next line (soft wrap)
+        self.wrapped = False
+
+    def text(self) -> str:
+        return "".join(self.chars).rstrip()
+
+    def resize(self, cols: int) -> None:
+        n = len(self.chars)
+        if cols < n:
+            del self.chars[cols:]
+            del self.attrs[cols:]
+        elif cols > n:
+            self.chars.extend(" " * (cols - n))
+            self.attrs.extend(array("I", [DEFAULT_ATTR]) * (cols - n))
+
+
+class _Cursor:
+    __slots__ = ("x", "y", "attr", "graphics", "origin", "wrap_pending")
+
+    def __init__(self) -> None:
+        self.x = 0
+        self.y = 0
+        self.attr = DEFAULT_ATTR
+        self.graphics = False
+        self.origin = False
+        self.wrap_pending = False
+
+    def copy(self) -> "_Cursor":
+        c = _Cursor()
+        c.x, c.y, c.attr, c.graphics, c.origin = self.x, self.y, self.attr, self.graphics, self.origin
+        return c
+
+
+class Screen:
+    # Lines beyond the screen that coalesce() still interprets exactly
+    RENDER_KEEP = 500
+
+    def __init__(self, cols: int = 80, rows: int = 24, history: int = 1000) -> None:
+        self.cols = max(2, int(cols))
+        self.rows = max(2, int(rows))
+        self.history = Scrollback(history, DEFAULT_ATTR)
+        # Total lines ever pushed to history (lets a view keep its place)
+        self.history_pushed = 0
+        self.title = ""
+        self._replies: List[str] = []
+        self._pending = ""
+        self.dirty: Set[int] = set()
+        self.reset()
+
+    # State -----------------------------------------------------------------
+    def reset(self) -> None:
+        self._main = [Line(self.cols) for _ in range(self.rows)]
+        self._alt: Optional[List[Line]] = None
+        self.lines = self._main
+        self.cursor = _Cursor()
+        self._saved = _Cursor()
+        self._saved_main: Optional[_Cursor] = None
+        self.top = 0
+        self.bottom = self.rows - 1
+        self.autowrap = True
+        self.insert_mode = False
+        self.cursor_visible = True
+        self.app_cursor = False
+        self.bracketed_paste = False
+        self._g1_graphics = False
+        self._shift_out = False
+        self._last_char = " "
+        self._tabs = set(range(8, self.cols, 8))
+        self.dirty = set(range(self.rows))
+
+    @property
+    def alt_active(self) -> bool:
+        return self._alt is not None and self.lines is self._alt
+
+    def take_dirty(self) -> Set[int]:
+        d, self.dirty = self.dirty, set()
+        return d
+
+    def take_replies(self) -> str:
+        if not self._replies:
+            return ""
+        r = "".join(self._replies)
+        self._replies = []
+        return r
+
+    def coalesce(self, text: str) -> str:
+        """Cheap pre-pass over a batch of output before `feed()`.
+
+        In a plain log flood only the last screenful (plus RENDER_KEEP
+        lines) is interpreted; older lines go straight to history as plain
+        text. Progress-bar frames that a later CR rewrite overwrites are
+        dropped. The visible screen ends up the same as feeding `text`.
+        """
+        if not self._pending and not self.alt_active and self.top == 0 and self.bottom == self.rows - 1:
+            parts = split_backlog(text, self.rows + self.RENDER_KEEP)
+            if parts is not None:
+                dropped, sgr, text = parts
+                self._bulk_history(dropped)
+                text = sgr + text
+        return collapse_cr(text, self.cols)
+
+    def _bulk_history(self, dropped: str) -> None:
+        # Finish the line the cursor is on, then move the finished rows to
+        # history; the rest of `dropped` never reaches the screen
+        nl = dropped.find("\n") + 1
+        self.feed(dropped[:nl])
+        cur = self.cursor
+        if cur.y:
+            self.scroll_up(cur.y)
+        self.lines[:] = [Line(self.cols) for _ in range(self.rows)]
+        cur.x = cur.y = 0
+        cur.wrap_pending = False
+        self.dirty.update(range(self.rows))
+        body = _SGR_ONLY.sub("", dropped[nl:])
+        if not body:
+            return
+        rows = body.expandtabs().replace("\r\n", "\n").split("\n")
+        rows.pop()  # `dropped` ends with a newline
+        if "\r" in body or _NOT_PLAIN.search(body):
+            rows = [_plain_row(r) for r in rows]
+        self.history_pushed += self.history.extend_text(rows, self.cols)
+
+    def line_text(self, y: int) -> str:
+        return self.lines[y].text() if 0 <= y < self.rows else ""
+
+    def display_text(self) -> str:
+        return "\n".join(l.text() for l in self.lines)
+
+    def resize(self, cols: int, rows: int) -> None:
+        cols, rows = max(2, int(cols)), max(2, int(rows))
+        if cols == self.cols and rows == self.rows:
+            return
+        old_cols = self.cols
+        for buf in (self._main, self._alt):
+            if buf is None:
+                continue
+            active = buf is self.lines
+            # Shrinking keeps the cursor row on screen: rows above it scroll
+            # out (into history for the main screen), blank rows below go first
+            while len(buf) > rows:
+                if active and self.cursor.y < rows:
+                    buf.pop()
+                elif active or buf is self._main:
+                    gone = buf.pop(0)
+                    if buf is self._main:
+                        self._push_history(gone)
+                    if active:
+                        self.cursor.y -= 1
+                else:
+                    buf.pop()
+            while len(buf) < rows:
+                buf.append(Line(cols))
+            for line in buf:
+                line.resize(cols)
+        self.cols, self.rows = cols, rows
+        self.top, self.bottom = 0, rows - 1
+        self._tabs = {t for t in self._tabs if t < cols} | set(range((old_cols + 7) // 8 * 8, cols, 8))
+        self.cursor.x = min(self.cursor.x, cols - 1)
+        self.cursor.y = min(self.cursor.y, rows - 1)
+        self.cursor.wrap_pending = False
+        self.dirty = set(range(rows))
+
+    # Input -----------------------------------------------------------------
+    def feed(self, data: str) -> None:
+        if self._pending:
+            data = self._pending + data
+            self._pending = ""
+        if _NOT_PLAIN.search(data) is None:
+            # Log output fast path: printable runs separated by CR/LF only
+            self._feed_plain(data)
+            return
+        i, n = 0, len(data)
+        search = _SPECIAL.search
+        while i < n:
+            m = search(data, i)
+            if m is None:
+                self._print(data[i:])
+                break
+            j = m.start()
+            if j > i:
+                self._print(data[i:j])
+            c = data[j]
+            if c == "\x1b":
+                k = self._escape(data, j)
+                if k < 0:
+                    rest = data[j:]
+                    if len(rest) <= _MAX_PENDING:
+                        self._pending = rest
+                    break
+                i = k
+            else:
+                self._control(c)
+                i = j + 1
+
+    def _feed_plain(self, data: str) -> None:
+        cur = self.cursor
+        lines = self.lines
+        # Full-height scroll region on the main screen (a plain log): LF at the
+        # bottom rotates rows straight into history and repaints once at the end
+        fast_scroll = self.top == 0 and self.bottom == self.rows - 1 and lines is self._main
+        bottom = self.bottom
+        hist = self.history if self.history.maxlen else None
+        scrolled = 0
+        parts = data.split("\n")
+        last = len(parts) - 1
+        for k, part in enumerate(parts):
+            if "\r" in part:
+                for r, seg in enumerate(part.split("\r")):
+                    if r:
+                        cur.x = 0
+                        cur.wrap_pending = False
+                    if seg:
+                        self._print(seg)
+            elif part:
+                self._print(part)
+            if k == last:
+                break
+            if fast_scroll and cur.y == bottom:
+                cur.wrap_pending = False
+                gone = lines.pop(0)
+                if hist is not None:
+                    hist.append(gone)
+                lines.append(self._blank())
+                scrolled += 1
+            else:
+                self.index()
+        if scrolled:
+            if hist is not None:
+                self.history_pushed += scrolled
+            self.dirty.update(range(self.rows))
+
+    def _control(self, c: str) -> None:
+        cur = self.cursor
+        if c == "\n" or c == "\x0b" or c == "\x0c":
+            self.index()
+        elif c == "\r":
+            cur.x = 0
+            cur.wrap_pending = False
+        elif c == "\x08":
+            if cur.x > 0:
+                cur.x -= 1
+            cur.wrap_pending = False
+        elif c == "\t":
+            nxt = [t for t in self._tabs if t > cur.x]
+            cur.x = min(nxt) if nxt else self.cols - 1
+            cur.wrap_pending = False
+        elif c == "\x0e":
+            self._shift_out = True
+        elif c == "\x0f":
+            self._shift_out = False
+        # BEL, NUL, DEL and the rest are ignored
+
+    # Printing --------------------------------------------------------------
+    def _print(self, text: str) -> None:
+        cur = self.cursor
+        if self._g1_graphics if self._shift_out else cur.graphics:
+            text = text.translate(_DEC_GRAPHICS)
+        if not text.isascii():
+            self._print_wide(text)
+            return
+        self._last_char = text[-1]
+        cols = self.cols
+        attr = cur.attr
+        while text:
+            if cur.wrap_pending:
+                if self.autowrap:
+                    self.lines[cur.y].wrapped = True
+                    cur.x = 0
+                    self.index()
+                cur.wrap_pending = False
+            line = self.lines[cur.y]
+            x = cur.x
+            space = cols - x
+            if not self.autowrap and len(text) > space:
+                # Excess characters all land on the last column
+                text = text[: space - 1] + text[-1]
+            chunk, text = text[:space], text[space:]
+            k = len(chunk)
+            if self.insert_mode:
+                self._insert_blanks(line, x, k)
+            line.chars[x:x + k] = chunk
+            line.attrs[x:x + k] = array("I", [attr]) * k
+            self.dirty.add(cur.y)
+            if x + k >= cols:
+                cur.x = cols - 1
+                cur.wrap_pending = True
+            else:
+                cur.x = x + k
+
+    def _print_wide(self, text: str) -> None:
+        cur = self.cursor
+        for c in text:
+            w = char_width(c)
+            if w == 0:
+                # Combining mark: join it to the previous cell
+                line = self.lines[cur.y]
+                px = cur.x if cur.wrap_pending else cur.x - 1
+                if px >= 0:
+                    if line.chars[px] == "" and px > 0:
+                        px -= 1
+                    line.chars[px] += c
+                    self.dirty.add(cur.y)
+                continue
+            if cur.wrap_pending or (w == 2 and cur.x >= self.cols - 1):
+                if self.autowrap:
+                    self.lines[cur.y].wrapped = True
+                    cur.x = 0
+                    self.index()
+                cur.wrap_pending = False
+            line = self.lines[cur.y]
+            x = cur.x
+            if self.insert_mode:
+                self._insert_blanks(line, x, w)
+            line.chars[x] = c
+            line.attrs[x] = cur.attr
+            if w == 2 and x + 1 < self.cols:
+                line.chars[x + 1] = ""
+                line.attrs[x + 1] = cur.attr
+            self.dirty.add(cur.y)
+            self._last_char = c
+            if x + w >= self.cols:
+                cur.x = self.cols - 1
+                cur.wrap_pending = True
+            else:
+                cur.x = x + w
+
+    # Scrolling -------------------------------------------------------------
+    def _blank(self) -> Line:
+        # Erased cells keep the current background colour (xterm BCE)
+        return Line(self.cols, pack_attr(bg=attr_bg(self.cursor.attr)))
+
+    def _push_history(self, line: Line) -> None:
+        if self.history.maxlen:
+            self.history.append(line)
+            self.history_pushed += 1
+
+    def scroll_up(self, n: int = 1, history: bool = True) -> None:
+        top, bottom = self.top, self.bottom
+        n = max(1, min(n, bottom - top + 1))
+        lines = self.lines
+        to_history = history and top == 0 and lines is self._main
+        for _ in range(n):
+            gone = lines.pop(top)
+            if to_history:
+                self._push_history(gone)
+            lines.insert(bottom, self._blank())
+        self.dirty.update(range(top, bottom + 1))
+
+    def scroll_down(self, n: int = 1) -> None:
+        top, bottom = self.top, self.bottom
+        n = max(1, min(n, bottom - top + 1))
+        for _ in range(n):
+            del self.lines[bottom]
+            self.lines.insert(top, self._blank())
+        self.dirty.update(range(top, bottom + 1))
+
+    def index(self) -> None:
+        cur = self.cursor
+        cur.wrap_pending = False
+        if cur.y == self.bottom:
+            self.scroll_up(1)
+        elif cur.y < self.rows - 1:
+            cur.y += 1
+
+    def reverse_index(self) -> None:
+        cur = self.cursor
+        cur.wrap_pending = False
+        if cur.y == self.top:
+            self.scroll_down(1)
+        elif cur.y > 0:
+            cur.y -= 1
+
+    # Escape sequences ------------------------------------------------------
+    def _escape(self, data: str, j: int) -> int:
+        """Handles the sequence starting at data[j] (ESC); returns the index
+        after it, or -1 if it is incomplete."""
+        n = len(data)
+        if j + 1 >= n:
+            return -1
+        c = data[j + 1]
+        if c == "[":
+            m = _CSI.match(data, j + 1)
+            if m is None:
+                if _CSI_PARTIAL.fullmatch(data, j + 1):
+                    return -1
+                return j + 2  # malformed: drop ESC [
+            self._csi(m.group(1), m.group(2), m.group(3))
+            return m.end()
+        if c in "]P_^X":
+            # OSC / DCS / APC / PM / SOS: runs to BEL (OSC) or ST
+            b = data.find("\x07", j + 2) if c == "]" else -1
+            st = data.find("\x1b\\", j + 2)
+            ends = [e for e in ((b, 1), (st, 2)) if e[0] >= 0]
+            if not ends:
+                return -1
+            end, ln = min(ends)
+            if c == "]":
+                self._osc(data[j + 2:end])
+            return end + ln
+        if c in "()*+":
+            if j + 2 >= n:
+                return -1
+            g = data[j + 2] == "0"
+            if c == "(":
+                self.cursor.graphics = g
+            elif c == ")":
+                self._g1_graphics = g
+            return j + 3
+        if c == "#":
+            if j + 2 >= n:
+                return -1
+            if data[j + 2] == "8":  # DECALN: fill with E
+                for y, line in enumerate(self.lines):
+                    line.chars[:] = ["E"] * self.cols
+                    self.dirty.add(y)
+            return j + 3
+        cur = self.cursor
+        if c == "7":
+            self._saved = cur.copy()
+        elif c == "8":
+            self._restore_cursor()
+        elif c == "D":
+            self.index()
+        elif c == "E":
+            cur.x = 0
+            self.index()
+        elif c == "M":
+            self.reverse_index()
+        elif c == "H":
+            self._tabs.add(cur.x)
+        elif c == "c":
+            self.reset()
+        # ESC = / ESC > (keypad modes) and anything else: ignored
+        return j + 2
+
+    def _osc(self, body: str) -> None:
+        code, _, text = body.partition(";")
+        if code in ("0", "2"):
+            self.title = text
+
+    def _restore_cursor(self) -> None:
+        s = self._saved
+        cur = self.cursor
+        cur.x, cur.y = min(s.x, self.cols - 1), min(s.y, self.rows - 1)
+        cur.attr, cur.graphics, cur.origin = s.attr, s.graphics, s.origin
+        cur.wrap_pending = False
+
+    def _insert_blanks(self, line: Line, x: int, n: int) -> None:
+        n = min(n, self.cols - x)
+        blank = pack_attr(bg=attr_bg(self.cursor.attr))
+        line.chars[x:x] = [" "] * n
+        line.attrs[x:x] = array("I", [blank]) * n
+        del line.chars[self.cols:]
+        del line.attrs[self.cols:]
+
+    def _erase(self, y: int, x0: int, x1: int) -> None:
+        """Blanks cells [x0, x1) of row y."""
+        x0, x1 = max(0, x0), min(self.cols, x1)
+        if x0 >= x1:
+            return
+        line = self.lines[y]
+        line.chars[x0:x1] = [" "] * (x1 - x0)
+        line.attrs[x0:x1] = array("I", [pack_attr(bg=attr_bg(self.cursor.attr))]) * (x1 - x0)
+        if x1 >= self.cols:
+            line.wrapped = False
+        self.dirty.add(y)
+
+    def _csi(self, params: str, inter: str, final: str) -> None:
+        private = params[:1] if params[:1] in "?<=>" else ""
+        if private:
+            params = params[1:]
+        try:
+            args = [int(p) if p else 0 for p in params.replace(":", ";").split(";")] if params else []
+        except ValueError:
+            return
+        cur = self.cursor
+
+        def arg(i: int, default: int = 1) -> int:
+            v = args[i] if i < len(args) else 0
+            return v if v else default
+
+        if inter:
+            return  # DECSCUSR (" q") and friends: nothing to emulate
+        if final == "m" and not private:
+            self._sgr(args)
+            return
+        if final in "hl":
+            self._set_modes(private, args, final == "h")
+            return
+        if private:
+            if final == "c" and private == ">":
+                self._replies.append("\x1b[>0;0;0c")
+            return
+        cur.wrap_pending = False
+        if final in "Hf":
+            y, x = arg(0) - 1, arg(1) - 1
+            if cur.origin:
+                y = min(self.bottom, y + self.top)
+            cur.y, cur.x = max(0, min(self.rows - 1, y)), max(0, min(self.cols - 1, x))
+        elif final == "A":
+            lo = self.top if cur.y >= self.top else 0
+            cur.y = max(lo, cur.y - arg(0))
+        elif final in "Be":
+            hi = self.bottom if cur.y <= self.bottom else self.rows - 1
+            cur.y = min(hi, cur.y + arg(0))
+        elif final in "Ca":
+            cur.x = min(self.cols - 1, cur.x + arg(0))
+        elif final == "D":
+            cur.x = max(0, cur.x - arg(0))
+        elif final == "E":
+            cur.x = 0
+            cur.y = min(self.bottom if cur.y <= self.bottom else self.rows - 1, cur.y + arg(0))
+        elif final == "F":
+            cur.x = 0
+            cur.y = max(self.top if cur.y >= self.top else 0, cur.y - arg(0))
+        elif final in "G`":
+            cur.x = max(0, min(self.cols - 1, arg(0) - 1))
+        elif final == "d":
+            y = arg(0) - 1 + (self.top if cur.origin else 0)
+            cur.y = max(0, min(self.rows - 1, y))
+        elif final == "J":
+            mode = arg(0, 0)
+            if mode == 0:
+                self._erase(cur.y, cur.x, self.cols)
+                for y in range(cur.y + 1, self.rows):
+                    self._erase(y, 0, self.cols)
+            elif mode == 1:
+                for y in range(cur.y):
+                    self._erase(y, 0, self.cols)
+                self._erase(cur.y, 0, cur.x + 1)
+            elif mode in (2, 3):
+                for y in range(self.rows):
+                    self._erase(y, 0, self.cols)
+                if mode == 3:
+                    self.history.clear()
+        elif final == "K":
+            mode = arg(0, 0)
+            if mode == 0:
+                self._erase(cur.y, cur.x, self.cols)
+            elif mode == 1:
+                self._erase(cur.y, 0, cur.x + 1)
+            else:
+                self._erase(cur.y, 0, self.cols)
+        elif final == "X":
+            self._erase(cur.y, cur.x, cur.x + arg(0))
+        elif final == "@":
+            self._insert_blanks(self.lines[cur.y], cur.x, arg(0))
+            self.dirty.add(cur.y)
+        elif final == "P":
+            line = self.lines[cur.y]
+            k = min(arg(0), self.cols - cur.x)
+            del line.chars[cur.x:cur.x + k]
+            del line.attrs[cur.x:cur.x + k]
+            line.chars.extend(" " * k)
+            line.attrs.extend(array("I", [pack_attr(bg=attr_bg(cur.attr))]) * k)
+            self.dirty.add(cur.y)
+        elif final in "LM":
+            if self.top <= cur.y <= self.bottom:
+                saved_top = self.top
+                self.top = cur.y
+                if final == "L":
+                    self.scroll_down(arg(0))
+                else:
+                    self.scroll_up(arg(0), history=False)
+                self.top = saved_top
+                cur.x = 0
+        elif final == "S":
+            self.scroll_up(arg(0))
+        elif final == "T":
+            self.scroll_down(arg(0))
+        elif final == "r":
+            top, bottom = arg(0) - 1, arg(1, self.rows) - 1
+            if 0 <= top < bottom < self.rows:
+                self.top, self.bottom = top, bottom
+                cur.x, cur.y = 0, (top if cur.origin else 0)
+        elif final == "s":
+            self._saved = cur.copy()
+        elif final == "u":
+            self._restore_cursor()
+        elif final == "b":
+            self._print(self._last_char * min(arg(0), self.cols * self.rows))
+        elif final == "g":
+            mode = arg(0, 0)
+            if mode == 0:
+                self._tabs.discard(cur.x)
+            elif mode == 3:
+                self._tabs.clear()
+        elif final == "Z":
+            prev = [t for t in self._tabs if t < cur.x]
+            cur.x = max(prev) if prev else 0
+        elif final == "n":
+            if arg(0, 0) == 5:
+                self._replies.append("\x1b[0n")
+            elif arg(0, 0) == 6:
+                y = cur.y - (self.top if cur.origin else 0)
+                self._replies.append(f"\x1b[{y + 1};{cur.x + 1}R")
+        elif final == "c":
+            if arg(0, 0) == 0:
+                self._replies.append("\x1b[?1;2c")
+        # Anything else (window ops, DECSCUSR...) is ignored
+
+    def _set_modes(self, private: str, args: List[int], on: bool) -> None:
+        for m in args:
+            if not private:
+                if m == 4:
+                    self.insert_mode = on
+                continue
+            if m == 1:
+                self.app_cursor = on
+            elif m == 6:
+                self.cursor.origin = on
+                self.cursor.x, self.cursor.y = 0, (self.top if on else 0)
+            elif m == 7:
+                self.autowrap = on
+            elif m == 25:
+                self.cursor_visible = on
+                self.dirty.add(self.cursor.y)
+            elif m in (47, 1047, 1049):
+                if m == 1049 and on:
+                    self._saved_main = self.cursor.copy()
+                self._switch_alt(on, clear=m != 47)
+                if m == 1049 and not on and self._saved_main is not None:
+                    self._saved = self._saved_main
+                    self._restore_cursor()
+            elif m == 1048:
+                if on:
+                    self._saved = self.cursor.copy()
+                else:
+                    self._restore_cursor()
+            elif m == 2004:
+                self.bracketed_paste = on
+
+    def _switch_alt(self, on: bool, clear: bool) -> None:
+        if on:
+            if self.alt_active:
+                return
+            if self._alt is None or clear:
+                self._alt = [Line(self.cols) for _ in range(self.rows)]
+            self.lines = self._alt
+        else:
+            if not self.alt_active:
+                return
+            self.lines = self._main
+            if clear:
+                self._alt = None
+        self.top, self.bottom = 0, self.rows - 1
+        self.dirty = set(range(self.rows))
+
+    def _sgr(self, args: List[int]) -> None:
+        if not args:
+            args = [0]
+        a = self.cursor.attr
+        fg, bg, flags = attr_fg(a), attr_bg(a), a & ~(_FG_MASK | _BG_MASK)
+        i = 0
+        while i < len(args):
+            p = args[i]
+            if p == 0:
+                fg, bg, flags = DEFAULT_COLOR, DEFAULT_COLOR, 0
+            elif p == 1:
+                flags |= BOLD
+            elif p == 2:
+                flags |= DIM
+            elif p == 3:
+                flags |= ITALIC
+            elif p == 4:
+                flags |= UNDERLINE
+            elif p == 7:
+                flags |= REVERSE
+            elif p == 8:
+                flags |= CONCEAL
+            elif p == 9:
+                flags |= STRIKE
+            elif p == 22:
+                flags &= ~(BOLD | DIM)
+            elif p == 23:
+                flags &= ~ITALIC
+            elif p == 24:
+                flags &= ~UNDERLINE
+            elif p == 27:
+                flags &= ~REVERSE
+            elif p == 28:
+                flags &= ~CONCEAL
+            elif p == 29:
+                flags &= ~STRIKE
+            elif 30 <= p <= 37:
+                fg = p - 30
+            elif p == 39:
+                fg = DEFAULT_COLOR
+            elif 40 <= p <= 47:
+                bg = p - 40
+            elif p == 49:
+                bg = DEFAULT_COLOR
+            elif 90 <= p <= 97:
+                fg = p - 90 + 8
+            elif 100 <= p <= 107:
+                bg = p - 100 + 8
+            elif p in (38, 48):
+                color, used = self._extended_color(args, i + 1)
+                i += used
+                if color is not None:
+                    if p == 38:
+                        fg = color
+                    else:
+                        bg = color
+            i += 1
+        self.cursor.attr = pack_attr(fg, bg, flags)
+
+    @staticmethod
+    def _extended_color(args: List[int], i: int) -> Tuple[Optional[int], int]:
+        """Parses `5;n` or `2;r;g;b` after 38/48; returns (colour, args used)."""
+        if i >= len(args):
+            return None, 0
+        if args[i] == 5 and i + 1 < len(args):
+            return max(0, min(255, args[i + 1])), 2
+        if args[i] == 2 and i + 3 < len(args):
+            r, g, b = (max(0, min(255, v)) for v in args[i + 1:i + 4])
+            return rgb_to_index(r, g, b), 4
+        return None, 1